@@ -7,7 +7,7 @@ celery_app = Celery(
     "hypercode",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
-    include=["app.services.execution_service"] # Add task modules here
+    include=["app.services.execution_jobs"] # Add task modules here
 )
 
 celery_app.conf.update(
@@ -17,4 +17,8 @@ celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
     task_track_started=True,
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    # Executions are long and uneven; take one at a time so idle workers pick up the rest
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
 )
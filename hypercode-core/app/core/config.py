@@ -40,6 +40,38 @@ class Settings(BaseSettings):
     # Rate Limiting
     RATE_LIMIT_WINDOW_SECONDS: int = 60
     RATE_LIMIT_MAX_REQUESTS: int = 100
+
+    # Execution result cache (deterministic HyperCode programs only)
+    EXECUTION_CACHE_ENABLED: bool = False
+    EXECUTION_CACHE_TTL_SECONDS: float = 300.0
+    EXECUTION_CACHE_MAX_ENTRIES: int = 1024
+
+    # Pre-forked Python worker pool
+    PYTHON_POOL_ENABLED: bool = False
+    PYTHON_POOL_SIZE: int = 4
+    PYTHON_POOL_MAX_RUNS: int = 1000
+    PYTHON_POOL_PRELOAD: str = "json,re,math,random,datetime,collections,itertools,functools,typing"
+
+    # Execution admission control
+    EXECUTION_MAX_CONCURRENCY: int = 16
+    EXECUTION_LANGUAGE_LIMITS: str = "python=8,shell=4,bash=4,hypercode=8" # per-language slot caps
+    EXECUTION_QUEUE_SIZE: int = 64
+    EXECUTION_QUEUE_TIMEOUT_SECONDS: float = 30.0
+    EXECUTION_MAX_OUTPUT_BYTES: int = 1048576 # per stream; head and tail halves are kept, 0 disables
+    EXECUTION_TRACE_MEMORY: bool = True # tracemalloc peak for in-process runs
+
+    # Asynchronous execution jobs (run on Celery workers)
+    CELERY_TASK_ALWAYS_EAGER: bool = False # run tasks in-process; for tests and single-node dev
+    EXECUTION_JOB_TTL_SECONDS: int = 86400
+
+    # Mission assignment
+    MISSION_LEASE_SECONDS: float = 30.0 # claim held by an assigner; expired claims are requeued
+    MISSION_ASSIGN_BATCH_SIZE: int = 100 # missions matched per background assigner tick; 0 assigns one at a time
+    MISSION_ASSIGNER_DEBOUNCE_SECONDS: float = 0.01 # coalesces bursts of mission/agent wake-up events
+    MISSION_ASSIGNER_POLL_SECONDS: float = 30.0 # safety-net assignment pass when no events arrive
+    AUDIT_SINK_BATCH_SIZE: int = 200 # audit rows per create_many
+    AUDIT_SINK_FLUSH_SECONDS: float = 0.5 # longest a queued audit row waits
+    AUDIT_SINK_MAX_QUEUE: int = 10000 # rows beyond this are dropped and counted
     
     class Config:
         env_file = ".env"
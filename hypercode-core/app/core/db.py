@@ -241,6 +241,11 @@ except Exception:  # pragma: no cover
             self._items[aid] = entry
             return _Obj(self._items[aid])
 
+        async def create_many(self, data: List[Dict[str, Any]], skip_duplicates: bool = False) -> int:
+            for row in data:
+                await self.create(row)
+            return len(data)
+
         async def find_many(self, where: Optional[Dict[str, Any]] = None, order: Optional[Dict[str, Any]] = None, take: Optional[int] = None, skip: int = 0) -> List[Any]:
             items = list(self._items.values())
             if where:
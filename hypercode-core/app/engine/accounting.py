@@ -0,0 +1,79 @@
+"""
+Per-execution resource accounting.
+
+Backends record CPU time and peak memory into the ``stats`` dict that
+ExecutionService threads through every run:
+
+- subprocesses: RUSAGE_CHILDREN deltas around the child's lifetime. Children
+  are reaped by the event loop, not by us, so when several executions finish
+  at the same moment their CPU may be attributed to one another. Peak RSS is
+  only known when this child raised the children high-water mark.
+- fork-server pool: exact ``wait4`` rusage reported by the server.
+- in-process runs (interpreter, native module): RUSAGE_THREAD deltas for the
+  event-loop thread, which runs them synchronously, and tracemalloc's peak
+  of Python allocations in place of RSS.
+"""
+import os
+import resource
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+# ru_maxrss is kilobytes on Linux and bytes on macOS
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+_RUSAGE_THREAD = getattr(resource, "RUSAGE_THREAD", None)
+
+
+def children_snapshot() -> resource.struct_rusage:
+    return resource.getrusage(resource.RUSAGE_CHILDREN)
+
+
+def record_children_delta(before: resource.struct_rusage, stats: Dict[str, Any]) -> None:
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    stats["cpu_user"] = max(0.0, after.ru_utime - before.ru_utime)
+    stats["cpu_system"] = max(0.0, after.ru_stime - before.ru_stime)
+    if after.ru_maxrss > before.ru_maxrss:
+        stats["peak_rss_bytes"] = after.ru_maxrss * _MAXRSS_UNIT
+
+
+def record_rusage_dict(rusage: Dict[str, float], stats: Dict[str, Any]) -> None:
+    """Record usage reported by the fork server (``utime``, ``stime``, ``maxrss_kb``)."""
+    if not rusage:
+        return
+    stats["cpu_user"] = float(rusage.get("utime", 0.0))
+    stats["cpu_system"] = float(rusage.get("stime", 0.0))
+    if rusage.get("maxrss_kb"):
+        stats["peak_rss_bytes"] = int(rusage["maxrss_kb"]) * _MAXRSS_UNIT
+
+
+def _cpu_times():
+    if _RUSAGE_THREAD is not None:
+        r = resource.getrusage(_RUSAGE_THREAD)
+        return r.ru_utime, r.ru_stime
+    t = os.times()
+    return t.user, t.system
+
+
+@contextmanager
+def measure_in_process(stats: Dict[str, Any], trace_memory: bool = True) -> Iterator[None]:
+    """Account a synchronous in-process run into ``stats``."""
+    started_tracing = False
+    if trace_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+    user0, sys0 = _cpu_times()
+    try:
+        yield
+    finally:
+        user1, sys1 = _cpu_times()
+        stats["cpu_user"] = max(0.0, user1 - user0)
+        stats["cpu_system"] = max(0.0, sys1 - sys0)
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            stats["peak_rss_bytes"] = max(0, peak - base)
+            if started_tracing:
+                tracemalloc.stop()
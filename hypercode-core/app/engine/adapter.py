@@ -1,9 +1,17 @@
 import asyncio
 import time
 import os
-from typing import Tuple, Optional, Dict
+from typing import Any, Tuple, Optional, Dict, List
 import httpx
 from contextvars import ContextVar
+from app.core.config import get_settings
+from app.engine.accounting import children_snapshot, measure_in_process, record_children_delta
+from app.engine.circuit_breaker import CircuitBreaker, BACKEND_CALLS
+from app.engine.output import OutputBuffer, cap_text, read_bounded
+from app.services.admission import admission, AdmissionRejected
+
+_MAX_OUTPUT = get_settings().EXECUTION_MAX_OUTPUT_BYTES
+_TRACE_MEMORY = get_settings().EXECUTION_TRACE_MEMORY
 
 _INTERNAL_CALL: ContextVar[bool] = ContextVar("HC_INTERNAL_CALL", default=False)
 
@@ -13,60 +21,165 @@ def set_internal_call(flag: bool):
 def reset_internal_call(token):
     _INTERNAL_CALL.reset(token)
 
-async def run_hypercode(source: str, timeout: int = 30, env: Optional[Dict[str, str]] = None, target: Optional[str] = None) -> Tuple[str, str, int, float]:
-    t0 = time.time()
+
+class _Skip(Exception):
+    """Backend declined the call (not installed, internal call, unsupported source); not a health failure."""
+
+
+def _capped(stdout: str, stderr: str, code: int, stats: Dict[str, Any]) -> Tuple[str, str, int]:
+    """Cap output from backends that hand back whole strings."""
+    stdout, out_dropped = cap_text(stdout, _MAX_OUTPUT)
+    stderr, err_dropped = cap_text(stderr, _MAX_OUTPUT)
+    stats["bytes_dropped"] = out_dropped + err_dropped
+    return stdout, stderr, code
+
+
+async def _via_module(source: str, timeout: int, env: Optional[Dict[str, str]], target: Optional[str], stats: Dict[str, Any]) -> Tuple[str, str, int]:
+    import sys
+    mod = sys.modules.get("hypercode_engine")
+    if not (mod and hasattr(mod, "run_code")):
+        raise _Skip()
+    with measure_in_process(stats, _TRACE_MEMORY):
+        res = mod.run_code(source, target=target)
+    return _capped(getattr(res, "stdout", ""), getattr(res, "stderr", ""), getattr(res, "exit_code", 0), stats)
+
+
+async def _via_http(source: str, timeout: int, env: Optional[Dict[str, str]], target: Optional[str], stats: Dict[str, Any]) -> Tuple[str, str, int]:
+    if _INTERNAL_CALL.get():
+        raise _Skip()
+    api_url = os.getenv("ENGINE_API_URL", "http://localhost:8000/engine/run")
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        payload = {"source": source, "env_vars": env}
+        if target:
+            payload["target"] = target
+        resp = await client.post(api_url, json=payload)
+        status = getattr(resp, "status_code", 200)
+        if status == 429:
+            raise AdmissionRejected("engine_busy", int(resp.headers.get("Retry-After", "1") or 1))
+        if status >= 500:
+            raise RuntimeError(f"engine returned HTTP {status}")
+        data = resp.json()
+    stdout, stderr, code = _capped(data.get("stdout", ""), data.get("stderr", ""), int(data.get("exit_code", 0)), stats)
+    stats["bytes_dropped"] += int(data.get("bytes_dropped") or 0)
+    # The engine service measured the run itself
+    for field in ("cpu_user", "cpu_system", "peak_rss_bytes", "output_bytes"):
+        if data.get(field) is not None:
+            stats[field] = data[field]
+    return stdout, stderr, code
+
+
+async def _via_interpreter(source: str, timeout: int, env: Optional[Dict[str, str]], target: Optional[str], stats: Dict[str, Any]) -> Tuple[str, str, int]:
+    from app.parser.hc_parser import parse
+    from app.engine.interpreter import execute_program
     try:
-        import sys
-        mod = sys.modules.get("hypercode_engine")
-        if mod and hasattr(mod, "run_code"):
-            res = mod.run_code(source, target=target)
-            return (
-                getattr(res, "stdout", ""),
-                getattr(res, "stderr", ""),
-                getattr(res, "exit_code", 0),
-                time.time() - t0,
+        program = parse(source)
+    except Exception as e:
+        raise _Skip() from e
+    with measure_in_process(stats, _TRACE_MEMORY):
+        r = execute_program(program, _MAX_OUTPUT)
+    stats["bytes_dropped"] = r.bytes_dropped
+    return r.stdout, r.stderr, r.exit_code
+
+
+async def _via_cli(source: str, timeout: int, env: Optional[Dict[str, str]], target: Optional[str], stats: Dict[str, Any]) -> Tuple[str, str, int]:
+    args = ["-m", "app.engine.cli", "eval", "-e", source]
+    async with admission.slot("hypercode"):
+        usage = children_snapshot()
+        proc = await asyncio.create_subprocess_exec(
+            "python", *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env
+        )
+        out, err = OutputBuffer(_MAX_OUTPUT), OutputBuffer(_MAX_OUTPUT)
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(read_bounded(proc.stdout, out), read_bounded(proc.stderr, err), proc.wait()),
+                timeout=timeout,
             )
-        api_url = os.getenv("ENGINE_API_URL", "http://localhost:8000/engine/run")
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            record_children_delta(usage, stats)
+            return "", "Execution timed out", -1
+        record_children_delta(usage, stats)
+        stats["bytes_dropped"] = out.bytes_dropped + err.bytes_dropped
+        stats["output_bytes"] = out.total + err.total
+        return out.getvalue().strip(), err.getvalue().strip(), proc.returncode
+
+
+# (name, tier, runner). Backends in the same tier are interchangeable and are
+# ordered by observed latency; lower tiers are always preferred because the
+# interpreter and CLI fallbacks accept different source dialects.
+_BACKENDS = (
+    ("module", 0, _via_module),
+    ("http", 0, _via_http),
+    ("interpreter", 1, _via_interpreter),
+    ("cli", 2, _via_cli),
+)
+
+_BREAKERS: Dict[str, CircuitBreaker] = {
+    name: CircuitBreaker(
+        name,
+        failure_threshold=int(os.getenv("HC_BACKEND_FAILURE_THRESHOLD", "3")),
+        reset_timeout=float(os.getenv("HC_BACKEND_RESET_TIMEOUT", "30")),
+    )
+    for name, _, _ in _BACKENDS
+}
+
+
+def _ordered_backends() -> List[tuple]:
+    return sorted(_BACKENDS, key=lambda b: (b[1], _BREAKERS[b[0]].latency or 0.0))
+
+
+def backend_health() -> Dict[str, Dict[str, object]]:
+    return {
+        name: {"state": b.state, "failures": b.failures, "latency_sec": b.latency}
+        for name, b in _BREAKERS.items()
+    }
+
+
+def reset_breakers() -> None:
+    for b in _BREAKERS.values():
+        b.reset()
+
+
+async def run_hypercode(source: str, timeout: int = 30, env: Optional[Dict[str, str]] = None, target: Optional[str] = None,
+                        stats: Optional[Dict[str, Any]] = None) -> Tuple[str, str, int, float]:
+    """
+    Run HyperCode on the best available backend.
+
+    If ``stats`` is given it is filled with details of the run that do not fit
+    the return tuple: ``backend`` that served the call, ``bytes_dropped`` by the
+    output cap, and the resource usage recorded by ``app.engine.accounting``.
+    """
+    t0 = time.time()
+    if stats is None:
+        stats = {}
+    last_error = "No HyperCode backend available"
+    for name, _, runner in _ordered_backends():
+        breaker = _BREAKERS[name]
+        if not breaker.allow():
+            BACKEND_CALLS.labels(name, "rejected").inc()
+            continue
+        t1 = time.perf_counter()
+        stats.clear()
+        stats["bytes_dropped"] = 0
         try:
-            if not _INTERNAL_CALL.get():
-                async with httpx.AsyncClient(timeout=timeout) as client:
-                    payload = {"source": source, "env_vars": env}
-                    if target:
-                        payload["target"] = target
-                    resp = await client.post(api_url, json=payload)
-                    data = resp.json()
-                    stdout = data.get("stdout", "")
-                    stderr = data.get("stderr", "")
-                    code = int(data.get("exit_code", 0))
-            else:
-                raise RuntimeError("internal_call")
-        except Exception:
-                try:
-                    from app.parser.hc_parser import parse
-                    from app.engine.interpreter import execute_program
-                    program = parse(source)
-                    r = execute_program(program)
-                    stdout = r.stdout
-                    stderr = r.stderr
-                    code = r.exit_code
-                except Exception:
-                    args = ["-m", "app.engine.cli", "eval", "-e", source]
-                    proc = await asyncio.create_subprocess_exec(
-                        "python", *args,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                        env=env
-                    )
-                    try:
-                        out, err = await asyncio.wait_for(proc.communicate(), timeout=timeout)
-                        stdout = out.decode().strip()
-                        stderr = err.decode().strip()
-                        code = proc.returncode
-                    except asyncio.TimeoutError:
-                        proc.kill()
-                        stdout = ""
-                        stderr = "Execution timed out"
-                        code = -1
+            stdout, stderr, code = await runner(source, timeout, env, target, stats)
+        except _Skip:
+            breaker.release()
+            BACKEND_CALLS.labels(name, "skipped").inc()
+            continue
+        except AdmissionRejected:
+            # Load shedding is not a backend health failure
+            breaker.release()
+            raise
+        except Exception as e:
+            breaker.record_failure()
+            last_error = str(e)
+            continue
+        breaker.record_success(time.perf_counter() - t1)
+        stats["backend"] = name
         return stdout, stderr, code, time.time() - t0
-    except Exception as e:
-        return "", str(e), -1, time.time() - t0
+    return "", last_error, -1, time.time() - t0
@@ -0,0 +1,101 @@
+from __future__ import annotations
+import time
+from typing import Optional
+from prometheus_client import Counter, Gauge, Histogram
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUE = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Prometheus metrics
+BACKEND_STATE = Gauge(
+    "engine_backend_circuit_state",
+    "Engine backend circuit state (0=closed, 1=half_open, 2=open)",
+    ("backend",),
+)
+BACKEND_TRANSITIONS = Counter(
+    "engine_backend_circuit_transitions_total",
+    "Engine backend circuit state transitions",
+    ("backend", "from_state", "to_state"),
+)
+BACKEND_CALLS = Counter(
+    "engine_backend_calls_total",
+    "Engine backend call outcomes",
+    ("backend", "outcome"),  # success, failure, skipped, rejected
+)
+BACKEND_LATENCY = Histogram(
+    "engine_backend_latency_seconds",
+    "Engine backend call latency (seconds)",
+    ("backend",),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+
+class CircuitBreaker:
+    """
+    Per-backend circuit breaker with half-open probing.
+
+    ``failure_threshold`` consecutive failures open the circuit. After
+    ``reset_timeout`` seconds a single probe call is let through; its outcome
+    closes the circuit again or re-opens it for another ``reset_timeout``.
+    Successful call latency feeds an EWMA used to order interchangeable backends.
+    """
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0, alpha: float = 0.2):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.alpha = alpha
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.latency: Optional[float] = None
+        self._probe_in_flight = False
+        BACKEND_STATE.labels(name).set(_STATE_VALUE[CLOSED])
+
+    def _set_state(self, new_state: str) -> None:
+        if new_state == self.state:
+            return
+        BACKEND_TRANSITIONS.labels(self.name, self.state, new_state).inc()
+        BACKEND_STATE.labels(self.name).set(_STATE_VALUE[new_state])
+        self.state = new_state
+
+    def allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self._set_state(HALF_OPEN)
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self, latency: float) -> None:
+        self._probe_in_flight = False
+        self.failures = 0
+        self.latency = latency if self.latency is None else (self.alpha * latency + (1 - self.alpha) * self.latency)
+        BACKEND_LATENCY.labels(self.name).observe(latency)
+        BACKEND_CALLS.labels(self.name, "success").inc()
+        self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        self._probe_in_flight = False
+        self.failures += 1
+        BACKEND_CALLS.labels(self.name, "failure").inc()
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._set_state(OPEN)
+
+    def release(self) -> None:
+        """Give back a probe slot when the backend declined the call without being exercised."""
+        self._probe_in_flight = False
+
+    def reset(self) -> None:
+        self.failures = 0
+        self.latency = None
+        self._probe_in_flight = False
+        self._set_state(CLOSED)
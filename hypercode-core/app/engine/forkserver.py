@@ -0,0 +1,172 @@
+"""
+Fork server for pre-warmed Python execution.
+
+The server preloads common modules once, then serves newline-delimited JSON
+requests on stdin. Every request runs in a freshly forked child so programs
+never share state, while skipping interpreter start-up and import costs.
+
+Request:  {"code": str, "env": {..} | null, "timeout": float, "max_output": int}
+Response: {"pid": int}  (as soon as the child is forked)
+          {"exit_code": int, "timed_out": bool, "stdout": str, "stderr": str,
+           "bytes_dropped": int, "rusage": {..}}
+
+Output goes to temp files, and only the first and last ``max_output // 2``
+bytes of each are read back, so a chatty child cannot bloat the server.
+"""
+import argparse
+import builtins
+import importlib
+import json
+import os
+import select
+import signal
+import sys
+import tempfile
+import time
+import traceback
+
+from app.engine.output import format_truncated
+
+
+def _preload(modules):
+    for name in modules:
+        name = name.strip()
+        if not name:
+            continue
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+
+def _child_main(code: str, env, out_fd: int, err_fd: int) -> int:
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.dup2(out_fd, 1)
+    os.dup2(err_fd, 2)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    if env is not None:
+        os.environ.clear()
+        os.environ.update(env)
+    sys.argv = ["-c"]
+    rc = 0
+    try:
+        exec(compile(code, "<string>", "exec"), {"__name__": "__main__", "__builtins__": builtins})
+    except SystemExit as e:
+        if e.code is None:
+            rc = 0
+        elif isinstance(e.code, int):
+            rc = e.code
+        else:
+            sys.stderr.write(f"{e.code}\n")
+            rc = 1
+    except BaseException:
+        # Drop this frame so tracebacks match ``python -c``
+        etype, value, tb = sys.exc_info()
+        traceback.print_exception(etype, value, tb.tb_next if tb else None)
+        rc = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        except Exception:
+            pass
+    return rc
+
+
+def _wait(pid: int, timeout: float):
+    """Wait for ``pid`` up to ``timeout`` seconds; returns (status, rusage, timed_out)."""
+    deadline = time.monotonic() + timeout
+    pidfd = None
+    try:
+        pidfd = os.pidfd_open(pid)
+    except (AttributeError, OSError):
+        pidfd = None
+    try:
+        while True:
+            wpid, status, rusage = os.wait4(pid, os.WNOHANG)
+            if wpid == pid:
+                return status, rusage, False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                os.kill(pid, signal.SIGKILL)
+                _, status, rusage = os.wait4(pid, 0)
+                return status, rusage, True
+            if pidfd is not None:
+                select.select([pidfd], [], [], remaining)
+            else:
+                time.sleep(min(remaining, 0.001))
+    finally:
+        if pidfd is not None:
+            os.close(pidfd)
+
+
+def _read(f, limit: int):
+    size = f.seek(0, os.SEEK_END)
+    f.seek(0)
+    if limit <= 0 or size <= limit:
+        return f.read().decode("utf-8", errors="replace"), 0
+    head = f.read(limit // 2)
+    tail_len = limit - len(head)
+    f.seek(size - tail_len)
+    return format_truncated(head, f.read(tail_len), size - limit), size - limit
+
+
+def _serve_one(req: dict, out) -> None:
+    with tempfile.TemporaryFile() as fout, tempfile.TemporaryFile() as ferr:
+        pid = os.fork()
+        if pid == 0:
+            rc = 1
+            try:
+                rc = _child_main(req.get("code", ""), req.get("env"), fout.fileno(), ferr.fileno())
+            finally:
+                os._exit(rc & 0xFF if rc >= 0 else 1)
+        out.write(json.dumps({"pid": pid}) + "\n")
+        out.flush()
+        status, rusage, timed_out = _wait(pid, float(req.get("timeout") or 30))
+        if os.WIFEXITED(status):
+            exit_code = os.WEXITSTATUS(status)
+        else:
+            exit_code = -os.WTERMSIG(status)
+        limit = int(req.get("max_output") or 0)
+        stdout, out_dropped = _read(fout, limit)
+        stderr, err_dropped = _read(ferr, limit)
+        resp = {
+            "exit_code": exit_code,
+            "timed_out": timed_out,
+            "stdout": stdout,
+            "stderr": stderr,
+            "bytes_dropped": out_dropped + err_dropped,
+            "rusage": {
+                "utime": rusage.ru_utime,
+                "stime": rusage.ru_stime,
+                "maxrss_kb": rusage.ru_maxrss,
+            },
+        }
+        out.write(json.dumps(resp) + "\n")
+        out.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="hypercode-forkserver")
+    parser.add_argument("--preload", default="")
+    args = parser.parse_args()
+    _preload(args.preload.split(","))
+    out = sys.stdout
+    out.write(json.dumps({"ready": True, "pid": os.getpid()}) + "\n")
+    out.flush()
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            req = json.loads(line)
+        except Exception:
+            continue
+        _serve_one(req, out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
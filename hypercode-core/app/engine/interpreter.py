@@ -8,6 +8,7 @@ from app.errors.nd_errors import (
     create_unsupported_error,
     wrap_interpreter_error,
 )
+from app.engine.output import OutputBuffer
 
 
 # Prometheus metrics
@@ -33,6 +34,7 @@ class ExecResult:
     stdout: str
     stderr: str
     exit_code: int
+    bytes_dropped: int = 0
 
 
 class InterpreterError(Exception):
@@ -53,13 +55,13 @@ class _ContinueSignal(Exception):
 
 
 class Interpreter:
-    def __init__(self):
-        self._stdout: List[str] = []
+    def __init__(self, max_output: int = 0):
+        self._stdout = OutputBuffer(max_output)
         self.globals: Dict[str, Any] = {}
         self.stack: List[Dict[str, Any]] = [self.globals]
         self.functions: Dict[str, Dict[str, Any]] = {}
         self.builtins: Dict[str, Any] = {
-            "print": lambda *args: self._stdout.append(" ".join(str(a) for a in args))
+            "print": lambda *args: self._stdout.write((" ".join(str(a) for a in args) + "\n").encode("utf-8"))
         }
 
     def _env_get(self, name: str) -> Any:
@@ -91,14 +93,19 @@ class Interpreter:
                 self._exec_node(node)
             INTERPRETER_EXECUTIONS.labels("success").inc()
             INTERPRETER_EXECUTE_DURATION.labels("success").observe(time.perf_counter() - t0)
-            return ExecResult(stdout="\n".join(s for s in self._stdout), stderr="", exit_code=0)
+            return ExecResult(stdout=self._output(), stderr="", exit_code=0, bytes_dropped=self._stdout.bytes_dropped)
         except Exception as e:
             env_names = list(self.stack[-1].keys()) if self.stack else []
             nd = wrap_interpreter_error(e, "", env_names)
             INTERPRETER_EXECUTIONS.labels("error").inc()
             INTERPRETER_ERRORS.labels(type(e).__name__).inc()
             INTERPRETER_EXECUTE_DURATION.labels("error").observe(time.perf_counter() - t0)
-            return ExecResult(stdout="\n".join(s for s in self._stdout), stderr=nd.format(), exit_code=1)
+            return ExecResult(stdout=self._output(), stderr=nd.format(), exit_code=1, bytes_dropped=self._stdout.bytes_dropped)
+
+    def _output(self) -> str:
+        # print() terminates every line; drop the final newline to match "\n".join(lines)
+        out = self._stdout.getvalue()
+        return out[:-1] if out.endswith("\n") else out
 
     def _exec_node(self, node):
         k = node.kind
@@ -273,6 +280,82 @@ class Interpreter:
             return left ** right
         return None
 
-def execute_program(program) -> ExecResult:
-    intr = Interpreter()
+def execute_program(program, max_output: int = 0) -> ExecResult:
+    intr = Interpreter(max_output)
     return intr.execute(program)
+
+
+_PURE_KINDS = {"assign", "expr", "function_def", "return", "if", "while", "for", "break", "continue", "match", "body", "orelse"}
+_PURE_BUILTINS = {"print"}
+
+
+def is_pure(program) -> bool:
+    """True when the program only uses constructs the interpreter evaluates without side effects.
+
+    Pure programs read no environment, perform no I/O besides the captured
+    ``print`` buffer and call only builtins or functions defined in the
+    program itself, so identical sources always yield identical results.
+    """
+    defined = set()
+    nodes = list(program.body)
+    while nodes:
+        node = nodes.pop()
+        if node.kind == "function_def":
+            defined.add(node.value["name"])
+        nodes.extend(node.children or [])
+        if node.kind == "match":
+            for case in node.value["cases"]:
+                nodes.extend(case["body"])
+    calls: List[str] = []
+    nodes = list(program.body)
+    while nodes:
+        node = nodes.pop()
+        if node.kind not in _PURE_KINDS:
+            return False
+        nodes.extend(node.children or [])
+        if node.kind == "match":
+            for case in node.value["cases"]:
+                nodes.extend(case["body"])
+            values = [node.value["subject"]] + [c["pattern"] for c in node.value["cases"]]
+        elif node.kind in ("if", "while"):
+            values = [node.value["test"]]
+        elif node.kind == "for":
+            values = [node.value["target"], node.value["iter"]]
+        elif node.kind == "assign":
+            values = [node.value["value"]] + list(node.value["targets"])
+        elif node.kind in ("expr", "return"):
+            values = [node.value]
+        else:
+            values = []
+        for v in values:
+            if not _pure_value(v, calls):
+                return False
+    return all(c in _PURE_BUILTINS or c in defined for c in calls)
+
+
+def _pure_value(v: Any, calls: List[str]) -> bool:
+    if isinstance(v, dict):
+        if "call" in v:
+            func = v["call"]["func"]
+            if not isinstance(func, str):
+                return False
+            calls.append(func)
+            return all(_pure_value(a, calls) for a in v["call"]["args"])
+        if "binop" in v:
+            return _pure_value(v["binop"]["left"], calls) and _pure_value(v["binop"]["right"], calls)
+        if "boolop" in v:
+            return all(_pure_value(x, calls) for x in v["boolop"]["values"])
+        if "unary" in v:
+            return _pure_value(v["unary"]["operand"], calls)
+        if "compare" in v:
+            return _pure_value(v["compare"]["left"], calls) and all(_pure_value(c, calls) for c in v["compare"]["comparators"])
+        if "var" in v:
+            return isinstance(v["var"], str)
+        return False
+    if isinstance(v, (list, tuple)):
+        return all(_pure_value(e, calls) for e in v)
+    if isinstance(v, str):
+        # Unsupported expressions are encoded as ``ast.dump`` strings and are
+        # indistinguishable from literals, so reject anything that looks like one.
+        return not (v.endswith(")") and "(" in v and v.split("(", 1)[0].isidentifier() and v[:1].isupper())
+    return v is None or isinstance(v, (int, float, bool, complex, bytes))
@@ -0,0 +1,108 @@
+"""
+Bounded capture of program output.
+
+An execution may print far more than we are willing to hold in memory, so
+each stream keeps only its first and last ``limit // 2`` bytes. Everything in
+between is counted and replaced by a single truncation marker. This module is
+stdlib-only so the fork server can use it without importing the app.
+"""
+import codecs
+from collections import deque
+from typing import Awaitable, Callable, Optional, Tuple
+
+TRUNCATION_MARKER = "\n...[{dropped} bytes truncated]...\n"
+
+_READ_CHUNK = 64 * 1024
+
+
+def format_truncated(head: bytes, tail: bytes, dropped: int) -> str:
+    text = head.decode("utf-8", errors="replace")
+    if dropped:
+        text += TRUNCATION_MARKER.format(dropped=dropped)
+    return text + tail.decode("utf-8", errors="replace")
+
+
+class OutputBuffer:
+    """
+    Head buffer plus tail ring buffer over a byte stream.
+
+    ``limit <= 0`` disables the cap. Writes are O(len(data)): the tail is a
+    deque of chunks trimmed from the left, never a growing bytearray.
+    """
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._head_limit = limit // 2 if limit > 0 else 0
+        self._tail_limit = limit - self._head_limit if limit > 0 else 0
+        self._head = bytearray()
+        self._tail: deque = deque()
+        self._tail_size = 0
+        self.total = 0
+
+    @property
+    def bounded(self) -> bool:
+        return self.limit > 0
+
+    @property
+    def bytes_dropped(self) -> int:
+        return self.total - len(self._head) - self._tail_size
+
+    def write(self, data: bytes) -> bytes:
+        """Append data; returns the part that landed in the head and is safe to forward live."""
+        self.total += len(data)
+        if not self.bounded:
+            self._head += data
+            return data
+        room = self._head_limit - len(self._head)
+        accepted = data[:room] if room > 0 else b""
+        self._head += accepted
+        rest = data[len(accepted):]
+        if rest:
+            self._tail.append(rest)
+            self._tail_size += len(rest)
+            while self._tail_size - len(self._tail[0]) >= self._tail_limit:
+                self._tail_size -= len(self._tail.popleft())
+            excess = self._tail_size - self._tail_limit
+            if excess > 0:
+                self._tail[0] = self._tail[0][excess:]
+                self._tail_size -= excess
+        return accepted
+
+    def tail(self) -> bytes:
+        return b"".join(self._tail)
+
+    def getvalue(self) -> str:
+        return format_truncated(bytes(self._head), self.tail(), self.bytes_dropped)
+
+
+def cap_text(text: str, limit: int) -> Tuple[str, int]:
+    """Apply the head/tail cap to an already-materialised string; returns (text, bytes_dropped)."""
+    buf = OutputBuffer(limit)
+    buf.write(text.encode("utf-8", errors="replace"))
+    return buf.getvalue(), buf.bytes_dropped
+
+
+async def read_bounded(stream, buf: OutputBuffer,
+                       on_output: Optional[Callable[[str], Awaitable[None]]] = None) -> None:
+    """
+    Drain an asyncio stream into ``buf`` without ever holding more than its limit.
+
+    ``on_output`` receives the head as it arrives and, if anything was dropped,
+    the truncation marker plus the retained tail once the stream closes.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while True:
+        data = await stream.read(_READ_CHUNK)
+        if not data:
+            break
+        accepted = buf.write(data)
+        if on_output is not None and accepted:
+            text = decoder.decode(accepted)
+            if text:
+                await on_output(text)
+    if on_output is None:
+        return
+    text = decoder.decode(b"", final=True)
+    if buf.bytes_dropped:
+        text += TRUNCATION_MARKER.format(dropped=buf.bytes_dropped) + buf.tail().decode("utf-8", errors="replace")
+    if text:
+        await on_output(text)
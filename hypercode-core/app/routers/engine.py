@@ -4,6 +4,7 @@ from typing import Optional, Dict
 from app.schemas.execution import ExecutionRequest, ExecutionResult, Language
 from app.engine import adapter as hc_adapter
 from app.services.execution_service import ExecutionService
+from app.services.admission import AdmissionRejected
 
 router = APIRouter()
 
@@ -31,5 +32,7 @@ async def run(req: RunRequest):
     try:
         r = ExecutionRequest(code=req.source, language=Language.HYPERCODE, timeout=req.timeout, env_vars=req.env_vars, target=req.target)
         return await ExecutionService.execute_code(r)
+    except AdmissionRejected as e:
+        raise e.as_http_exception()
     finally:
         hc_adapter.reset_internal_call(token)
@@ -1,18 +1,29 @@
+import asyncio
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel
-from app.schemas.execution import ExecutionRequest, ExecutionResult, Language
+from sse_starlette.sse import EventSourceResponse
+from app.schemas.execution import ExecutionRequest, ExecutionResult, Language, ExecutionJob, JobOutput
 from app.services.execution_service import ExecutionService, LAST_RESULT
+from app.services.admission import AdmissionRejected
+from app.services.execution_jobs import execution_job_store, submit_job, TERMINAL_STATUSES
 
 router = APIRouter()
 
+async def _execute(request: ExecutionRequest) -> ExecutionResult:
+    try:
+        return await ExecutionService.execute_code(request)
+    except AdmissionRejected as e:
+        raise e.as_http_exception()
+
 @router.post("/execute", response_model=ExecutionResult, status_code=status.HTTP_200_OK)
 async def execute_task(request: ExecutionRequest):
     """
     Execute a code snippet in the specified language.
     WARNING: This executes code in the container environment. 
     It is intended for development and controlled agent use only.
+    Returns 429 with Retry-After when execution capacity is exhausted.
     """
-    return await ExecutionService.execute_code(request)
+    return await _execute(request)
 
 @router.get("/health")
 async def health_check():
@@ -25,7 +36,7 @@ class HCRequest(BaseModel):
 @router.post("/execute-hc", response_model=ExecutionResult, status_code=status.HTTP_200_OK)
 async def execute_hypercode(req: HCRequest):
     r = ExecutionRequest(code=req.source, language=Language.HYPERCODE, target=req.target)
-    return await ExecutionService.execute_code(r)
+    return await _execute(r)
 
 class HCFileRequest(BaseModel):
     path: str
@@ -47,10 +58,62 @@ async def execute_hypercode_file(req: HCFileRequest):
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     r = ExecutionRequest(code=src, language=Language.HYPERCODE)
-    return await ExecutionService.execute_code(r)
+    return await _execute(r)
 
 @router.get("/last", response_model=ExecutionResult)
 async def last_execution():
     if LAST_RESULT is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No execution yet")
     return LAST_RESULT
+
+@router.post("/jobs", response_model=ExecutionJob, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(request: ExecutionRequest):
+    """
+    Queue an execution on the Celery workers and return its job id immediately.
+    Poll GET /jobs/{id} for the result or follow GET /jobs/{id}/stream for output.
+    """
+    try:
+        return await submit_job(request)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Job queue unavailable: {e}")
+
+async def _get_job(job_id: str) -> ExecutionJob:
+    job = await execution_job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+@router.get("/jobs/{job_id}", response_model=ExecutionJob)
+async def get_job(job_id: str):
+    return await _get_job(job_id)
+
+@router.get("/jobs/{job_id}/output", response_model=JobOutput)
+async def get_job_output(job_id: str, offset: int = 0):
+    job = await _get_job(job_id)
+    chunks = await execution_job_store.read_output(job_id, offset)
+    done = job.status in TERMINAL_STATUSES and not chunks
+    return JobOutput(job_id=job_id, chunks=chunks, next_offset=offset + len(chunks), done=done)
+
+@router.get("/jobs/{job_id}/stream")
+async def stream_job(job_id: str, offset: int = 0, poll_interval: float = 0.25):
+    """Server-Sent Events: one `output` event per chunk, then a final `result` event."""
+    await _get_job(job_id)
+
+    async def events():
+        nonlocal offset
+        while True:
+            job = await execution_job_store.get(job_id)
+            chunks = await execution_job_store.read_output(job_id, offset)
+            for chunk in chunks:
+                yield {"event": "output", "id": str(offset), "data": chunk.model_dump_json()}
+                offset += 1
+            # Status is read before the chunks, so once a terminal job yields no
+            # more chunks its output is fully drained
+            if job is None or (job.status in TERMINAL_STATUSES and not chunks):
+                if job is not None:
+                    yield {"event": "result", "data": job.model_dump_json()}
+                return
+            if not chunks:
+                await asyncio.sleep(poll_interval)
+
+    return EventSourceResponse(events())
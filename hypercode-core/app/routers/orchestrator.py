@@ -1,6 +1,7 @@
-from fastapi import APIRouter, HTTPException, Security, Body
-from app.schemas.mission import MissionRequest, MissionStatus
-from app.services.orchestrator import orchestrator
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Security, Body, Query, Response
+from app.schemas.mission import MissionRequest, MissionStatus, MissionState
+from app.services.orchestrator import orchestrator, InvalidTransition, MissingDependency, ASSIGN_BATCH_MAX, LIST_MAX_LIMIT
 from app.core.auth import get_current_user
 from app.services.llm_service import llm_service
 
@@ -21,7 +22,10 @@ async def llm_generate(prompt: str = Body(..., max_length=4096)):
 
 @router.post("/mission", response_model=MissionStatus, dependencies=[Security(get_current_user, scopes=["mission:write"])])
 async def submit_mission(req: MissionRequest):
-    return await orchestrator.submit(req)
+    try:
+        return await orchestrator.submit(req)
+    except MissingDependency as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/assign", response_model=MissionStatus, dependencies=[Security(get_current_user, scopes=["mission:assign"])])
 async def assign_next():
@@ -30,9 +34,17 @@ async def assign_next():
         raise HTTPException(status_code=204, detail="")
     return res
 
+@router.post("/assign/batch", response_model=List[MissionStatus], dependencies=[Security(get_current_user, scopes=["mission:assign"])])
+async def assign_batch(limit: Optional[int] = Query(None, ge=1, le=ASSIGN_BATCH_MAX)):
+    """Match up to `limit` queued missions (default MISSION_ASSIGN_BATCH_SIZE) to agents in one pass."""
+    return await orchestrator.assign_batch(limit)
+
 @router.post("/{mission_id}/start", response_model=MissionStatus, dependencies=[Security(get_current_user, scopes=["mission:write"])])
 async def start(mission_id: str):
-    res = await orchestrator.start(mission_id)
+    try:
+        res = await orchestrator.start(mission_id)
+    except InvalidTransition as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not res:
         raise HTTPException(status_code=404, detail="not found")
     return res
@@ -50,28 +62,48 @@ async def submit_health_report(mission_id: str, payload: dict = Body(...)):
 
 @router.post("/{mission_id}/verify", response_model=MissionStatus, dependencies=[Security(get_current_user, scopes=["mission:write"])])
 async def verify(mission_id: str):
-    res = await orchestrator.verify(mission_id)
+    try:
+        res = await orchestrator.verify(mission_id)
+    except InvalidTransition as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not res:
         raise HTTPException(status_code=404, detail="not found")
     return res
 
 @router.post("/{mission_id}/complete", response_model=MissionStatus, dependencies=[Security(get_current_user, scopes=["mission:write"])])
 async def complete(mission_id: str):
-    res = await orchestrator.complete(mission_id)
+    try:
+        res = await orchestrator.complete(mission_id)
+    except InvalidTransition as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not res:
         raise HTTPException(status_code=404, detail="not found")
     return res
 
 @router.post("/{mission_id}/fail", response_model=MissionStatus, dependencies=[Security(get_current_user, scopes=["mission:write"])])
 async def fail(mission_id: str):
-    res = await orchestrator.fail(mission_id)
+    try:
+        res = await orchestrator.fail(mission_id)
+    except InvalidTransition as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not res:
         raise HTTPException(status_code=404, detail="not found")
     return res
 
-@router.get("/list", dependencies=[Security(get_current_user, scopes=["mission:read"])])
-async def list_missions(limit: int = 10):
-    items = await orchestrator.list(limit=limit)
+@router.get("/list", response_model=List[MissionStatus], dependencies=[Security(get_current_user, scopes=["mission:read"])])
+async def list_missions(
+    response: Response,
+    limit: int = Query(10, ge=1, le=LIST_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    state: Optional[List[MissionState]] = Query(None),
+):
+    """Newest first. Pass the X-Next-Cursor response header back as `cursor` for the next page."""
+    try:
+        items, next_cursor = await orchestrator.page(limit=limit, cursor=cursor, states=state)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return items
 
 @router.get("/{mission_id}/audit", dependencies=[Security(get_current_user, scopes=["mission:read"])])
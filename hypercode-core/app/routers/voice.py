@@ -4,6 +4,7 @@ from app.core.auth import verify_api_key
 from app.middleware.rate_limit import check_rate_limit
 from app.services.voice_service import AudioBuffer, dc_offset_filter, agc, transcribe_chunk, profanity_filter, sanitize_command, decode_opus, detect_language
 from app.engine.adapter import run_hypercode
+from app.services.admission import AdmissionRejected
 from prometheus_client import Counter, Histogram
 import structlog
 
@@ -61,7 +62,11 @@ async def voice_ws(ws: WebSocket, api_key: str = Query(default=None)):
                 clean = sanitize_command(profanity_filter(tr.text))
                 # simple execution contract: if text starts with print/def/assignment, run as hypercode
                 t0 = __import__("time").perf_counter()
-                stdout, stderr, code, _ = await run_hypercode(clean, timeout=5)
+                try:
+                    stdout, stderr, code, _ = await run_hypercode(clean, timeout=5)
+                except AdmissionRejected as e:
+                    await ws.send_json({"transcript": tr.text, "error": str(e), "retry_after": e.retry_after})
+                    continue
                 status_ = "success" if code == 0 else "error"
                 VOICE_CMD_EXEC_DURATION.labels(status_).observe(__import__("time").perf_counter() - t0)
                 await ws.send_json({
@@ -90,7 +95,11 @@ async def voice_ws(ws: WebSocket, api_key: str = Query(default=None)):
                     text = payload.get("text", "")
                     clean = sanitize_command(profanity_filter(text))
                     t0 = __import__("time").perf_counter()
-                    stdout, stderr, code, _ = await run_hypercode(clean, timeout=5)
+                    try:
+                        stdout, stderr, code, _ = await run_hypercode(clean, timeout=5)
+                    except AdmissionRejected as e:
+                        await ws.send_json({"transcript": text, "error": str(e), "retry_after": e.retry_after})
+                        continue
                     status_ = "success" if code == 0 else "error"
                     VOICE_CMD_EXEC_DURATION.labels(status_).observe(__import__("time").perf_counter() - t0)
                     await ws.send_json({
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
 
 class Language(str, Enum):
@@ -14,6 +14,7 @@ class ExecutionRequest(BaseModel):
     env_vars: Optional[Dict[str, str]] = Field(default=None, description="Environment variables for the execution")
     timeout: int = Field(default=30, ge=1, le=300, description="Execution timeout in seconds")
     target: Optional[str] = Field(default=None, description="HyperCode backend target: python|rust|mojo")
+    priority: int = Field(default=50, ge=0, le=100, description="Admission priority; higher runs first when queued")
 
 class ExecutionResult(BaseModel):
     stdout: str
@@ -22,3 +23,36 @@ class ExecutionResult(BaseModel):
     status: str = Field(..., description="success, error, timeout")
     duration: float = Field(..., description="Execution duration in seconds")
     language: Language
+    cached: bool = Field(default=False, description="Served from the execution result cache")
+    bytes_dropped: int = Field(default=0, description="Output bytes removed by the per-stream output cap")
+    backend: Optional[str] = Field(default=None, description="Backend that ran the code: subprocess, pool, or a HyperCode engine backend")
+    cpu_user: float = Field(default=0.0, description="User CPU seconds")
+    cpu_system: float = Field(default=0.0, description="System CPU seconds")
+    peak_rss_bytes: Optional[int] = Field(default=None, description="Peak RSS of the child; peak traced Python allocations for in-process runs")
+    output_bytes: int = Field(default=0, description="Bytes written to stdout and stderr before truncation")
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCESS = "success"
+    ERROR = "error"
+    TIMEOUT = "timeout"
+
+class ExecutionJob(BaseModel):
+    id: str
+    status: JobStatus
+    language: Language
+    created_at: str
+    updated_at: str
+    result: Optional[ExecutionResult] = None
+    error: Optional[str] = None
+
+class OutputChunk(BaseModel):
+    stream: str = Field(..., description="stdout or stderr")
+    text: str
+
+class JobOutput(BaseModel):
+    job_id: str
+    chunks: List[OutputChunk]
+    next_offset: int = Field(..., description="Pass as offset to fetch chunks produced after these")
+    done: bool
@@ -0,0 +1,181 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import structlog
+from fastapi import HTTPException, status
+from prometheus_client import Counter, Gauge, Histogram
+from app.core.config import get_settings
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "execution_admission_queue_depth",
+    "Executions waiting for a concurrency slot",
+)
+ADMISSION_RUNNING = Gauge(
+    "execution_admission_running",
+    "Executions currently holding a concurrency slot",
+    ("language",),
+)
+ADMISSION_WAIT = Histogram(
+    "execution_admission_wait_seconds",
+    "Time executions waited for a concurrency slot",
+    ("language",),
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0),
+)
+ADMISSION_REJECTIONS = Counter(
+    "execution_admission_rejections_total",
+    "Executions shed by admission control",
+    ("language", "reason"),  # queue_full, queue_timeout
+)
+
+
+def parse_limits(spec: str) -> Dict[str, int]:
+    """Parse ``"python=8,bash=4"`` into ``{"python": 8, "bash": 4}``."""
+    limits: Dict[str, int] = {}
+    for part in (spec or "").split(","):
+        if "=" not in part:
+            continue
+        name, _, value = part.partition("=")
+        try:
+            limits[name.strip().lower()] = max(1, int(value))
+        except ValueError:
+            continue
+    return limits
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Execution capacity exhausted ({reason}), retry after {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+    def as_http_exception(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(self),
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+
+class AdmissionController:
+    """
+    Bounds concurrent executions globally and per language.
+
+    Requests that cannot start immediately wait in a bounded priority queue
+    (higher ``priority`` first, FIFO within a priority). When the queue is full,
+    or a request waits longer than ``queue_timeout``, it is rejected with a
+    Retry-After estimate derived from recent slot hold times.
+    """
+    def __init__(self, max_concurrency: int = 16, language_limits: Optional[Dict[str, int]] = None, queue_size: int = 64, queue_timeout: float = 30.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.language_limits = dict(language_limits or {})
+        self.queue_size = max(0, queue_size)
+        self.queue_timeout = queue_timeout
+        self._running = 0
+        self._running_by_lang: Dict[str, int] = {}
+        self._waiters: List[Tuple[int, int, str, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._avg_hold = 1.0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, _, f in self._waiters if not f.done())
+
+    def _has_capacity(self, language: str) -> bool:
+        if self._running >= self.max_concurrency:
+            return False
+        limit = self.language_limits.get(language, self.max_concurrency)
+        return self._running_by_lang.get(language, 0) < limit
+
+    def _grant(self, language: str) -> None:
+        self._running += 1
+        self._running_by_lang[language] = self._running_by_lang.get(language, 0) + 1
+        ADMISSION_RUNNING.labels(language).set(self._running_by_lang[language])
+
+    def _retry_after(self) -> int:
+        backlog = self.queue_depth + self._running
+        return max(1, math.ceil(self._avg_hold * backlog / self.max_concurrency))
+
+    def _dispatch(self) -> None:
+        # Waiters left in the heap are blocked by a limit, so grant every one
+        # that now fits instead of stopping at a head blocked on its language.
+        remaining = []
+        while self._waiters:
+            item = heapq.heappop(self._waiters)
+            _, _, language, fut = item
+            if fut.done():
+                continue
+            if self._has_capacity(language):
+                self._grant(language)
+                fut.set_result(True)
+            else:
+                remaining.append(item)
+        for item in remaining:
+            heapq.heappush(self._waiters, item)
+        ADMISSION_QUEUE_DEPTH.set(self.queue_depth)
+
+    async def acquire(self, language: str, priority: int = 50) -> None:
+        language = language.lower()
+        if self._has_capacity(language):
+            self._grant(language)
+            ADMISSION_WAIT.labels(language).observe(0.0)
+            return
+        if self.queue_depth >= self.queue_size:
+            ADMISSION_REJECTIONS.labels(language, "queue_full").inc()
+            raise AdmissionRejected("queue_full", self._retry_after())
+
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (-priority, next(self._seq), language, fut))
+        ADMISSION_QUEUE_DEPTH.set(self.queue_depth)
+        t0 = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            if fut.done() and not fut.cancelled():
+                # Granted at the same moment the wait expired
+                ADMISSION_WAIT.labels(language).observe(time.monotonic() - t0)
+                return
+            fut.cancel()
+            ADMISSION_QUEUE_DEPTH.set(self.queue_depth)
+            ADMISSION_REJECTIONS.labels(language, "queue_timeout").inc()
+            raise AdmissionRejected("queue_timeout", self._retry_after())
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release(language)
+            else:
+                fut.cancel()
+                ADMISSION_QUEUE_DEPTH.set(self.queue_depth)
+            raise
+        ADMISSION_WAIT.labels(language).observe(time.monotonic() - t0)
+
+    def release(self, language: str, held_for: Optional[float] = None) -> None:
+        language = language.lower()
+        self._running = max(0, self._running - 1)
+        self._running_by_lang[language] = max(0, self._running_by_lang.get(language, 0) - 1)
+        ADMISSION_RUNNING.labels(language).set(self._running_by_lang[language])
+        if held_for is not None:
+            self._avg_hold = 0.2 * held_for + 0.8 * self._avg_hold
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, language: str, priority: int = 50) -> AsyncIterator[None]:
+        await self.acquire(language, priority)
+        t0 = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(language, time.monotonic() - t0)
+
+
+admission = AdmissionController(
+    max_concurrency=settings.EXECUTION_MAX_CONCURRENCY,
+    language_limits=parse_limits(settings.EXECUTION_LANGUAGE_LIMITS),
+    queue_size=settings.EXECUTION_QUEUE_SIZE,
+    queue_timeout=settings.EXECUTION_QUEUE_TIMEOUT_SECONDS,
+)
@@ -188,6 +188,11 @@ class AgentRegistry:
                 await self.redis.set(f"agent:load:{agent_id}", str(load), ex=self.ttl)
             except Exception:
                 pass
+            try:
+                # Lets the mission assigner retry waiting missions as soon as capacity frees up
+                await self._publish_event("heartbeat", {"id": agent_id, "status": status.value, "load": load})
+            except Exception:
+                pass
             HEARTBEAT_COUNT.labels(self._env, self._ver).inc()
             return True
         except Exception as e:
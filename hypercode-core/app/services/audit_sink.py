@@ -0,0 +1,134 @@
+"""
+Write-behind sink for AuditLog rows.
+
+Mission state changes hand their audit rows to the sink instead of awaiting
+an INSERT each. While running, the sink buffers rows in a bounded in-memory
+queue and writes them with ``create_many`` once ``batch_size`` rows are
+waiting or every ``flush_interval`` seconds, and drains the queue on stop().
+Rows are lost if the process dies before a flush, or dropped (and counted)
+when the queue is full. Until start() is called, as in CLI tools and most
+tests, rows are written inline.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.core.config import get_settings
+from app.core.db import db
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+AUDIT_SINK_QUEUE_DEPTH = Gauge(
+    "audit_sink_queue_depth",
+    "Audit rows waiting to be written",
+)
+AUDIT_SINK_DROPPED = Counter(
+    "audit_sink_dropped_total",
+    "Audit rows that were never written",
+    ("reason",),
+)
+AUDIT_SINK_FLUSHED = Counter(
+    "audit_sink_flushed_total",
+    "Audit rows written by the sink",
+)
+AUDIT_SINK_LAG = Histogram(
+    "audit_sink_lag_seconds",
+    "Time the oldest row of a batch waited before being written",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+
+class AuditSink:
+    def __init__(
+        self,
+        batch_size: int = settings.AUDIT_SINK_BATCH_SIZE,
+        flush_interval: float = settings.AUDIT_SINK_FLUSH_SECONDS,
+        max_queue: int = settings.AUDIT_SINK_MAX_QUEUE,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._rows: Deque[Tuple[float, Dict[str, Any]]] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._closing = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> asyncio.Task:
+        self._closing = False
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Write everything still queued, then fall back to inline writes."""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wake.set()
+        try:
+            await self._task
+        finally:
+            self._task = None
+
+    async def record(self, row: Dict[str, Any]) -> None:
+        if not self.running:
+            await db.auditlog.create(row)
+            return
+        if len(self._rows) >= self.max_queue:
+            AUDIT_SINK_DROPPED.labels("full").inc()
+            return
+        self._rows.append((time.monotonic(), row))
+        AUDIT_SINK_QUEUE_DEPTH.set(len(self._rows))
+        if len(self._rows) >= self.batch_size:
+            self._wake.set()
+
+    async def flush(self) -> int:
+        """Write queued rows in batches of ``batch_size``; returns how many were written."""
+        written = 0
+        while self._rows:
+            batch = [self._rows.popleft() for _ in range(min(self.batch_size, len(self._rows)))]
+            AUDIT_SINK_QUEUE_DEPTH.set(len(self._rows))
+            AUDIT_SINK_LAG.observe(time.monotonic() - batch[0][0])
+            written += await self._write([row for _, row in batch])
+        return written
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+        await self.flush()
+
+    async def _write(self, rows: List[Dict[str, Any]]) -> int:
+        try:
+            await db.auditlog.create_many(data=rows)
+            AUDIT_SINK_FLUSHED.inc(len(rows))
+            return len(rows)
+        except Exception as e:
+            logger.warning("audit_batch_failed", rows=len(rows), error=str(e))
+        # One bad row (e.g. an unknown missionId) must not take the whole batch down
+        written = 0
+        for row in rows:
+            try:
+                await db.auditlog.create(row)
+                written += 1
+            except Exception as e:
+                AUDIT_SINK_DROPPED.labels("error").inc()
+                logger.error("audit_row_dropped", mission_id=row.get("missionId"), error=str(e))
+        AUDIT_SINK_FLUSHED.inc(written)
+        return written
+
+
+audit_sink = AuditSink()
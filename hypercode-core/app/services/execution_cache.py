@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+import structlog
+from prometheus_client import Counter, Gauge
+from app.core.config import get_settings
+from app.schemas.execution import ExecutionRequest, ExecutionResult
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+EXECUTION_CACHE_REQUESTS = Counter(
+    "execution_cache_requests_total",
+    "Execution cache lookups",
+    ("result",),  # hit, miss, coalesced
+)
+EXECUTION_CACHE_ENTRIES = Gauge(
+    "execution_cache_entries",
+    "Execution results currently cached",
+)
+EXECUTION_CACHE_EVICTIONS = Counter(
+    "execution_cache_evictions_total",
+    "Execution cache evictions",
+    ("reason",),  # ttl, size
+)
+
+
+class ExecutionCache:
+    """
+    In-process TTL/LRU cache for deterministic execution results.
+    Concurrent identical requests are coalesced onto a single execution.
+    """
+    def __init__(self, enabled: bool = False, ttl_seconds: float = 300.0, max_entries: int = 1024):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, ExecutionResult]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def key_for(request: ExecutionRequest) -> str:
+        material = json.dumps({
+            "language": request.language.value,
+            "code": request.code,
+            "target": request.target,
+            "env": request.env_vars,
+        }, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[ExecutionResult]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        expires_at, result = item
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            EXECUTION_CACHE_EVICTIONS.labels("ttl").inc()
+            EXECUTION_CACHE_ENTRIES.set(len(self._entries))
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: str, result: ExecutionResult) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            EXECUTION_CACHE_EVICTIONS.labels("size").inc()
+        EXECUTION_CACHE_ENTRIES.set(len(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        EXECUTION_CACHE_ENTRIES.set(0)
+
+    async def get_or_execute(self, key: str, execute: Callable[[], Awaitable[ExecutionResult]]) -> ExecutionResult:
+        """Return a cached result, join an identical in-flight execution, or run ``execute``."""
+        cached = self.get(key)
+        if cached is not None:
+            EXECUTION_CACHE_REQUESTS.labels("hit").inc()
+            return cached.model_copy(update={"cached": True})
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            EXECUTION_CACHE_REQUESTS.labels("coalesced").inc()
+            result = await asyncio.shield(pending)
+            return result.model_copy(update={"cached": True})
+
+        EXECUTION_CACHE_REQUESTS.labels("miss").inc()
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            result = await execute()
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            # Mark retrieved so an unawaited failure does not log a warning
+            fut.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        # Timeouts depend on load rather than on the program, never cache them
+        if result.status != "timeout":
+            self.put(key, result)
+        fut.set_result(result)
+        return result
+
+
+execution_cache = ExecutionCache(
+    enabled=settings.EXECUTION_CACHE_ENABLED,
+    ttl_seconds=settings.EXECUTION_CACHE_TTL_SECONDS,
+    max_entries=settings.EXECUTION_CACHE_MAX_ENTRIES,
+)
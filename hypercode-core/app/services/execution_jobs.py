@@ -0,0 +1,186 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import redis.asyncio as redis
+import structlog
+from prometheus_client import Counter
+
+from app.core.celery_app import celery_app
+from app.core.config import get_settings
+from app.schemas.execution import ExecutionJob, ExecutionRequest, ExecutionResult, JobStatus, OutputChunk
+from app.services.admission import AdmissionRejected
+from app.services.execution_service import ExecutionService
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+EXECUTION_JOBS = Counter(
+    "execution_jobs_total",
+    "Asynchronous execution jobs by lifecycle event",
+    ["event"],
+)
+
+TERMINAL_STATUSES = {JobStatus.SUCCESS, JobStatus.ERROR, JobStatus.TIMEOUT}
+
+
+class ExecutionJobStore:
+    """
+    Redis-backed state for asynchronous execution jobs.
+
+    Each job is a hash (`execjob:{id}`) holding the request, status and final
+    result, plus a list (`execjob:{id}:output`) of stdout/stderr chunks appended
+    by the worker while the program runs. Both expire after `ttl` seconds.
+    """
+    def __init__(self, url: str, ttl: int):
+        self.url = url
+        self.ttl = ttl
+        self.redis = self._connect()
+
+    def _connect(self):
+        return redis.from_url(self.url, decode_responses=True)
+
+    def for_worker(self) -> "ExecutionJobStore":
+        """A store with its own connection, for use inside a worker's event loop."""
+        return ExecutionJobStore(self.url, self.ttl)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"execjob:{job_id}"
+
+    @staticmethod
+    def _output_key(job_id: str) -> str:
+        return f"execjob:{job_id}:output"
+
+    async def create(self, request: ExecutionRequest) -> ExecutionJob:
+        now = datetime.now(timezone.utc).isoformat()
+        job = ExecutionJob(
+            id=str(uuid.uuid4()),
+            status=JobStatus.QUEUED,
+            language=request.language,
+            created_at=now,
+            updated_at=now,
+        )
+        key = self._key(job.id)
+        async with self.redis.pipeline() as pipe:
+            pipe.hset(key, mapping={
+                "id": job.id,
+                "status": job.status.value,
+                "language": job.language.value,
+                "request": request.model_dump_json(),
+                "created_at": now,
+                "updated_at": now,
+            })
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+        return job
+
+    async def get(self, job_id: str) -> Optional[ExecutionJob]:
+        data = await self.redis.hgetall(self._key(job_id))
+        if not data:
+            return None
+        result = data.get("result")
+        return ExecutionJob(
+            id=data["id"],
+            status=JobStatus(data["status"]),
+            language=data["language"],
+            created_at=data["created_at"],
+            updated_at=data["updated_at"],
+            result=ExecutionResult.model_validate_json(result) if result else None,
+            error=data.get("error") or None,
+        )
+
+    async def get_request(self, job_id: str) -> Optional[ExecutionRequest]:
+        raw = await self.redis.hget(self._key(job_id), "request")
+        return ExecutionRequest.model_validate_json(raw) if raw else None
+
+    async def set_status(self, job_id: str, status: JobStatus,
+                         result: Optional[ExecutionResult] = None, error: Optional[str] = None) -> None:
+        mapping = {"status": status.value, "updated_at": datetime.now(timezone.utc).isoformat()}
+        if result is not None:
+            mapping["result"] = result.model_dump_json()
+        if error is not None:
+            mapping["error"] = error
+        await self.redis.hset(self._key(job_id), mapping=mapping)
+
+    async def append_output(self, job_id: str, stream: str, text: str) -> None:
+        key = self._output_key(job_id)
+        async with self.redis.pipeline() as pipe:
+            pipe.rpush(key, json.dumps({"stream": stream, "text": text}))
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def read_output(self, job_id: str, offset: int = 0, limit: int = 500) -> List[OutputChunk]:
+        raw = await self.redis.lrange(self._output_key(job_id), offset, offset + limit - 1)
+        return [OutputChunk(**json.loads(item)) for item in raw]
+
+
+execution_job_store = ExecutionJobStore(settings.HYPERCODE_REDIS_URL, settings.EXECUTION_JOB_TTL_SECONDS)
+
+
+async def submit_job(request: ExecutionRequest) -> ExecutionJob:
+    """Record a queued job and hand it to a Celery worker; returns immediately."""
+    job = await execution_job_store.create(request)
+    try:
+        # apply_async talks to the broker synchronously
+        await asyncio.to_thread(run_execution_job.apply_async, args=[job.id], task_id=job.id)
+    except Exception as e:
+        await execution_job_store.set_status(job.id, JobStatus.ERROR, error=f"Failed to enqueue job: {e}")
+        EXECUTION_JOBS.labels("enqueue_failed").inc()
+        raise
+    EXECUTION_JOBS.labels("submitted").inc()
+    return await execution_job_store.get(job.id) or job
+
+
+async def _run_job(job_id: str) -> None:
+    store = execution_job_store.for_worker()
+    try:
+        request = await store.get_request(job_id)
+        if request is None:
+            logger.warning("execution_job_missing", job_id=job_id)
+            return
+        await store.set_status(job_id, JobStatus.RUNNING)
+
+        async def on_output(stream: str, text: str) -> None:
+            await store.append_output(job_id, stream, text)
+
+        try:
+            result = await ExecutionService.execute_code(request, on_output=on_output)
+        except AdmissionRejected:
+            await store.set_status(job_id, JobStatus.QUEUED)
+            raise
+        except Exception as e:
+            logger.error("execution_job_failed", job_id=job_id, error=str(e))
+            await store.set_status(job_id, JobStatus.ERROR, error=str(e))
+            EXECUTION_JOBS.labels("error").inc()
+            return
+        await store.set_status(job_id, JobStatus(result.status), result=result)
+        EXECUTION_JOBS.labels(result.status).inc()
+    finally:
+        await store.close()
+
+
+async def _fail_job(job_id: str, error: str) -> None:
+    store = execution_job_store.for_worker()
+    try:
+        await store.set_status(job_id, JobStatus.ERROR, error=error)
+        EXECUTION_JOBS.labels("error").inc()
+    finally:
+        await store.close()
+
+
+@celery_app.task(name="execution.run_job", bind=True, acks_late=True, max_retries=10)
+def run_execution_job(self, job_id: str) -> None:
+    try:
+        asyncio.run(_run_job(job_id))
+    except AdmissionRejected as e:
+        if self.request.retries >= self.max_retries:
+            asyncio.run(_fail_job(job_id, f"Execution capacity exhausted ({e.reason})"))
+            return
+        # This worker is saturated; put the job back on the broker for any worker to take
+        raise self.retry(exc=e, countdown=e.retry_after)
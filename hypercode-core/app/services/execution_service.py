@@ -1,76 +1,103 @@
 import asyncio
 import time
 import structlog
-from typing import Tuple
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from app.core.config import get_settings
 from app.schemas.execution import ExecutionRequest, ExecutionResult, Language
 from app.engine.adapter import run_hypercode
+from app.services.execution_cache import execution_cache
+from app.services.python_pool import python_pool, WorkerPoolError
+from app.services.admission import admission, AdmissionRejected
+from app.engine.output import OutputBuffer, read_bounded
+from app.engine.accounting import children_snapshot, record_children_delta, record_rusage_dict
+from prometheus_client import Histogram
 
 logger = structlog.get_logger()
+settings = get_settings()
+
+EXECUTION_CPU_SECONDS = Histogram(
+    "execution_cpu_seconds",
+    "User plus system CPU time per execution",
+    ["language", "backend"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+EXECUTION_PEAK_RSS_BYTES = Histogram(
+    "execution_peak_rss_bytes",
+    "Peak resident memory per execution",
+    ["language", "backend"],
+    buckets=(1 << 20, 4 << 20, 16 << 20, 32 << 20, 64 << 20, 128 << 20, 256 << 20, 512 << 20, 1 << 30, 4 << 30),
+)
+EXECUTION_OUTPUT_BYTES = Histogram(
+    "execution_output_bytes",
+    "Bytes written to stdout and stderr per execution, before truncation",
+    ["language", "backend"],
+    buckets=(0, 1 << 10, 16 << 10, 128 << 10, 1 << 20, 8 << 20, 64 << 20, 512 << 20),
+)
 
 LAST_RESULT: ExecutionResult | None = None
 
+# on_output(stream_name, text) receives "stdout"/"stderr" chunks as they are produced
+OutputCallback = Callable[[str, str], Awaitable[None]]
+
 class ExecutionService:
     @staticmethod
-    async def execute_code(request: ExecutionRequest) -> ExecutionResult:
+    async def execute_code(request: ExecutionRequest, on_output: Optional[OutputCallback] = None) -> ExecutionResult:
+        if execution_cache.enabled and ExecutionService._is_cacheable(request):
+            key = execution_cache.key_for(request)
+            result = await execution_cache.get_or_execute(key, lambda: ExecutionService._execute(request))
+            global LAST_RESULT
+            LAST_RESULT = result
+            await ExecutionService._emit(on_output, result.stdout, result.stderr)
+            return result
+        return await ExecutionService._execute(request, on_output)
+
+    @staticmethod
+    async def _emit(on_output: Optional[OutputCallback], stdout: str, stderr: str) -> None:
+        """Deliver output of backends that cannot stream as a single chunk per stream."""
+        if on_output is None:
+            return
+        if stdout:
+            await on_output("stdout", stdout)
+        if stderr:
+            await on_output("stderr", stderr)
+
+    @staticmethod
+    def _is_cacheable(request: ExecutionRequest) -> bool:
+        """Only HyperCode programs the interpreter proves pure are deterministic enough to cache."""
+        if request.language != Language.HYPERCODE:
+            return False
+        try:
+            from app.parser.hc_parser import parse
+            from app.engine.interpreter import is_pure
+            return is_pure(parse(request.code))
+        except Exception:
+            return False
+
+    @staticmethod
+    async def _execute(request: ExecutionRequest, on_output: Optional[OutputCallback] = None) -> ExecutionResult:
         logger.info("executing_code", language=request.language)
         start_time = time.time()
+        stats: Dict[str, Any] = {}
         
         try:
-            if request.language == Language.HYPERCODE:
-                if request.target:
-                    cmd, args = ExecutionService._build_command(request)
-                    process = await asyncio.create_subprocess_exec(
-                        cmd, *args,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                        env=request.env_vars
-                    )
-                    try:
-                        stdout_data, stderr_data = await asyncio.wait_for(
-                            process.communicate(), 
-                            timeout=request.timeout
-                        )
-                        stdout = stdout_data.decode().strip()
-                        stderr = stderr_data.decode().strip()
-                        exit_code = process.returncode
-                        status = "success" if exit_code == 0 else "error"
-                    except asyncio.TimeoutError:
-                        process.kill()
-                        stdout = ""
-                        stderr = "Execution timed out"
-                        exit_code = -1
-                        status = "timeout"
-                        logger.warning("execution_timeout", timeout=request.timeout)
-                else:
-                    stdout, stderr, exit_code, _ = await run_hypercode(
-                        request.code, timeout=request.timeout, env=request.env_vars, target=request.target
-                    )
-                    status = "success" if exit_code == 0 else ("timeout" if exit_code == -1 and "timed out" in stderr.lower() else "error")
-            else:
-                cmd, args = ExecutionService._build_command(request)
-                process = await asyncio.create_subprocess_exec(
-                    cmd, *args,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                    env=request.env_vars
+            if request.language == Language.HYPERCODE and not request.target:
+                stdout, stderr, exit_code, _ = await run_hypercode(
+                    request.code, timeout=request.timeout, env=request.env_vars, target=request.target, stats=stats
                 )
+                status = "success" if exit_code == 0 else ("timeout" if exit_code == -1 and "timed out" in stderr.lower() else "error")
+                await ExecutionService._emit(on_output, stdout, stderr)
+            elif request.language == Language.PYTHON and python_pool.enabled:
                 try:
-                    stdout_data, stderr_data = await asyncio.wait_for(
-                        process.communicate(), 
-                        timeout=request.timeout
-                    )
-                    stdout = stdout_data.decode().strip()
-                    stderr = stderr_data.decode().strip()
-                    exit_code = process.returncode
-                    status = "success" if exit_code == 0 else "error"
-                except asyncio.TimeoutError:
-                    process.kill()
-                    stdout = ""
-                    stderr = "Execution timed out"
-                    exit_code = -1
-                    status = "timeout"
-                    logger.warning("execution_timeout", timeout=request.timeout)
+                    stdout, stderr, exit_code, status = await ExecutionService._run_pooled(request, stats)
+                    await ExecutionService._emit(on_output, stdout, stderr)
+                except WorkerPoolError as e:
+                    logger.warning("python_pool_unavailable", error=str(e))
+                    stdout, stderr, exit_code, status = await ExecutionService._run_subprocess(request, stats, on_output)
+            else:
+                stdout, stderr, exit_code, status = await ExecutionService._run_subprocess(request, stats, on_output)
 
+        except AdmissionRejected:
+            raise
         except Exception as e:
             logger.error("execution_failed", error=str(e))
             stdout = ""
@@ -79,6 +106,7 @@ class ExecutionService:
             status = "error"
 
         duration = time.time() - start_time
+        bytes_dropped = stats.get("bytes_dropped", 0)
         
         result = ExecutionResult(
             stdout=stdout,
@@ -86,12 +114,93 @@ class ExecutionService:
             exit_code=exit_code,
             status=status,
             duration=duration,
-            language=request.language
+            language=request.language,
+            bytes_dropped=bytes_dropped,
+            backend=stats.get("backend"),
+            cpu_user=stats.get("cpu_user", 0.0),
+            cpu_system=stats.get("cpu_system", 0.0),
+            peak_rss_bytes=stats.get("peak_rss_bytes"),
+            output_bytes=stats.get("output_bytes", len(stdout.encode()) + len(stderr.encode()) + bytes_dropped),
         )
+        ExecutionService._observe_usage(result)
         global LAST_RESULT
         LAST_RESULT = result
         return result
 
+    @staticmethod
+    def _observe_usage(result: ExecutionResult) -> None:
+        labels = (result.language.value, result.backend or "none")
+        EXECUTION_CPU_SECONDS.labels(*labels).observe(result.cpu_user + result.cpu_system)
+        EXECUTION_OUTPUT_BYTES.labels(*labels).observe(result.output_bytes)
+        if result.peak_rss_bytes is not None:
+            EXECUTION_PEAK_RSS_BYTES.labels(*labels).observe(result.peak_rss_bytes)
+
+    @staticmethod
+    async def _run_subprocess(request: ExecutionRequest, stats: Dict[str, Any],
+                              on_output: Optional[OutputCallback] = None) -> Tuple[str, str, int, str]:
+        cmd, args = ExecutionService._build_command(request)
+        stats["backend"] = "subprocess"
+        async with admission.slot(request.language.value, request.priority):
+            usage = children_snapshot()
+            process = await asyncio.create_subprocess_exec(
+                cmd, *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=request.env_vars
+            )
+            # Read incrementally into head/tail buffers so output memory is bounded
+            out = OutputBuffer(settings.EXECUTION_MAX_OUTPUT_BYTES)
+            err = OutputBuffer(settings.EXECUTION_MAX_OUTPUT_BYTES)
+            forward_out = forward_err = None
+            if on_output is not None:
+                forward_out = lambda text: on_output("stdout", text)
+                forward_err = lambda text: on_output("stderr", text)
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(
+                        read_bounded(process.stdout, out, forward_out),
+                        read_bounded(process.stderr, err, forward_err),
+                        process.wait(),
+                    ),
+                    timeout=request.timeout
+                )
+            except asyncio.TimeoutError:
+                process.kill()
+                logger.warning("execution_timeout", timeout=request.timeout)
+                # Reap here so the killed child's CPU is not billed to a later run
+                await ExecutionService._reap(process)
+                record_children_delta(usage, stats)
+                return "", "Execution timed out", -1, "timeout"
+            record_children_delta(usage, stats)
+        exit_code = process.returncode
+        stats["bytes_dropped"] = out.bytes_dropped + err.bytes_dropped
+        stats["output_bytes"] = out.total + err.total
+        if stats["bytes_dropped"]:
+            logger.warning("execution_output_truncated", bytes_dropped=stats["bytes_dropped"])
+        return out.getvalue().strip(), err.getvalue().strip(), exit_code, "success" if exit_code == 0 else "error"
+
+    @staticmethod
+    async def _reap(process) -> None:
+        try:
+            await asyncio.wait_for(process.wait(), timeout=5.0)
+        except (asyncio.TimeoutError, ProcessLookupError):
+            pass
+
+    @staticmethod
+    async def _run_pooled(request: ExecutionRequest, stats: Dict[str, Any]) -> Tuple[str, str, int, str]:
+        async with admission.slot(request.language.value, request.priority):
+            run = await python_pool.run(
+                request.code, env=request.env_vars, timeout=request.timeout,
+                max_output=settings.EXECUTION_MAX_OUTPUT_BYTES,
+            )
+        stats["backend"] = "pool"
+        record_rusage_dict(run.rusage, stats)
+        if run.timed_out:
+            logger.warning("execution_timeout", timeout=request.timeout)
+            return "", "Execution timed out", -1, "timeout"
+        stats["bytes_dropped"] = run.bytes_dropped
+        return run.stdout.strip(), run.stderr.strip(), run.exit_code, "success" if run.exit_code == 0 else "error"
+
     @staticmethod
     def _build_command(request: ExecutionRequest) -> Tuple[str, list]:
         if request.language == Language.PYTHON:
@@ -0,0 +1,151 @@
+"""
+Event-driven background mission assignment.
+
+The assigner sleeps until something may have made a queued mission
+assignable: a mission was created or requeued (mission.events stream), or an
+agent registered or heartbeated while missions were left waiting
+(agents:watch pubsub). Bursts of wake-ups are coalesced by a short debounce,
+and a slow safety poll covers anything the watchers miss, such as expired
+leases or events published while Redis was unreachable.
+"""
+import asyncio
+import json
+from typing import List, Optional
+
+import structlog
+from prometheus_client import Counter
+
+from app.core.config import get_settings
+from app.services.agent_registry import agent_registry
+from app.services.event_bus import event_bus
+from app.services.orchestrator import orchestrator, QUEUE_KEY
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+MISSION_ASSIGNER_WAKEUPS = Counter(
+    "mission_assigner_wakeups_total",
+    "Wake-ups of the background mission assigner",
+    ("reason",),
+)
+
+MISSION_STREAM = "mission.events"
+WAKE_MISSION_EVENTS = {"mission.created", "mission.queued"}
+# Agent events that can add capacity; deregistration and timeouts cannot
+WAKE_AGENT_EVENTS = {"registered", "heartbeat"}
+
+
+class MissionAssigner:
+    def __init__(
+        self,
+        batch_size: int = settings.MISSION_ASSIGN_BATCH_SIZE,
+        debounce: float = settings.MISSION_ASSIGNER_DEBOUNCE_SECONDS,
+        poll_interval: float = settings.MISSION_ASSIGNER_POLL_SECONDS,
+    ):
+        self.batch_size = batch_size
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        # Missions were left in the queue by the last pass, so new capacity is worth a pass
+        self.waiting = False
+        self._wake: Optional[asyncio.Event] = None
+
+    def start(self) -> List[asyncio.Task]:
+        """Spawn the assignment loop and its two watchers on the running loop."""
+        self._wake = asyncio.Event()
+        return [
+            asyncio.create_task(self.run()),
+            asyncio.create_task(self.watch_missions()),
+            asyncio.create_task(self.watch_agents()),
+        ]
+
+    def wake(self, reason: str) -> None:
+        MISSION_ASSIGNER_WAKEUPS.labels(reason).inc()
+        if self._wake is not None:
+            self._wake.set()
+
+    async def assign_once(self) -> int:
+        """One assignment step; returns how many missions were assigned."""
+        if self.batch_size > 0:
+            batch = await orchestrator.assign_batch(self.batch_size)
+            if batch:
+                logger.info("missions_auto_assigned", count=len(batch))
+            return len(batch)
+        # One at a time, with LLM routing when enabled
+        assigned = await orchestrator.assign_next()
+        if assigned:
+            logger.info("mission_auto_assigned", mission_id=assigned.id, agent_id=assigned.agent_id)
+            return 1
+        return 0
+
+    async def drain(self) -> int:
+        """Assign until the queue is empty or nothing left in it fits an agent."""
+        total = 0
+        while (assigned := await self.assign_once()):
+            total += assigned
+        self.waiting = await orchestrator.redis.zcard(QUEUE_KEY) > 0
+        return total
+
+    async def run(self):
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        # Startup pass for anything queued while no assigner was running
+        self._wake.set()
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                MISSION_ASSIGNER_WAKEUPS.labels("poll").inc()
+            await asyncio.sleep(self.debounce)
+            self._wake.clear()
+            try:
+                await self.drain()
+            except Exception as e:
+                logger.warning("mission_assigner_pass_failed", error=str(e))
+                await asyncio.sleep(1.0)
+
+    async def watch_missions(self):
+        # Plain XREAD rather than a consumer group: every replica should hear every event
+        last_id = "$"
+        while True:
+            try:
+                entries = await event_bus.redis.xread({MISSION_STREAM: last_id}, count=100, block=1000)
+                for _stream, rows in entries or []:
+                    for entry_id, fields in rows:
+                        last_id = entry_id
+                        msg_type = fields.get("message_type")
+                        if msg_type in WAKE_MISSION_EVENTS:
+                            self.waiting = True
+                            self.wake(msg_type)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("mission_assigner_stream_failed", error=str(e))
+                await asyncio.sleep(1.0)
+
+    async def watch_agents(self):
+        while True:
+            pubsub = agent_registry.redis.pubsub()
+            try:
+                await pubsub.subscribe(agent_registry.pubsub_channel)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    try:
+                        event = json.loads(message["data"]).get("event")
+                    except (TypeError, ValueError):
+                        continue
+                    if event in WAKE_AGENT_EVENTS and self.waiting:
+                        self.wake(f"agent.{event}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("mission_assigner_pubsub_failed", error=str(e))
+                await asyncio.sleep(1.0)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+
+mission_assigner = MissionAssigner()
@@ -0,0 +1,224 @@
+"""
+Server-side Lua for mission state changes.
+
+Each script validates, applies and reads back a change in a single round
+trip, so concurrent orchestrator replicas cannot interleave between the read
+and the write. Index keys derived from the mission's current state are built
+inside the scripts, which assumes a single (non-cluster) Redis.
+"""
+import hashlib
+from typing import Any, List, Sequence, Tuple
+
+from redis.exceptions import NoScriptError
+
+
+class LuaScript:
+    """EVALSHA with a SCRIPT LOAD fallback, usable against whichever client the caller holds."""
+    def __init__(self, source: str):
+        self.source = source
+        self.sha = hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+    async def __call__(self, client, keys: Sequence[str], args: Sequence[Any]):
+        try:
+            return await client.evalsha(self.sha, len(keys), *keys, *args)
+        except NoScriptError:
+            await client.script_load(self.source)
+            return await client.evalsha(self.sha, len(keys), *keys, *args)
+
+    async def many(self, client, calls: Sequence[Tuple[Sequence[str], Sequence[Any]]]) -> List[Any]:
+        """
+        Run the script once per (keys, args) in one pipeline. Per-call errors are
+        returned in place of results rather than raised.
+        """
+        results: List[Any] = []
+        for _ in range(2):
+            async with client.pipeline(transaction=False) as pipe:
+                for keys, args in calls:
+                    pipe.evalsha(self.sha, len(keys), *keys, *args)
+                results = await pipe.execute(raise_on_error=False)
+            if not any(isinstance(r, NoScriptError) for r in results):
+                break
+            # NOSCRIPT calls had no effect, so loading and replaying the batch is safe
+            await client.script_load(self.source)
+        return results
+
+
+# KEYS: mission hash, queue ZSET, created index ZSET, leases ZSET
+# ARGV: mission id, target state, updated_at, space-separated states allowed to
+#       move to the target, state index prefix, lease owner the caller must
+#       hold ("" for none), then field/value pairs to set.
+# Returns nil if the mission does not exist, {"illegal", from} if the current
+# state may not move to the target, {"lost", from} if the caller's lease was
+# taken over, else {"ok", from, {ids of dependents it made ready}, <HGETALL of
+# the mission>}. Any transition ends the mission's lease. Completing a mission
+# decrements the unmet-dependency count of each dependent and queues those that
+# reach zero while deferred.
+TRANSITION = LuaScript("""
+local from = redis.call('HGET', KEYS[1], 'state')
+if not from then return nil end
+local mid, target = ARGV[1], ARGV[2]
+local allowed = false
+for s in string.gmatch(ARGV[4], '%S+') do
+  if s == from then allowed = true break end
+end
+if not allowed then return {'illegal', from} end
+if ARGV[6] ~= '' and redis.call('HGET', KEYS[1], 'lease_owner') ~= ARGV[6] then
+  return {'lost', from}
+end
+
+local fields = {'state', target, 'updated_at', ARGV[3]}
+for i = 7, #ARGV do fields[#fields + 1] = ARGV[i] end
+redis.call('HSET', KEYS[1], unpack(fields))
+redis.call('HDEL', KEYS[1], 'lease_owner', 'lease_score')
+redis.call('ZREM', KEYS[4], mid)
+
+local created = redis.call('ZSCORE', KEYS[3], mid)
+if not created then
+  -- Not indexed yet (written before the indexes existed): index it as of now
+  local t = redis.call('TIME')
+  created = string.format('%.0f', tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000))
+  redis.call('ZADD', KEYS[3], created, mid)
+end
+if target == 'queued' then
+  -- Same score as orchestrator.queue_score
+  local priority = tonumber(redis.call('HGET', KEYS[1], 'priority')) or 0
+  redis.call('ZADD', KEYS[2], string.format('%.0f', (100 - priority) * 1e13 + tonumber(created)), mid)
+else
+  redis.call('ZREM', KEYS[2], mid)
+end
+redis.call('ZREM', ARGV[5] .. from, mid)
+redis.call('ZADD', ARGV[5] .. target, created, mid)
+
+if target == 'failed' then
+  local agent = redis.call('HGET', KEYS[1], 'agent_id')
+  if agent and agent ~= '' then
+    local fkey = 'agent:' .. agent .. ':failures'
+    local count = redis.call('INCR', fkey)
+    redis.call('EXPIRE', fkey, 300)
+    if count >= 3 then redis.call('SET', 'cb:open:' .. agent, '1', 'EX', 60) end
+  end
+end
+
+local unlocked = {}
+if target == 'completed' then
+  local prefix = string.sub(KEYS[1], 1, #KEYS[1] - #mid)
+  local dependents = KEYS[1] .. ':dependents'
+  for _, child in ipairs(redis.call('SMEMBERS', dependents)) do
+    local ckey = prefix .. child
+    if redis.call('EXISTS', ckey) == 1
+        and redis.call('HINCRBY', ckey, 'unmet_deps', -1) <= 0
+        and redis.call('HGET', ckey, 'state') == 'deferred' then
+      local ccreated = redis.call('ZSCORE', KEYS[3], child) or created
+      local cpriority = tonumber(redis.call('HGET', ckey, 'priority')) or 0
+      redis.call('HSET', ckey, 'state', 'queued', 'updated_at', ARGV[3])
+      redis.call('ZADD', KEYS[2], string.format('%.0f', (100 - cpriority) * 1e13 + tonumber(ccreated)), child)
+      redis.call('ZREM', ARGV[5] .. 'deferred', child)
+      redis.call('ZADD', ARGV[5] .. 'queued', ccreated, child)
+      unlocked[#unlocked + 1] = child
+    end
+  end
+  redis.call('DEL', dependents)
+end
+
+local out = {'ok', from, unlocked}
+local h = redis.call('HGETALL', KEYS[1])
+for i = 1, #h do out[#out + 1] = h[i] end
+return out
+""")
+
+# KEYS: mission hash, queue ZSET, created index ZSET
+# ARGV: mission id, created_at (ms), queue score, state index prefix, mission key
+#       prefix, dependency count N, N dependency ids, then field/value pairs.
+# Stores a new mission with its dependency edges: it is added to the dependents
+# set of every dependency not completed yet and keeps their number as
+# unmet_deps. The mission is deferred while that is above zero, else queued.
+# Returns {"missing", id} without writing anything if a dependency does not
+# exist, else {state, unmet_deps}.
+SUBMIT_DEPENDENT = LuaScript("""
+local mid, n = ARGV[1], tonumber(ARGV[6])
+local pending = {}
+for i = 7, 6 + n do
+  local state = redis.call('HGET', ARGV[5] .. ARGV[i], 'state')
+  if not state then return {'missing', ARGV[i]} end
+  if state ~= 'completed' then pending[#pending + 1] = ARGV[i] end
+end
+for _, dep in ipairs(pending) do
+  redis.call('SADD', ARGV[5] .. dep .. ':dependents', mid)
+end
+
+local state = 'queued'
+if #pending > 0 then state = 'deferred' end
+local fields = {'state', state, 'unmet_deps', #pending}
+for i = 7 + n, #ARGV do fields[#fields + 1] = ARGV[i] end
+redis.call('HSET', KEYS[1], unpack(fields))
+redis.call('ZADD', KEYS[3], ARGV[2], mid)
+redis.call('ZADD', ARGV[4] .. state, ARGV[2], mid)
+if state == 'queued' then redis.call('ZADD', KEYS[2], ARGV[3], mid) end
+return {state, #pending}
+""")
+
+# KEYS: mission hash; ARGV: updated_at. Returns nil or the approved mission's HGETALL.
+APPROVE = LuaScript("""
+if redis.call('EXISTS', KEYS[1]) == 0 then return nil end
+redis.call('HSET', KEYS[1], 'approved', '1', 'updated_at', ARGV[1])
+return redis.call('HGETALL', KEYS[1])
+""")
+
+# KEYS: queue ZSET, leases ZSET
+# ARGV: now (ms), lease length (ms), owner token, max missions to claim, mission key prefix
+# First requeues (at their old position) missions whose lease expired before
+# they were assigned, then pops up to N queued missions off the queue head and
+# leases them to the owner. Entries whose hash is gone or no longer queued are
+# dropped. Returns {queue depth, {queue score, <HGETALL>}, ...}.
+CLAIM = LuaScript("""
+local now = tonumber(ARGV[1])
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now, 'LIMIT', 0, 100)
+for _, id in ipairs(expired) do
+  redis.call('ZREM', KEYS[2], id)
+  local key = ARGV[5] .. id
+  local score = redis.call('HGET', key, 'lease_score')
+  if score and redis.call('HGET', key, 'state') == 'queued' then
+    redis.call('ZADD', KEYS[1], score, id)
+  end
+  redis.call('HDEL', key, 'lease_owner', 'lease_score')
+end
+
+local claimed = {}
+while #claimed < tonumber(ARGV[4]) do
+  local head = redis.call('ZPOPMIN', KEYS[1])
+  if #head == 0 then break end
+  local id, score = head[1], head[2]
+  local key = ARGV[5] .. id
+  if redis.call('HGET', key, 'state') == 'queued' then
+    redis.call('ZADD', KEYS[2], string.format('%.0f', now + tonumber(ARGV[2])), id)
+    redis.call('HSET', key, 'lease_owner', ARGV[3], 'lease_score', score)
+    local entry = {score}
+    local h = redis.call('HGETALL', key)
+    for i = 1, #h do entry[#entry + 1] = h[i] end
+    claimed[#claimed + 1] = entry
+  end
+end
+local out = {redis.call('ZCARD', KEYS[1])}
+for i = 1, #claimed do out[#out + 1] = claimed[i] end
+return out
+""")
+
+# KEYS: leases ZSET, mission hash; ARGV: mission id, owner, new expiry (ms).
+# Returns 1 if the owner still holds the lease and it was extended, else 0.
+RENEW = LuaScript("""
+if redis.call('HGET', KEYS[2], 'lease_owner') ~= ARGV[2] then return 0 end
+return redis.call('ZADD', KEYS[1], 'XX', 'CH', ARGV[3], ARGV[1])
+""")
+
+# KEYS: queue ZSET, leases ZSET, mission hash; ARGV: mission id, owner.
+# Gives an unassigned mission back to the queue at its old position. Returns 1 or 0.
+RELEASE = LuaScript("""
+if redis.call('HGET', KEYS[3], 'lease_owner') ~= ARGV[2] then return 0 end
+local score = redis.call('HGET', KEYS[3], 'lease_score')
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[3], 'lease_owner', 'lease_score')
+if score and redis.call('HGET', KEYS[3], 'state') == 'queued' then
+  redis.call('ZADD', KEYS[1], score, ARGV[1])
+end
+return 1
+""")
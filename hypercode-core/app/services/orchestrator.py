@@ -4,18 +4,22 @@ from app.core.config import get_settings
 from app.schemas.mission import MissionRequest, MissionStatus, MissionState
 from app.services.event_bus import event_bus
 from app.services.agent_registry import agent_registry
+from app.services.audit_sink import audit_sink
 from app.schemas.agent import AgentMetadata
 from app.core.db import db
 from app.schemas.message import MessageEnvelope
 from app.services.llm_service import llm_service
-from prometheus_client import Counter, Histogram
+from app.services.mission_scripts import TRANSITION, APPROVE, CLAIM, RENEW, RELEASE, SUBMIT_DEPENDENT
+from prometheus_client import Counter, Gauge, Histogram
 from datetime import datetime, timezone
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set, Tuple
 from pydantic import BaseModel, Field
 import uuid
 import json
 import asyncio
 import os
+import time
+import socket
 
 logger = structlog.get_logger()
 settings = get_settings()
@@ -31,6 +35,10 @@ MISSION_STATE_DURATION = Histogram(
     ("state",),
     buckets=(0.01, 0.1, 0.5, 1.0, 2.0, 5.0)
 )
+MISSION_QUEUE_DEPTH = Gauge(
+    "mission_queue_depth",
+    "Missions waiting in the assignment queue",
+)
 AUDIT_RETRIEVE_LATENCY = Histogram(
     "audit_retrieve_latency_seconds",
     "Latency of audit retrieval",
@@ -38,6 +46,155 @@ AUDIT_RETRIEVE_LATENCY = Histogram(
     buckets=(0.001, 0.005, 0.01, 0.05, 0.1)
 )
 
+# Queued mission ids, scored so ZRANGE yields highest priority first, then oldest first
+QUEUE_KEY = "mission:queue"
+# Missions claimed by an assigner, scored by lease expiry in ms
+LEASE_KEY = "mission:leases"
+LEASE_SECONDS = settings.MISSION_LEASE_SECONDS
+ASSIGN_BATCH_SIZE = settings.MISSION_ASSIGN_BATCH_SIZE
+ASSIGN_BATCH_MAX = 1000
+# Load an agent is assumed to pick up per mission it receives within one batch
+BATCH_LOAD_STEP = 0.1
+# Listing indexes: every mission by creation time, and per state, all scored by created_at in ms
+CREATED_INDEX_KEY = "mission:index:created"
+STATE_INDEX_PREFIX = "mission:index:state:"
+# Bump when rebuild_indexes learns a new index so existing deployments backfill it
+INDEX_VERSION = 2
+INDEX_VERSION_KEY = "mission:index:version"
+LIST_MAX_LIMIT = 500
+
+# from-state -> states it may move to; enforced atomically by the TRANSITION script
+ALLOWED_TRANSITIONS: Dict[MissionState, Set[MissionState]] = {
+    MissionState.QUEUED: {MissionState.ASSIGNED, MissionState.EXECUTING, MissionState.FAILED, MissionState.ESCALATED, MissionState.DEFERRED},
+    MissionState.ASSIGNED: {MissionState.EXECUTING, MissionState.QUEUED, MissionState.FAILED, MissionState.ESCALATED},
+    MissionState.EXECUTING: {MissionState.VERIFYING, MissionState.COMPLETED, MissionState.FAILED, MissionState.ESCALATED},
+    MissionState.VERIFYING: {MissionState.EXECUTING, MissionState.COMPLETED, MissionState.FAILED, MissionState.ESCALATED},
+    MissionState.FAILED: {MissionState.QUEUED, MissionState.ESCALATED},
+    MissionState.ESCALATED: {MissionState.QUEUED, MissionState.FAILED},
+    MissionState.DEFERRED: {MissionState.QUEUED, MissionState.FAILED},
+    MissionState.COMPLETED: set(),
+}
+
+
+def allowed_sources(to_state: MissionState) -> str:
+    return " ".join(sorted(f.value for f, targets in ALLOWED_TRANSITIONS.items() if to_state in targets))
+
+
+def agent_health(a: AgentMetadata) -> float:
+    """Status and heartbeat recency part of agent_score, in [0, 0.8]."""
+    status_weight = {
+        "active": 1.0,
+        "busy": 0.7,
+        "error": 0.3,
+        "offline": 0.0,
+    }.get(a.status.value if hasattr(a.status, "value") else str(a.status), 0.5)
+    try:
+        last = getattr(a, "lastHeartbeat", None) or getattr(a, "createdAt", None)
+        last_dt = last or datetime.now(timezone.utc)
+        if last_dt.tzinfo is None:
+            last_dt = last_dt.replace(tzinfo=timezone.utc)
+        now_dt = datetime.now(timezone.utc)
+        age = max((now_dt - last_dt).total_seconds(), 0.0)
+        recency = max(0.0, 1.0 - min(age / 60.0, 1.0))
+    except Exception:
+        recency = 0.5
+    return status_weight * 0.5 + recency * 0.3
+
+
+def load_term(load: float) -> float:
+    return max(0.0, 1.0 - min(load, 1.0)) * 0.2
+
+
+def agent_score(a: AgentMetadata, req_caps: List[str], load: float, cb_open: bool = False) -> float:
+    """
+    Suitability of an agent for a mission in [0, 1], or -1 if it must not take
+    it (circuit open or missing a required capability). Weighs status, heartbeat
+    recency and current load.
+    """
+    if cb_open:
+        return -1.0
+    # Capability match
+    caps = set(a.capabilities or [])
+    if any(rc for rc in req_caps) and not set(req_caps).issubset(caps):
+        return -1.0
+    return agent_health(a) + load_term(load)
+
+
+def required_capabilities(mission: Dict[str, str]) -> List[str]:
+    try:
+        payload_raw = mission.get("payload")
+        if payload_raw:
+            return json.loads(payload_raw).get("requirements", {}).get("capabilities", []) or []
+    except Exception:
+        pass
+    return []
+
+
+def match_missions(missions: List[Dict[str, str]], agents: List[AgentMetadata],
+                   loads: Dict[str, float], cb_open: Dict[str, bool]) -> List[Tuple[Dict[str, str], str]]:
+    """
+    Greedy capability-constrained matching in mission order; returns (mission,
+    agent id) pairs. Scores as agent_score, with the load-independent part
+    computed once per agent.
+    """
+    eligible = [(a.id, set(a.capabilities or []), agent_health(a)) for a in agents if not cb_open.get(a.id, False)]
+    loads = {a.id: loads.get(a.id, 0.0) for a in agents}
+    pairs = []
+    for v in missions:
+        req_caps = set(rc for rc in required_capabilities(v) if rc)
+        best_id, best_score = None, -1.0
+        for agent_id, caps, health in eligible:
+            if req_caps and not req_caps <= caps:
+                continue
+            s = health + load_term(loads[agent_id])
+            if s > best_score:
+                best_id, best_score = agent_id, s
+        if best_id is None:
+            continue
+        pairs.append((v, best_id))
+        loads[best_id] += BATCH_LOAD_STEP
+    return pairs
+
+
+class InvalidTransition(Exception):
+    def __init__(self, mission_id: str, from_state: str, to_state: MissionState):
+        super().__init__(f"mission {mission_id} cannot move from {from_state} to {to_state.value}")
+        self.mission_id = mission_id
+        self.from_state = from_state
+        self.to_state = to_state
+
+
+class MissingDependency(Exception):
+    def __init__(self, dependency_id: str):
+        super().__init__(f"Dependency {dependency_id} does not exist")
+        self.dependency_id = dependency_id
+
+
+class LeaseLost(InvalidTransition):
+    """The caller's claim on the mission expired and another assigner took it over."""
+
+
+def created_ms(created_at: str) -> int:
+    return int(datetime.fromisoformat(created_at).timestamp() * 1000)
+
+
+def queue_score(priority: int | str, created_at: str) -> float:
+    """(100 - priority) in the high digits, submission time in ms in the low ones."""
+    return (100 - int(priority)) * 10**13 + created_ms(created_at)
+
+
+def state_index(state: str) -> str:
+    return f"{STATE_INDEX_PREFIX}{state}"
+
+
+def _parse_cursor(cursor: str) -> Tuple[int, str]:
+    """Cursors are ``"<created_ms>:<mission id>"`` of the last mission on the previous page."""
+    score, sep, mid = cursor.partition(":")
+    if not sep or not mid or not score.isdigit():
+        raise ValueError(f"invalid cursor: {cursor!r}")
+    return int(score), mid
+
+
 class Orchestrator:
     def __init__(self):
         self.redis = redis.from_url(
@@ -48,6 +205,9 @@ class Orchestrator:
             retry_on_timeout=True
         )
         self._redis_initialized = False
+        # Per-instance so tests and replicas can tune it; the token identifies the claimer in Redis
+        self.lease_seconds = LEASE_SECONDS
+        self.replica_id = f"{socket.gethostname()}:{os.getpid()}"
 
     async def _ensure_redis(self):
         if self._redis_initialized:
@@ -68,9 +228,15 @@ class Orchestrator:
         return f"mission:{mission_id}"
 
     async def submit(self, req: MissionRequest) -> MissionStatus:
+        """
+        Store a new mission. With dependencies it is deferred until every one of
+        them has completed (raises MissingDependency for an unknown id). Edges
+        always point at existing, older missions, so they cannot form a cycle.
+        """
         await self._ensure_redis()
         mid = str(uuid.uuid4())
         now = datetime.now(timezone.utc).isoformat()
+        deps = list(dict.fromkeys(req.dependencies or []))
         data = {
             "id": mid,
             "title": req.title,
@@ -81,266 +247,347 @@ class Orchestrator:
             "created_at": now,
             "updated_at": now,
         }
-        await self.redis.hset(await self._key(mid), mapping=data)
+        state = MissionState.QUEUED
+        if deps:
+            data["dependencies"] = json.dumps(deps)
+            del data["state"]
+            res = await SUBMIT_DEPENDENT(
+                self.redis,
+                [await self._key(mid), QUEUE_KEY, CREATED_INDEX_KEY],
+                [mid, created_ms(now), queue_score(req.priority, now), STATE_INDEX_PREFIX, "mission:",
+                 len(deps), *deps, *[x for kv in data.items() for x in kv]],
+            )
+            if res[0] == "missing":
+                raise MissingDependency(res[1])
+            state = MissionState(res[0])
+        else:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.hset(await self._key(mid), mapping=data)
+                pipe.zadd(QUEUE_KEY, {mid: queue_score(req.priority, now)})
+                pipe.zadd(CREATED_INDEX_KEY, {mid: created_ms(now)})
+                pipe.zadd(state_index(MissionState.QUEUED.value), {mid: created_ms(now)})
+                await pipe.execute()
         
-        # Persistence & Audit
+        # Redis (above) is the source of truth and is written first, so anyone who
+        # hears the event can already read the mission. Postgres and the stream are
+        # independent of each other and run concurrently; both stay best effort.
+        await asyncio.gather(
+            self._persist_created(mid, req, state, now),
+            self._announce_created(mid, req.title, state),
+        )
+
+        MISSION_TRANSITIONS.labels("none", state.value).inc()
+        return MissionStatus.model_validate({
+            "id": mid,
+            "title": req.title,
+            "state": state,
+            "priority": req.priority,
+            "agent_id": None,
+            "created_at": datetime.fromisoformat(now),
+            "updated_at": datetime.fromisoformat(now),
+        })
+
+    async def _persist_created(self, mid: str, req: MissionRequest, state: MissionState, now: str) -> None:
+        # The audit row references the mission row, so these two stay in order
         try:
             await db.mission.create({
                 "id": mid,
                 "title": req.title,
-                "status": MissionState.QUEUED.value,
+                "status": state.value,
                 "userId": "system",
                 "payload": req.payload or {},
                 "createdAt": datetime.fromisoformat(now),
                 "updatedAt": datetime.fromisoformat(now),
             })
-            await db.auditlog.create({
+            await audit_sink.record({
                 "missionId": mid,
                 "transition": "create",
                 "previousState": "none",
-                "newState": MissionState.QUEUED.value,
+                "newState": state.value,
                 "actor": "system",
                 "reason": "Submission",
             })
         except Exception as e:  # pragma: no cover
             logger.error(f"Persistence failed for mission {mid}: {e}")
 
-        # Event Stream
+    async def _announce_created(self, mid: str, title: str, state: MissionState) -> None:
         try:
             await event_bus.publish_stream(
                 "mission.events",
                 MessageEnvelope(
                     sender_id="orchestrator",
                     message_type="mission.created",
-                    payload={"mission_id": mid, "title": req.title}
+                    payload={"mission_id": mid, "title": title, "state": state.value}
                 )
             )
         except Exception as e:  # pragma: no cover
             logger.error(f"Event publish failed for mission {mid}: {e}")
 
-        MISSION_TRANSITIONS.labels("none", MissionState.QUEUED.value).inc()
-        return MissionStatus.model_validate({
-            "id": mid,
-            "title": req.title,
-            "state": MissionState.QUEUED,
-            "priority": req.priority,
-            "agent_id": None,
-            "created_at": datetime.fromisoformat(now),
-            "updated_at": datetime.fromisoformat(now),
-        })
-
     async def assign_next(self) -> MissionStatus | None:
         await self._ensure_redis()
-        keys = await self.redis.keys("mission:*")
-        
-        # 1. Fetch and Filter Queued Missions
-        queued_missions = []
-        for k in keys:
-            # We need to fetch basic info to check state and priority
-            # Optimization: We could use MGET if we knew the fields, but HGETALL is robust
-            v = await self.redis.hgetall(k)
-            if v.get("state", "") == MissionState.QUEUED.value:
-                queued_missions.append(v)
-        
-        if not queued_missions:
+        # 1. Lease the queue head (priority desc, then submission time asc) so other
+        #    replicas move on to the next mission while this one picks an agent
+        owner = f"{self.replica_id}:{uuid.uuid4().hex[:12]}"
+        claimed = await self._claim(owner, 1)
+        if not claimed:
             return None
+        v = claimed[0]
 
-        # 2. Sort by Priority (Desc) then CreatedAt (Asc)
-        # Priority is string in Redis, convert to int
-        # CreatedAt is ISO string
-        queued_missions.sort(key=lambda x: (-int(x.get("priority", 0)), x.get("created_at", "")))
+        # 2. Keep the lease alive while assigning; give the mission back if it could not be placed
+        renewer = asyncio.create_task(self._keep_lease(v["id"], owner))
+        result = None
+        try:
+            result = await self._assign_claimed(v, owner)
+        finally:
+            renewer.cancel()
+            if result is None:
+                await self._release(v["id"], owner)
+        return result
+
+    async def assign_batch(self, limit: Optional[int] = None) -> List[MissionStatus]:
+        """
+        Assign up to ``limit`` missions from the queue head in one pass.
+
+        Claims the missions and reads one agent snapshot (loads and breaker
+        flags in a single MGET), then matches greedily in queue order: each
+        mission goes to the best-scoring capable agent, and every pick raises
+        that agent's load by BATCH_LOAD_STEP so the batch spreads out. All
+        assignments are written in one pipeline. Missions no agent can take
+        are released back to the queue. There is no LLM routing here; use
+        assign_next for that.
+        """
+        await self._ensure_redis()
+        limit = max(1, min(limit or ASSIGN_BATCH_SIZE, ASSIGN_BATCH_MAX))
+        owner = f"{self.replica_id}:{uuid.uuid4().hex[:12]}"
+        # A batch is one claim, one MGET and one pipeline, well inside the lease; no renewal needed
+        claimed = await self._claim(owner, limit)
+        if not claimed:
+            return []
 
-        # 3. Try to assign top priority mission
-        for v in queued_missions:
-            k = await self._key(v["id"])
-            
-            req_caps: list[str] = []
+        try:
+            agents = await agent_registry.list_agents()
+            if not agents:
+                agents = [AgentMetadata.model_validate(a) for a in await db.agent.find_many()]
+        except Exception as e:
+            logger.warning("assign_batch_no_agents", error=str(e))
+            agents = []
+        loads, cb_open = await self._agent_flags(agents)
+        pairs = match_missions(claimed, agents, loads, cb_open)
+
+        results = await TRANSITION.many(self.redis, [
+            await self._transition_call(v["id"], MissionState.ASSIGNED, {"agent_id": agent_id}, lease_owner=owner)
+            for v, agent_id in pairs
+        ])
+        assigned: List[Tuple[str, Dict[str, str]]] = []
+        for (v, agent_id), res in zip(pairs, results):
+            if isinstance(res, list) and res[0] == "ok":
+                flat = res[3:]
+                assigned.append((agent_id, dict(zip(flat[::2], flat[1::2]))))
+            else:
+                logger.warning("mission_assign_lost", mission_id=v["id"], result=str(res))
+
+        matched = {v["id"] for v, _ in pairs}
+        unmatched = [v["id"] for v in claimed if v["id"] not in matched]
+        if unmatched:
+            await RELEASE.many(self.redis, [
+                ([QUEUE_KEY, LEASE_KEY, await self._key(mid)], [mid, owner]) for mid in unmatched
+            ])
+
+        await asyncio.gather(*(
+            self._record_assignment(mv["id"], agent_id, f"Assigned to {agent_id} (batch)")
+            for agent_id, mv in assigned
+        ))
+        return [self._assigned_status(mv) for _, mv in assigned]
+
+    async def _agent_flags(self, agents: List[AgentMetadata]) -> Tuple[Dict[str, float], Dict[str, bool]]:
+        """Current load and circuit-breaker state of every agent in one MGET."""
+        if not agents:
+            return {}, {}
+        raw = await self.redis.mget(
+            [f"agent:load:{a.id}" for a in agents] + [f"cb:open:{a.id}" for a in agents]
+        )
+        loads, cb_open = {}, {}
+        for i, a in enumerate(agents):
             try:
-                payload_raw = v.get("payload")
-                if payload_raw:
-                    import json
-                    payload = json.loads(payload_raw)
-                    req_caps = payload.get("requirements", {}).get("capabilities", [])
+                loads[a.id] = float(raw[i]) if raw[i] else 0.0
+            except ValueError:
+                loads[a.id] = 0.0
+            cb_open[a.id] = bool(raw[len(agents) + i])
+        return loads, cb_open
+
+    async def _assign_claimed(self, v: Dict[str, str], owner: str) -> MissionStatus | None:
+        req_caps = required_capabilities(v)
+
+        agents = await agent_registry.list_agents()
+        if not agents:
+            try:
+                raw_agents = await db.agent.find_many()
+                agents = [AgentMetadata.model_validate(a) for a in raw_agents]
             except Exception:
-                req_caps = []
+                return None
 
-            agents = await agent_registry.list_agents()
-            if not agents:
+        # --- AI-Enhanced Selection ---
+        # If enabled, use LLM to score/select agents for complex missions
+        selected_agent_id = None
+        if llm_service.enabled and v.get("title"):
+            try:
+                candidates_desc = "\n".join([f"- {a.id}: {a.role} (Caps: {a.capabilities}, Status: {a.status})" for a in agents])
+                prompt = (
+                    f"Mission: {v.get('title')}\n"
+                    f"Requirements: {req_caps}\n"
+                    f"Available Agents:\n{candidates_desc}\n\n"
+                    "You are the Intelligent Mission Router. "
+                    "Select the best agent for this mission based on capabilities and current status.\n"
+                    "Rules:\n"
+                    "1. Prefer agents with matching capabilities.\n"
+                    "2. Avoid 'busy' or 'offline' agents unless necessary.\n"
+                    "3. Return ONLY the agent ID (e.g. 'backend-specialist'). Do not add any explanation or punctuation."
+                )
+                ai_response = await llm_service.generate(prompt)
+                if ai_response:
+                    ai_id = ai_response.strip()
+                    # Validate ID exists
+                    if any(a.id == ai_id for a in agents):
+                        selected_agent_id = ai_id
+                        logger.info(f"AI selected agent {ai_id} for mission {v.get('id')}")
+            except Exception as e:
+                logger.warning(f"AI agent selection failed: {e}")
+
+        if selected_agent_id:
+            agent_id = selected_agent_id
+            scored = [] # Bypass manual scoring
+        else:
+            # --- Fallback Manual Scoring ---
+            async def score_agent(a):
+                # Skip circuit-broken agents
+                try:
+                    cb_open = bool(await self.redis.get(f"cb:open:{a.id}"))
+                except Exception:
+                    cb_open = False
+                if cb_open:
+                    return -1.0
+                return agent_score(a, req_caps, await agent_registry.get_load(a.id))
+
+            scored = []
+            for a in agents:
+                s = await score_agent(a)
+                if s >= 0:
+                    scored.append((s, a))
+            
+            if scored:
+                scored.sort(key=lambda t: t[0], reverse=True)
+                agent_id = scored[0][1].id
+            else:
+                # Fallback if no scored agents
+                # Instead of picking random fallback, maybe skip this mission and try next?
+                # But for now, let's stick to existing logic or try next agent.
+                # If no agent can take it, we shouldn't block the queue forever, but also shouldn't assign to bad agent.
+                # Let's try to assign to *any* agent if possible, or skip.
                 try:
-                    raw_agents = await db.agent.find_many()
-                    agents = [AgentMetadata.model_validate(a) for a in raw_agents]
+                    fallback_agents = await agent_registry.list_agents()
                 except Exception:
+                    fallback_agents = []
+                if not fallback_agents:
+                    # No agents at all, can't assign anything.
                     return None
+                agent_id = fallback_agents[0].id
 
-            # --- AI-Enhanced Selection ---
-            # If enabled, use LLM to score/select agents for complex missions
-            selected_agent_id = None
-            if llm_service.enabled and v.get("title"):
-                try:
-                    candidates_desc = "\n".join([f"- {a.id}: {a.role} (Caps: {a.capabilities}, Status: {a.status})" for a in agents])
-                    prompt = (
-                        f"Mission: {v.get('title')}\n"
-                        f"Requirements: {req_caps}\n"
-                        f"Available Agents:\n{candidates_desc}\n\n"
-                        "You are the Intelligent Mission Router. "
-                        "Select the best agent for this mission based on capabilities and current status.\n"
-                        "Rules:\n"
-                        "1. Prefer agents with matching capabilities.\n"
-                        "2. Avoid 'busy' or 'offline' agents unless necessary.\n"
-                        "3. Return ONLY the agent ID (e.g. 'backend-specialist'). Do not add any explanation or punctuation."
-                    )
-                    ai_response = await llm_service.generate(prompt)
-                    if ai_response:
-                        ai_id = ai_response.strip()
-                        # Validate ID exists
-                        if any(a.id == ai_id for a in agents):
-                            selected_agent_id = ai_id
-                            logger.info(f"AI selected agent {ai_id} for mission {v.get('id')}")
-                except Exception as e:
-                    logger.warning(f"AI agent selection failed: {e}")
+        # Proceed with Assignment; only succeeds while we still hold the lease
+        mid = v["id"]
+        try:
+            applied = await self._apply(mid, MissionState.ASSIGNED, {"agent_id": agent_id}, lease_owner=owner)
+        except InvalidTransition as e:
+            logger.warning("mission_assign_lost", mission_id=mid, state=e.from_state, lease_lost=isinstance(e, LeaseLost))
+            return None
+        if applied is None:
+            return None
+        _, mv, _ = applied
+        await self._record_assignment(mid, agent_id, f"Assigned to {agent_id} (AI: {bool(selected_agent_id)})")
+        return self._assigned_status(mv)
 
-            if selected_agent_id:
-                agent_id = selected_agent_id
-                scored = [] # Bypass manual scoring
-            else:
-                # --- Fallback Manual Scoring ---
-                async def score_agent(a):
-                    # Skip circuit-broken agents
-                    try:
-                        cb = await self.redis.get(f"cb:open:{a.id}")
-                        if cb:
-                            return -1.0
-                    except Exception:
-                        pass
-                    # Capability match
-                    caps = set(a.capabilities or [])
-                    if any(rc for rc in req_caps) and not set(req_caps).issubset(caps):
-                        return -1.0
-                    # Health based on status and heartbeat recency
-                    status_weight = {
-                        "active": 1.0,
-                        "busy": 0.7,
-                        "error": 0.3,
-                        "offline": 0.0,
-                    }.get(a.status.value if hasattr(a.status, "value") else str(a.status), 0.5)
-                    try:
-                        last = getattr(a, "lastHeartbeat", None) or getattr(a, "createdAt", None)
-                        last_dt = last or datetime.now(timezone.utc)
-                        if last_dt.tzinfo is None:
-                            last_dt = last_dt.replace(tzinfo=timezone.utc)
-                        now_dt = datetime.now(timezone.utc)
-                        age = max((now_dt - last_dt).total_seconds(), 0.0)
-                        recency = max(0.0, 1.0 - min(age / 60.0, 1.0))
-                    except Exception:
-                        recency = 0.5
-                    load = await agent_registry.get_load(a.id)
-                    load_factor = max(0.0, 1.0 - min(load, 1.0))
-                    return status_weight * 0.5 + recency * 0.3 + load_factor * 0.2
-
-                scored = []
-                for a in agents:
-                    s = await score_agent(a)
-                    if s >= 0:
-                        scored.append((s, a))
-                
-                if scored:
-                    scored.sort(key=lambda t: t[0], reverse=True)
-                    agent_id = scored[0][1].id
-                else:
-                    # Fallback if no scored agents
-                    # Instead of picking random fallback, maybe skip this mission and try next?
-                    # But for now, let's stick to existing logic or try next agent.
-                    # If no agent can take it, we shouldn't block the queue forever, but also shouldn't assign to bad agent.
-                    # Let's try to assign to *any* agent if possible, or skip.
-                    try:
-                        fallback_agents = await agent_registry.list_agents()
-                    except Exception:
-                        fallback_agents = []
-                    if not fallback_agents:
-                        # No agents at all, can't assign anything.
-                        return None
-                    agent_id = fallback_agents[0].id
-
-            # Proceed with Assignment
-            mid = v["id"]
-            await self.redis.hset(k, mapping={
-                "state": MissionState.ASSIGNED.value,
-                "agent_id": agent_id,
-                "updated_at": datetime.now(timezone.utc).isoformat(),
+    async def _record_assignment(self, mid: str, agent_id: str, reason: str) -> None:
+        # Persistence & Audit
+        try:
+            await db.mission.update(
+                where={"id": mid},
+                data={"status": MissionState.ASSIGNED.value, "agentId": agent_id}
+            )
+            await audit_sink.record({
+                "missionId": mid,
+                "transition": "assign",
+                "previousState": MissionState.QUEUED.value,
+                "newState": MissionState.ASSIGNED.value,
+                "actor": "orchestrator",
+                "reason": reason,
             })
-            
-            # ... (Rest of logic same as before, consolidating) ...
-            
-            # Persistence & Audit
-            try:
-                await db.mission.update(
-                    where={"id": mid},
-                    data={"status": MissionState.ASSIGNED.value, "agentId": agent_id}
-                )
-                await db.auditlog.create({
-                    "missionId": mid,
-                    "transition": "assign",
-                    "previousState": MissionState.QUEUED.value,
-                    "newState": MissionState.ASSIGNED.value,
-                    "actor": "orchestrator",
-                    "reason": f"Assigned to {agent_id} (AI: {bool(selected_agent_id)})",
-                })
-            except Exception as e:
-                logger.error(f"Persistence failed for assignment {mid}: {e}")
+        except Exception as e:
+            logger.error(f"Persistence failed for assignment {mid}: {e}")
 
-            # Event Stream
-            try:
-                await event_bus.publish_stream(
-                    "mission.events",
-                    MessageEnvelope(
-                        sender_id="orchestrator",
-                        recipient_id=agent_id,
-                        message_type="mission.assigned",
-                        payload={"mission_id": mid, "agent_id": agent_id}
-                    )
+        # Event Stream
+        try:
+            await event_bus.publish_stream(
+                "mission.events",
+                MessageEnvelope(
+                    sender_id="orchestrator",
+                    recipient_id=agent_id,
+                    message_type="mission.assigned",
+                    payload={"mission_id": mid, "agent_id": agent_id}
                 )
-            except Exception as e:
-                logger.error(f"Event publish failed for assignment {mid}: {e}")
-
-            MISSION_TRANSITIONS.labels(MissionState.QUEUED.value, MissionState.ASSIGNED.value).inc()
-            mv = await self.redis.hgetall(k)
-            return MissionStatus.model_validate({
-                "id": mv["id"],
-                "title": mv["title"],
-                "state": MissionState.ASSIGNED,
-                "priority": int(mv["priority"]),
-                "agent_id": mv["agent_id"] or None,
-                "created_at": datetime.fromisoformat(mv["created_at"]),
-                "updated_at": datetime.fromisoformat(mv["updated_at"]),
-            })
-        return None
+            )
+        except Exception as e:
+            logger.error(f"Event publish failed for assignment {mid}: {e}")
+
+        MISSION_TRANSITIONS.labels(MissionState.QUEUED.value, MissionState.ASSIGNED.value).inc()
+
+    @staticmethod
+    def _assigned_status(mv: Dict[str, str]) -> MissionStatus:
+        return MissionStatus.model_validate({
+            "id": mv["id"],
+            "title": mv["title"],
+            "state": MissionState.ASSIGNED,
+            "priority": int(mv["priority"]),
+            "agent_id": mv["agent_id"] or None,
+            "created_at": datetime.fromisoformat(mv["created_at"]),
+            "updated_at": datetime.fromisoformat(mv["updated_at"]),
+        })
+
+    async def _apply(self, mission_id: str, to_state: MissionState, fields: Optional[Dict[str, str]] = None,
+                     lease_owner: str = "") -> Optional[Tuple[str, Dict[str, str], List[str]]]:
+        """
+        Run the TRANSITION script: one round trip that checks ALLOWED_TRANSITIONS
+        (and, if ``lease_owner`` is given, that the caller still holds the
+        mission's lease), moves the mission and its index entries, and bumps
+        failure counters. Returns (previous state, mission hash, dependents the
+        change made ready), None if the mission does not exist, or raises
+        InvalidTransition / LeaseLost.
+        """
+        res = await TRANSITION(self.redis, *await self._transition_call(mission_id, to_state, fields, lease_owner))
+        if res is None:
+            return None
+        status, from_state = res[0], res[1]
+        if status == "lost":
+            raise LeaseLost(mission_id, from_state, to_state)
+        if status != "ok":
+            raise InvalidTransition(mission_id, from_state, to_state)
+        unlocked, flat = res[2], res[3:]
+        return from_state, dict(zip(flat[::2], flat[1::2])), unlocked
+
+    async def _transition_call(self, mission_id: str, to_state: MissionState, fields: Optional[Dict[str, str]] = None,
+                               lease_owner: str = "") -> Tuple[List[str], List[str]]:
+        """KEYS and ARGV for one TRANSITION script call."""
+        return (
+            [await self._key(mission_id), QUEUE_KEY, CREATED_INDEX_KEY, LEASE_KEY],
+            [mission_id, to_state.value, datetime.now(timezone.utc).isoformat(),
+             allowed_sources(to_state), STATE_INDEX_PREFIX, lease_owner,
+             *[x for kv in (fields or {}).items() for x in kv]],
+        )
 
     async def _transition(self, mission_id: str, to_state: MissionState) -> MissionStatus | None:
         await self._ensure_redis()
-        k = await self._key(mission_id)
-        v = await self.redis.hgetall(k)
-        if not v:
+        applied = await self._apply(mission_id, to_state)
+        if applied is None:
             return None
-        from_state = v.get("state", "")
-        await self.redis.hset(k, mapping={
-            "state": to_state.value,
-            "updated_at": datetime.now(timezone.utc).isoformat(),
-        })
-
-        try:
-            if to_state == MissionState.FAILED:
-                agent_id = v.get("agent_id", "") if v.get("agent_id") else ""
-                if agent_id:
-                    fkey = f"agent:{agent_id}:failures"
-                    try:
-                        cnt = await self.redis.incr(fkey)
-                        await self.redis.expire(fkey, 300)
-                        if cnt >= 3:
-                            await self.redis.set(f"cb:open:{agent_id}", "1", ex=60)
-                    except Exception:
-                        pass
-        except Exception:
-            pass
+        from_state, mv, unlocked = applied
 
         # Persistence & Audit
         try:
@@ -348,7 +595,7 @@ class Orchestrator:
                 where={"id": mission_id},
                 data={"status": to_state.value}
             )
-            await db.auditlog.create({
+            await audit_sink.record({
                 "missionId": mission_id,
                 "transition": "update",
                 "previousState": from_state,
@@ -373,7 +620,8 @@ class Orchestrator:
             logger.error(f"Event publish failed for transition {mission_id}: {e}")
 
         MISSION_TRANSITIONS.labels(from_state or "none", to_state.value).inc()
-        mv = await self.redis.hgetall(k)
+        if unlocked:
+            await asyncio.gather(*(self._record_unlocked(child, mission_id) for child in unlocked))
         return MissionStatus.model_validate({
             "id": mv["id"],
             "title": mv["title"],
@@ -384,6 +632,119 @@ class Orchestrator:
             "updated_at": datetime.fromisoformat(mv["updated_at"]),
         })
 
+    async def _record_unlocked(self, mission_id: str, completed_id: str) -> None:
+        """Persist, audit and announce a deferred mission queued by its last dependency completing."""
+        try:
+            await db.mission.update(
+                where={"id": mission_id},
+                data={"status": MissionState.QUEUED.value}
+            )
+            await audit_sink.record({
+                "missionId": mission_id,
+                "transition": "update",
+                "previousState": MissionState.DEFERRED.value,
+                "newState": MissionState.QUEUED.value,
+                "actor": "orchestrator",
+                "reason": f"Dependencies met ({completed_id} completed)",
+            })
+        except Exception as e:
+            logger.error(f"Persistence failed for transition {mission_id}: {e}")
+        try:
+            await event_bus.publish_stream(
+                "mission.events",
+                MessageEnvelope(
+                    sender_id="orchestrator",
+                    message_type="mission.queued",
+                    payload={"mission_id": mission_id, "previous_state": MissionState.DEFERRED.value,
+                             "new_state": MissionState.QUEUED.value}
+                )
+            )
+        except Exception as e:
+            logger.error(f"Event publish failed for transition {mission_id}: {e}")
+        MISSION_TRANSITIONS.labels(MissionState.DEFERRED.value, MissionState.QUEUED.value).inc()
+
+    async def _claim(self, owner: str, count: int) -> List[Dict[str, str]]:
+        """Lease up to ``count`` missions from the queue head to ``owner``; requeues expired leases first."""
+        now_ms = int(time.time() * 1000)
+        res = await CLAIM(
+            self.redis,
+            [QUEUE_KEY, LEASE_KEY],
+            [now_ms, int(self.lease_seconds * 1000), owner, count, "mission:"],
+        )
+        MISSION_QUEUE_DEPTH.set(res[0])
+        return [dict(zip(entry[1::2], entry[2::2])) for entry in res[1:]]
+
+    async def _keep_lease(self, mission_id: str, owner: str) -> None:
+        """Extend the lease every third of its length until cancelled or taken over."""
+        key = await self._key(mission_id)
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            expiry = int((time.time() + self.lease_seconds) * 1000)
+            try:
+                if not await RENEW(self.redis, [LEASE_KEY, key], [mission_id, owner, expiry]):
+                    logger.warning("mission_lease_lost", mission_id=mission_id, owner=owner)
+                    return
+            except Exception as e:
+                logger.warning("mission_lease_renew_failed", mission_id=mission_id, error=str(e))
+
+    async def _release(self, mission_id: str, owner: str) -> None:
+        # Best effort: if this fails the lease simply expires and the next claim requeues the mission
+        try:
+            await RELEASE(self.redis, [QUEUE_KEY, LEASE_KEY, await self._key(mission_id)], [mission_id, owner])
+        except Exception as e:
+            logger.warning("mission_lease_release_failed", mission_id=mission_id, error=str(e))
+
+    async def requeue(self, mission_id: str) -> bool:
+        """Put a mission back in the queue (retry path); keeps its original queue position."""
+        await self._ensure_redis()
+        try:
+            return await self._apply(mission_id, MissionState.QUEUED, {"agent_id": ""}) is not None
+        except InvalidTransition as e:
+            logger.info("mission_requeue_skipped", mission_id=mission_id, state=e.from_state)
+            return False
+
+    async def rebuild_indexes(self, force: bool = False) -> int:
+        """
+        Migration for hashes written before the queue and listing indexes
+        existed: SCAN mission hashes and index each one. Runs once per
+        INDEX_VERSION unless ``force``; returns the number of queued missions.
+        """
+        await self._ensure_redis()
+        if not force and int(await self.redis.get(INDEX_VERSION_KEY) or 0) >= INDEX_VERSION:
+            return 0
+        added = 0
+        batch: List[str] = []
+
+        async def flush() -> int:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key in batch:
+                    pipe.hmget(key, "id", "state", "priority", "created_at")
+                rows = await pipe.execute()
+            queued = 0
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for mid, state, priority, created_at in rows:
+                    if not (mid and created_at and state):
+                        continue
+                    pipe.zadd(CREATED_INDEX_KEY, {mid: created_ms(created_at)})
+                    pipe.zadd(state_index(state), {mid: created_ms(created_at)})
+                    if state == MissionState.QUEUED.value:
+                        pipe.zadd(QUEUE_KEY, {mid: queue_score(priority or 0, created_at)})
+                        queued += 1
+                await pipe.execute()
+            return queued
+
+        async for key in self.redis.scan_iter(match="mission:*", count=1000, _type="hash"):
+            batch.append(key)
+            if len(batch) >= 500:
+                added += await flush()
+                batch = []
+        if batch:
+            added += await flush()
+        await self.redis.set(INDEX_VERSION_KEY, INDEX_VERSION)
+        MISSION_QUEUE_DEPTH.set(await self.redis.zcard(QUEUE_KEY))
+        logger.info("mission_indexes_rebuilt", queued=added, version=INDEX_VERSION)
+        return added
+
     async def start(self, mission_id: str) -> MissionStatus | None:
         return await self._transition(mission_id, MissionState.EXECUTING)
 
@@ -412,16 +773,42 @@ class Orchestrator:
             "updated_at": datetime.fromisoformat(v["updated_at"]),
         })
 
-    async def list(self, limit: int = 10) -> List[MissionStatus]:
+    async def list(self, limit: int = 10, states: Optional[List[MissionState]] = None) -> List[MissionStatus]:
+        items, _ = await self.page(limit, states=states)
+        return items
+
+    async def page(self, limit: int = 10, cursor: Optional[str] = None,
+                   states: Optional[List[MissionState]] = None) -> Tuple[List[MissionStatus], Optional[str]]:
+        """
+        Newest-first page of missions, optionally restricted to ``states``.
+
+        Reads one index range per requested state (or the creation index) and
+        the page's hashes in one pipeline, so the cost does not grow with the
+        number of stored missions. Returns the items and the cursor for the
+        next page, or None on the last one. Raises ValueError on a bad cursor.
+        """
         await self._ensure_redis()
-        keys = await self.redis.keys("mission:*")
+        after = _parse_cursor(cursor) if cursor else None
+        wanted = {MissionState(s).value for s in states} if states else None
+        keys = [state_index(s) for s in sorted(wanted)] if wanted else [CREATED_INDEX_KEY]
+        entries: List[Tuple[int, str]] = []
+        for key in keys:
+            entries.extend(await self._index_slice(key, limit + 1, after))
+        # Same order as ZREVRANGEBYSCORE: score desc, then member desc
+        entries.sort(reverse=True)
+        next_cursor = f"{entries[limit - 1][0]}:{entries[limit - 1][1]}" if len(entries) > limit else None
+        entries = entries[:limit]
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for _, mid in entries:
+                pipe.hgetall(await self._key(mid))
+            rows = await pipe.execute()
         items = []
-        for k in keys:
+        for v in rows:
             try:
-                v = await self.redis.hgetall(k)
-                if not v:
+                if not v or (wanted and v["state"] not in wanted):
                     continue
-                items.append({
+                items.append(MissionStatus.model_validate({
                     "id": v["id"],
                     "title": v["title"],
                     "state": MissionState(v["state"]),
@@ -429,12 +816,26 @@ class Orchestrator:
                     "agent_id": v.get("agent_id") or None,
                     "created_at": datetime.fromisoformat(v["created_at"]),
                     "updated_at": datetime.fromisoformat(v["updated_at"]),
-                })
+                }))
             except Exception:
                 continue
-        items.sort(key=lambda x: x["created_at"], reverse=True)
-        items = items[:limit]
-        return [MissionStatus.model_validate(i) for i in items]
+        return items, next_cursor
+
+    async def _index_slice(self, key: str, count: int, after: Optional[Tuple[int, str]]) -> List[Tuple[int, str]]:
+        """Up to ``count`` (score, id) entries of ``key`` that sort after the cursor position."""
+        if after is None:
+            rows = await self.redis.zrevrangebyscore(key, "+inf", "-inf", start=0, num=count, withscores=True)
+            return [(int(score), mid) for mid, score in rows]
+        out: List[Tuple[int, str]] = []
+        offset = 0
+        # Only missions created in the cursor's millisecond need skipping, so this rarely loops
+        while len(out) < count:
+            rows = await self.redis.zrevrangebyscore(key, after[0], "-inf", start=offset, num=count, withscores=True)
+            if not rows:
+                break
+            offset += len(rows)
+            out.extend((int(score), mid) for mid, score in rows if (int(score), mid) < after)
+        return out[:count]
 
     async def audit(self, mission_id: str) -> List[Dict[str, Any]]:
         tries = 0
@@ -467,26 +868,21 @@ class Orchestrator:
 
     async def approve(self, mission_id: str) -> MissionStatus | None:
         await self._ensure_redis()
-        k = await self._key(mission_id)
-        v = await self.redis.hgetall(k)
-        if not v:
+        mv = await APPROVE(self.redis, [await self._key(mission_id)], [datetime.now(timezone.utc).isoformat()])
+        if not mv:
             return None
+        mv = dict(zip(mv[::2], mv[1::2]))
         try:
-            await self.redis.hset(k, mapping={"approved": "1", "updated_at": datetime.now(timezone.utc).isoformat()})
-        except Exception:
-            pass
-        try:
-            await db.auditlog.create({
+            await audit_sink.record({
                 "missionId": mission_id,
                 "transition": "approve",
-                "previousState": v.get("state", ""),
-                "newState": v.get("state", ""),
+                "previousState": mv.get("state", ""),
+                "newState": mv.get("state", ""),
                 "actor": "manager",
                 "reason": "Approval",
             })
         except Exception:
             pass
-        mv = await self.redis.hgetall(k)
         return MissionStatus.model_validate({
             "id": mv["id"],
             "title": mv["title"],
@@ -0,0 +1,208 @@
+import asyncio
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import structlog
+from prometheus_client import Counter, Gauge, Histogram
+from app.core.config import get_settings
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+POOL_RUNS = Counter(
+    "python_pool_runs_total",
+    "Python executions served by the fork-server pool",
+    ("status",),  # success, error, timeout
+)
+POOL_WORKERS = Gauge(
+    "python_pool_workers",
+    "Fork-server workers alive",
+)
+POOL_RECYCLES = Counter(
+    "python_pool_recycles_total",
+    "Fork-server workers replaced",
+    ("reason",),  # max_runs, broken
+)
+POOL_WAIT = Histogram(
+    "python_pool_wait_seconds",
+    "Time spent waiting for an idle fork-server worker",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0),
+)
+
+# Generous enough for a full JSON response line; output is bounded upstream
+_STREAM_LIMIT = 32 * 1024 * 1024
+
+
+class WorkerPoolError(Exception):
+    pass
+
+
+@dataclass
+class PoolRun:
+    stdout: str
+    stderr: str
+    exit_code: int
+    timed_out: bool
+    rusage: Dict[str, float] = field(default_factory=dict)
+    bytes_dropped: int = 0
+
+
+class _Worker:
+    def __init__(self, proc: asyncio.subprocess.Process):
+        self.proc = proc
+        self.runs = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None
+
+    async def _readline(self) -> dict:
+        line = await self.proc.stdout.readline()
+        if not line:
+            raise WorkerPoolError("fork server exited")
+        return json.loads(line)
+
+    async def run(self, code: str, env: Optional[Dict[str, str]], timeout: float, max_output: int = 0) -> PoolRun:
+        req = json.dumps({"code": code, "env": env, "timeout": timeout, "max_output": max_output}) + "\n"
+        self.proc.stdin.write(req.encode("utf-8"))
+        await self.proc.stdin.drain()
+        self.runs += 1
+        await self._readline()  # {"pid": ...}
+        resp = await self._readline()
+        return PoolRun(
+            stdout=resp.get("stdout", ""),
+            stderr=resp.get("stderr", ""),
+            exit_code=int(resp.get("exit_code", -1)),
+            timed_out=bool(resp.get("timed_out")),
+            rusage=resp.get("rusage") or {},
+            bytes_dropped=int(resp.get("bytes_dropped", 0)),
+        )
+
+    async def close(self) -> None:
+        if not self.alive:
+            return
+        try:
+            self.proc.stdin.close()
+            await asyncio.wait_for(self.proc.wait(), timeout=2.0)
+        except Exception:
+            try:
+                self.proc.kill()
+            except ProcessLookupError:
+                pass
+
+
+class PythonWorkerPool:
+    """
+    Pool of pre-warmed fork servers for ``Language.PYTHON`` executions.
+
+    Each worker is a long-lived ``app.engine.forkserver`` process with common
+    modules already imported; every execution runs in a fresh child forked from
+    it. Workers are recycled after ``max_runs`` executions or when they break.
+    """
+    def __init__(self, enabled: bool = False, size: int = 4, max_runs: int = 1000, preload: str = ""):
+        self.enabled = enabled and hasattr(os, "fork")
+        self.size = max(1, size)
+        self.max_runs = max(1, max_runs)
+        self.preload = preload
+        self._idle: Optional[asyncio.Queue] = None
+        self._workers: List[_Worker] = []
+        self._respawning = 0
+        self._retiring: set = set()
+        self._start_lock: Optional[asyncio.Lock] = None
+
+    async def _spawn(self) -> _Worker:
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "app.engine.forkserver", "--preload", self.preload,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=_STREAM_LIMIT,
+        )
+        worker = _Worker(proc)
+        hello = await asyncio.wait_for(worker._readline(), timeout=30.0)
+        if not hello.get("ready"):
+            raise WorkerPoolError("fork server failed to start")
+        self._workers.append(worker)
+        POOL_WORKERS.set(len(self._workers))
+        return worker
+
+    async def start(self) -> None:
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._idle is not None:
+                return
+            idle: asyncio.Queue = asyncio.Queue()
+            workers = await asyncio.gather(*[self._spawn() for _ in range(self.size)])
+            for w in workers:
+                idle.put_nowait(w)
+            self._idle = idle
+            logger.info("python_pool_started", size=self.size, preload=self.preload)
+
+    async def _retire(self, worker: _Worker, reason: str) -> None:
+        POOL_RECYCLES.labels(reason).inc()
+        if worker in self._workers:
+            self._workers.remove(worker)
+        self._respawning += 1
+        try:
+            await worker.close()
+            replacement = await self._spawn()
+        except Exception as e:
+            logger.error("python_pool_respawn_failed", error=str(e))
+            POOL_WORKERS.set(len(self._workers))
+            return
+        finally:
+            self._respawning -= 1
+        if self._idle is not None:
+            self._idle.put_nowait(replacement)
+
+    def _schedule_retire(self, worker: _Worker, reason: str) -> None:
+        task = asyncio.ensure_future(self._retire(worker, reason))
+        self._retiring.add(task)
+        task.add_done_callback(self._retiring.discard)
+
+    async def run(self, code: str, env: Optional[Dict[str, str]] = None, timeout: float = 30.0,
+                  max_output: int = 0) -> PoolRun:
+        if self._idle is None:
+            await self.start()
+        if not self._workers and not self._respawning:
+            raise WorkerPoolError("no fork-server workers available")
+        t0 = time.perf_counter()
+        worker: _Worker = await self._idle.get()
+        POOL_WAIT.observe(time.perf_counter() - t0)
+        try:
+            # The fork server enforces ``timeout`` itself; the extra grace only
+            # guards against a wedged server process.
+            result = await asyncio.wait_for(worker.run(code, env, timeout, max_output), timeout=timeout + 5.0)
+        except BaseException as e:
+            self._schedule_retire(worker, "broken")
+            if isinstance(e, asyncio.TimeoutError):
+                raise WorkerPoolError("fork server did not respond") from e
+            if isinstance(e, (WorkerPoolError, OSError, ValueError)):
+                raise WorkerPoolError(str(e)) from e
+            raise
+        if worker.runs >= self.max_runs or not worker.alive:
+            self._schedule_retire(worker, "max_runs" if worker.alive else "broken")
+        else:
+            self._idle.put_nowait(worker)
+        status = "timeout" if result.timed_out else ("success" if result.exit_code == 0 else "error")
+        POOL_RUNS.labels(status).inc()
+        return result
+
+    async def close(self) -> None:
+        if self._retiring:
+            await asyncio.gather(*list(self._retiring), return_exceptions=True)
+        workers, self._workers = self._workers, []
+        self._idle = None
+        await asyncio.gather(*[w.close() for w in workers], return_exceptions=True)
+        POOL_WORKERS.set(0)
+
+
+python_pool = PythonWorkerPool(
+    enabled=settings.PYTHON_POOL_ENABLED,
+    size=settings.PYTHON_POOL_SIZE,
+    max_runs=settings.PYTHON_POOL_MAX_RUNS,
+    preload=settings.PYTHON_POOL_PRELOAD,
+)
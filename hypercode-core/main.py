@@ -16,7 +16,6 @@ import asyncio
 import json
 import time
 import random
-from datetime import datetime, timezone
 import subprocess
 
 # OpenTelemetry Imports
@@ -97,12 +96,26 @@ async def lifespan(app: FastAPI):
     print("Database connected.")
 
     bg_tasks = []
+    from app.services.audit_sink import audit_sink
+    audit_sink.start()
+    from app.services.python_pool import python_pool
+    if python_pool.enabled:
+        try:
+            await python_pool.start()
+        except Exception as e:
+            print(f"Warning: Python worker pool failed to start: {e}")
     try:
         from app.services.agent_registry import agent_registry
         from app.services.event_bus import event_bus
         from app.schemas.message import MessageEnvelope
         from app.services.orchestrator import orchestrator
+        from app.services.mission_assigner import mission_assigner
         MAX_RETRIES = 5
+        try:
+            # One-off migration: index mission hashes written before the queue and list indexes existed
+            await orchestrator.rebuild_indexes()
+        except Exception as e:
+            print(f"Warning: mission index rebuild failed: {e}")
         async def _heartbeat_sweep():
             while True:
                 try:
@@ -188,17 +201,12 @@ async def lifespan(app: FastAPI):
                         try:
                             if isinstance(mid, bytes):
                                 mid = mid.decode()
-                            key = f"mission:{mid}"
                             try:
-                                await event_bus.redis.hset(key, mapping={
-                                    "state": "queued",
-                                    "agent_id": "",
-                                    "updated_at": datetime.now(timezone.utc).isoformat(),
-                                })
+                                await orchestrator.requeue(mid)
                             except Exception:
                                 pass
                             try:
-                                await db.auditlog.create({
+                                await audit_sink.record({
                                     "missionId": mid,
                                     "transition": "retry",
                                     "previousState": "failed",
@@ -246,7 +254,7 @@ async def lifespan(app: FastAPI):
                                 payload = json.loads(payload_raw) if isinstance(payload_raw, str) else payload_raw
                                 mid = payload.get("mission_id")
                                 try:
-                                    await db.auditlog.create({
+                                    await audit_sink.record({
                                         "missionId": mid or "unknown",
                                         "transition": "dlq",
                                         "previousState": payload.get("previous_state", "unknown"),
@@ -274,19 +282,6 @@ async def lifespan(app: FastAPI):
                 except Exception:
                     await asyncio.sleep(1.0)
 
-        async def _mission_assigner():
-            """Autonomous Mission Router: Continuously assigns queued missions."""
-            while True:
-                try:
-                    assigned = await orchestrator.assign_next()
-                    if assigned:
-                        print(f"Auto-assigned mission {assigned.id} to {assigned.agent_id}")
-                    else:
-                        # No missions or no agents, sleep longer
-                        await asyncio.sleep(5.0)
-                except Exception:
-                    await asyncio.sleep(5.0)
-
         try:
             env_lower = (settings.ENVIRONMENT or "").lower()
         except Exception:
@@ -295,7 +290,7 @@ async def lifespan(app: FastAPI):
             bg_tasks.append(asyncio.create_task(_mission_event_consumer()))
             bg_tasks.append(asyncio.create_task(_retry_scheduler()))
             bg_tasks.append(asyncio.create_task(_dlq_consumer()))
-            bg_tasks.append(asyncio.create_task(_mission_assigner()))
+            bg_tasks.extend(mission_assigner.start())
     except Exception:
         pass
     yield
@@ -304,6 +299,15 @@ async def lifespan(app: FastAPI):
             t.cancel()
         except Exception:
             pass
+    try:
+        await python_pool.close()
+    except Exception:
+        pass
+    try:
+        # Drain queued audit rows while the database is still connected
+        await audit_sink.stop()
+    except Exception:
+        pass
     try:
         await db.disconnect()
     except Exception:
@@ -392,5 +396,6 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "HEAD", "PATCH"],
     allow_headers=["Content-Type", "Authorization", "X-Request-ID", "X-API-Key"],
+    expose_headers=["X-Next-Cursor"],
     max_age=3600,
 )
@@ -11,6 +11,7 @@ from app.services.agent_registry import agent_registry
 from app.services.event_bus import event_bus
 from app.services.orchestrator import orchestrator
 from app.services.key_manager import key_manager
+from app.services.execution_jobs import execution_job_store
 from app.middleware.rate_limit import rate_limiter, FIXED_WINDOW_SCRIPT
 from app.core.config import get_settings
 import fakeredis.aioredis
@@ -63,6 +64,7 @@ async def mock_redis(monkeypatch):
     event_bus.redis = fake_redis
     orchestrator.redis = fake_redis
     key_manager.redis = fake_redis
+    execution_job_store.redis = fake_redis
     
     # Patch rate limiter
     rate_limiter._redis = fake_redis
@@ -80,6 +82,12 @@ async def mock_redis(monkeypatch):
     else:
         await fake_redis.close()
 
+@pytest_asyncio.fixture(autouse=True)
+async def reset_engine_breakers():
+    from app.engine.adapter import reset_breakers
+    reset_breakers()
+    yield
+
 @pytest_asyncio.fixture(autouse=True)
 async def reset_inmemory_db():
     from app.core.db import db
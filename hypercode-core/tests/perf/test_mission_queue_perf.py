@@ -0,0 +1,53 @@
+import time
+from datetime import datetime, timedelta, timezone
+from statistics import median
+from unittest.mock import AsyncMock
+import pytest
+from app.schemas.agent import AgentMetadata, AgentStatus
+from app.services import orchestrator as orchestrator_module
+from app.services.orchestrator import orchestrator, QUEUE_KEY, queue_score
+
+pytestmark = pytest.mark.experimental
+
+MISSIONS = 100_000
+
+
+@pytest.mark.asyncio
+async def test_assign_next_latency_at_100k_missions(monkeypatch):
+    registry = AsyncMock()
+    registry.list_agents.return_value = [AgentMetadata(
+        id="agent-1", name="Agent 1", role="coder", capabilities=[],
+        status=AgentStatus.ACTIVE, version="1.0.0", endpoint="http://agent:8000",
+    )]
+    registry.get_load.return_value = 0.0
+    monkeypatch.setattr(orchestrator_module, "agent_registry", registry)
+    monkeypatch.setattr(orchestrator_module, "db", AsyncMock())
+    monkeypatch.setattr(orchestrator_module, "event_bus", AsyncMock())
+    monkeypatch.setattr(orchestrator_module.llm_service, "enabled", False)
+
+    r = orchestrator.redis
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for start in range(0, MISSIONS, 5000):
+        async with r.pipeline(transaction=False) as pipe:
+            for i in range(start, start + 5000):
+                created = (base + timedelta(milliseconds=i)).isoformat()
+                # Mostly finished history, with every 10th mission still queued
+                state = "queued" if i % 10 == 0 else "completed"
+                pipe.hset(f"mission:m{i}", mapping={
+                    "id": f"m{i}", "title": "bench", "state": state, "priority": str(i % 100),
+                    "agent_id": "", "payload": "{}", "created_at": created, "updated_at": created,
+                })
+                if state == "queued":
+                    pipe.zadd(QUEUE_KEY, {f"m{i}": queue_score(i % 100, created)})
+            await pipe.execute()
+
+    samples = []
+    for _ in range(50):
+        t0 = time.perf_counter()
+        assigned = await orchestrator.assign_next()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+        assert assigned is not None
+    # Independent of total mission count: one ZRANGE plus one pipelined fetch of the queue head.
+    # The old KEYS + per-key HGETALL scan took seconds per call at this size.
+    assert median(samples) < 50.0
+    assert assigned.priority == 90
@@ -0,0 +1,24 @@
+import os
+import time
+from statistics import median
+import pytest
+from app.services.python_pool import PythonWorkerPool
+
+pytestmark = [pytest.mark.experimental, pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")]
+
+
+@pytest.mark.asyncio
+async def test_pooled_python_startup_latency():
+    pool = PythonWorkerPool(enabled=True, size=2, max_runs=1000, preload="json,re,math")
+    await pool.start()
+    try:
+        samples = []
+        for _ in range(20):
+            t0 = time.perf_counter()
+            r = await pool.run("print('ok')")
+            samples.append((time.perf_counter() - t0) * 1000.0)
+            assert r.exit_code == 0
+    finally:
+        await pool.close()
+    # Typically single-digit milliseconds; leave headroom for slow CI hosts
+    assert median(samples) < 100.0
@@ -0,0 +1,58 @@
+import asyncio
+import time
+from statistics import median
+from unittest.mock import AsyncMock
+import pytest
+from app.schemas.mission import MissionRequest
+from app.services import orchestrator as orchestrator_module
+from app.services.orchestrator import orchestrator
+
+pytestmark = pytest.mark.experimental
+
+SAMPLES = 50
+BULK = 500
+CONCURRENCY = 50
+# Simulated round trip to Postgres and to the event stream
+RTT = 0.02
+
+
+@pytest.mark.asyncio
+async def test_submission_latency_and_bulk_throughput(monkeypatch):
+    async def round_trip(*args, **kwargs):
+        await asyncio.sleep(RTT)
+
+    db, bus = AsyncMock(), AsyncMock()
+    db.mission.create.side_effect = round_trip
+    db.auditlog.create.side_effect = round_trip
+    bus.publish_stream.side_effect = round_trip
+    monkeypatch.setattr(orchestrator_module, "db", db)
+    monkeypatch.setattr(orchestrator_module, "event_bus", bus)
+    await orchestrator.redis.ping()
+
+    async def p50(prefix):
+        latencies = []
+        for i in range(SAMPLES):
+            t0 = time.perf_counter()
+            await orchestrator.submit(MissionRequest(title=f"{prefix}{i}", priority=i % 100))
+            latencies.append(time.perf_counter() - t0)
+        return median(latencies)
+
+    # Redis and bookkeeping alone, then with the simulated round trips
+    bus.publish_stream.side_effect = db.mission.create.side_effect = db.auditlog.create.side_effect = None
+    baseline = await p50("base")
+    bus.publish_stream.side_effect = db.mission.create.side_effect = db.auditlog.create.side_effect = round_trip
+    latency = await p50("m")
+
+    t0 = time.perf_counter()
+    for start in range(0, BULK, CONCURRENCY):
+        await asyncio.gather(*(
+            orchestrator.submit(MissionRequest(title=f"b{i}", priority=i % 100))
+            for i in range(start, start + CONCURRENCY)
+        ))
+    rate = BULK / (time.perf_counter() - t0)
+
+    print(f"submit p50={latency * 1000:.1f}ms (redis only {baseline * 1000:.1f}ms) bulk={rate:.0f}/s")
+    assert db.mission.create.await_count == 2 * SAMPLES + BULK
+    # Mission row, audit row and event one after another would add 3 RTTs; the
+    # stream write now overlaps the two Postgres writes
+    assert latency - baseline < 2.5 * RTT, f"p50 {latency * 1000:.1f}ms"
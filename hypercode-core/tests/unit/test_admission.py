@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.services.admission import AdmissionController, AdmissionRejected, parse_limits
+from app.services.execution_service import ExecutionService
+from app.schemas.execution import ExecutionRequest, Language
+
+
+def test_parse_limits():
+    assert parse_limits("python=8, bash=4,bogus,shell=x") == {"python": 8, "bash": 4}
+
+
+@pytest.mark.asyncio
+async def test_global_and_language_limits():
+    ctl = AdmissionController(max_concurrency=3, language_limits={"python": 1}, queue_size=10, queue_timeout=5)
+    await ctl.acquire("python")
+    # python is at its own cap, bash still has capacity
+    waiter = asyncio.create_task(ctl.acquire("python"))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    await ctl.acquire("bash")
+    await ctl.acquire("bash")
+    assert ctl._running == 3
+    ctl.release("python")
+    await asyncio.wait_for(waiter, 1)
+    # Global cap is still full once the python slot is handed over
+    assert ctl._running == 3
+
+
+@pytest.mark.asyncio
+async def test_queue_is_priority_ordered():
+    ctl = AdmissionController(max_concurrency=1, queue_size=10, queue_timeout=5)
+    await ctl.acquire("bash")
+    order = []
+
+    async def wait(name, prio):
+        await ctl.acquire("bash", prio)
+        order.append(name)
+
+    tasks = [asyncio.create_task(wait("low", 10)), asyncio.create_task(wait("high", 90)), asyncio.create_task(wait("mid", 50))]
+    await asyncio.sleep(0)
+    for _ in range(3):
+        ctl.release("bash")
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    assert order == ["high", "mid", "low"]
+
+
+@pytest.mark.asyncio
+async def test_sheds_load_when_queue_full():
+    ctl = AdmissionController(max_concurrency=1, queue_size=1, queue_timeout=5)
+    await ctl.acquire("python")
+    queued = asyncio.create_task(ctl.acquire("python"))
+    await asyncio.sleep(0)
+    with pytest.raises(AdmissionRejected) as exc:
+        await ctl.acquire("python")
+    assert exc.value.reason == "queue_full"
+    assert exc.value.retry_after >= 1
+    queued.cancel()
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_rejects_and_frees_queue():
+    ctl = AdmissionController(max_concurrency=1, queue_size=1, queue_timeout=0.05)
+    await ctl.acquire("python")
+    with pytest.raises(AdmissionRejected) as exc:
+        await ctl.acquire("python")
+    assert exc.value.reason == "queue_timeout"
+    assert ctl.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_slot():
+    ctl = AdmissionController(max_concurrency=1, queue_size=5, queue_timeout=5)
+    await ctl.acquire("python")
+    waiter = asyncio.create_task(ctl.acquire("python"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    ctl.release("python")
+    assert ctl._running == 0
+    async with ctl.slot("python"):
+        assert ctl._running == 1
+    assert ctl._running == 0
+
+
+@pytest.mark.asyncio
+async def test_execution_service_propagates_rejection(monkeypatch):
+    ctl = AdmissionController(max_concurrency=1, queue_size=0, queue_timeout=1)
+    await ctl.acquire("python")
+    monkeypatch.setattr("app.services.execution_service.admission", ctl)
+    with patch("asyncio.create_subprocess_exec") as spawn:
+        with pytest.raises(AdmissionRejected):
+            await ExecutionService.execute_code(ExecutionRequest(code="print(1)", language=Language.PYTHON))
+        spawn.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_execute_endpoint_returns_429_with_retry_after(monkeypatch):
+    from app.routers import execution as execution_router
+    from fastapi import HTTPException
+
+    async def reject(request):
+        raise AdmissionRejected("queue_full", 3)
+
+    monkeypatch.setattr(execution_router.ExecutionService, "execute_code", staticmethod(reject))
+    with pytest.raises(HTTPException) as exc:
+        await execution_router.execute_task(ExecutionRequest(code="print(1)"))
+    assert exc.value.status_code == 429
+    assert exc.value.headers["Retry-After"] == "3"
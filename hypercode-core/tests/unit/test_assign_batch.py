@@ -0,0 +1,116 @@
+import json
+from collections import Counter
+import pytest
+from unittest.mock import AsyncMock
+from app.routers.orchestrator import assign_batch as assign_batch_route
+from app.schemas.agent import AgentMetadata, AgentStatus
+from app.schemas.mission import MissionRequest, MissionState
+from app.services import orchestrator as orchestrator_module
+from app.services.mission_scripts import CLAIM, TRANSITION
+from app.services.orchestrator import orchestrator, match_missions, LEASE_KEY, QUEUE_KEY
+
+
+def _agent(agent_id, caps=(), status=AgentStatus.ACTIVE):
+    return AgentMetadata(
+        id=agent_id, name=agent_id, role="coder", capabilities=list(caps),
+        status=status, version="1.0.0", endpoint="http://agent:8000",
+    )
+
+
+@pytest.fixture
+def agents(monkeypatch):
+    registry = AsyncMock()
+    registry.list_agents.return_value = [_agent("a1", ["python"]), _agent("a2", ["python"]), _agent("a3", ["python", "rust"])]
+    monkeypatch.setattr(orchestrator_module, "agent_registry", registry)
+    monkeypatch.setattr(orchestrator_module, "db", AsyncMock())
+    return registry
+
+
+async def _submit(n, caps=None, priority=50):
+    payload = {"requirements": {"capabilities": caps}} if caps else {}
+    return [(await orchestrator.submit(MissionRequest(title="m", priority=priority, payload=payload))).id for _ in range(n)]
+
+
+def test_match_spreads_load_and_respects_capabilities():
+    agents = [_agent("a1", ["python"]), _agent("a2", ["python", "rust"])]
+    missions = [{"id": str(i), "payload": json.dumps({"requirements": {"capabilities": ["python"]}})} for i in range(4)]
+    missions.append({"id": "r", "payload": json.dumps({"requirements": {"capabilities": ["rust"]}})})
+    missions.append({"id": "g", "payload": json.dumps({"requirements": {"capabilities": ["go"]}})})
+
+    pairs = match_missions(missions, agents, {"a1": 0.0, "a2": 0.0}, {})
+    by_agent = Counter(agent_id for _, agent_id in pairs)
+    assert by_agent == {"a1": 2, "a2": 3}
+    assert dict((v["id"], a) for v, a in pairs)["r"] == "a2"
+    assert "g" not in {v["id"] for v, _ in pairs}
+
+    assert match_missions(missions[:2], agents, {}, {"a1": True}) == [(missions[0], "a2"), (missions[1], "a2")]
+
+
+@pytest.mark.asyncio
+async def test_batch_assigns_in_one_pass_and_balances(agents, monkeypatch):
+    ids = await _submit(9)
+
+    async def no_single_transitions(*args, **kwargs):
+        raise AssertionError("batch must not transition missions one by one")
+
+    monkeypatch.setattr(orchestrator, "_apply", no_single_transitions)
+    r = orchestrator.redis
+    for script in (CLAIM, TRANSITION):
+        await r.script_load(script.source)
+    round_trips = []
+    execute_command, pipeline = r.execute_command, r.pipeline
+
+    async def counting_execute(*args, **kwargs):
+        round_trips.append(args[0])
+        return await execute_command(*args, **kwargs)
+
+    def counting_pipeline(*args, **kwargs):
+        round_trips.append("PIPELINE")
+        return pipeline(*args, **kwargs)
+
+    monkeypatch.setattr(r, "execute_command", counting_execute)
+    monkeypatch.setattr(r, "pipeline", counting_pipeline)
+    assigned = await orchestrator.assign_batch(20)
+    # Claim, agent flags, one pipeline of transitions; only the per-mission event stream writes remain
+    assert [c for c in round_trips if c != "XADD"] == ["EVALSHA", "MGET", "PIPELINE"]
+
+    assert sorted(m.id for m in assigned) == sorted(ids)
+    assert all(m.state == MissionState.ASSIGNED for m in assigned)
+    assert Counter(m.agent_id for m in assigned) == {"a1": 3, "a2": 3, "a3": 3}
+    assert agents.list_agents.await_count == 1
+    assert orchestrator_module.db.mission.update.await_count == 9
+    assert await orchestrator.redis.zcard(QUEUE_KEY) == 0
+    assert await orchestrator.redis.zcard(LEASE_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_uses_live_load_and_breakers(agents):
+    await orchestrator.redis.set("agent:load:a1", "0.9")
+    await orchestrator.redis.set("cb:open:a2", "1")
+    await _submit(2)
+
+    assigned = await orchestrator.assign_batch(2)
+    assert {m.agent_id for m in assigned} == {"a3"}
+
+
+@pytest.mark.asyncio
+async def test_batch_releases_missions_nobody_can_take(agents):
+    [rust] = await _submit(1, caps=["rust"], priority=90)
+    [go] = await _submit(1, caps=["go"], priority=80)
+    score = await orchestrator.redis.zscore(QUEUE_KEY, go)
+
+    assigned = await assign_batch_route(limit=10)
+    assert [(m.id, m.agent_id) for m in assigned] == [(rust, "a3")]
+    assert await orchestrator.redis.zscore(QUEUE_KEY, go) == score
+    assert await orchestrator.redis.zcard(LEASE_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_without_agents_returns_everything(agents):
+    agents.list_agents.return_value = []
+    orchestrator_module.db.agent.find_many.return_value = []
+    ids = await _submit(3)
+
+    assert await orchestrator.assign_batch(10) == []
+    assert set(await orchestrator.redis.zrange(QUEUE_KEY, 0, -1)) == set(ids)
+    assert await orchestrator.assign_batch(10) == []
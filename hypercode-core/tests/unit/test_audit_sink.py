@@ -0,0 +1,111 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from prometheus_client import REGISTRY
+from app.schemas.mission import MissionRequest
+from app.services import audit_sink as audit_sink_module
+from app.services import orchestrator as orchestrator_module
+from app.services.audit_sink import AuditSink
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = AsyncMock()
+    monkeypatch.setattr(audit_sink_module, "db", db)
+    return db
+
+
+def _row(i, mission_id="m"):
+    return {"missionId": mission_id, "transition": "update", "previousState": "queued",
+            "newState": "assigned", "actor": "orchestrator", "reason": str(i)}
+
+
+def _written(db):
+    return [row["reason"] for call in db.auditlog.create_many.await_args_list for row in call.kwargs["data"]]
+
+
+def _dropped(reason):
+    return REGISTRY.get_sample_value("audit_sink_dropped_total", {"reason": reason}) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_rows_are_batched_by_size_and_drained_on_stop(db):
+    sink = AuditSink(batch_size=3, flush_interval=60.0, max_queue=100)
+    sink.start()
+    for i in range(2):
+        await sink.record(_row(i))
+    await asyncio.sleep(0.01)
+    db.auditlog.create_many.assert_not_awaited()
+    await sink.record(_row(2))
+    await asyncio.sleep(0.01)
+    assert _written(db) == ["0", "1", "2"]
+
+    for i in range(3, 7):
+        await sink.record(_row(i))
+    await sink.stop()
+    assert _written(db) == [str(i) for i in range(7)]
+    assert [len(c.kwargs["data"]) for c in db.auditlog.create_many.await_args_list] == [3, 3, 1]
+    db.auditlog.create.assert_not_awaited()
+    # Stopped: back to inline writes
+    await sink.record(_row(7))
+    db.auditlog.create.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_flushed_after_the_interval(db):
+    sink = AuditSink(batch_size=100, flush_interval=0.05, max_queue=100)
+    sink.start()
+    try:
+        await sink.record(_row(0))
+        db.auditlog.create_many.assert_not_awaited()
+        await asyncio.sleep(0.15)
+        assert _written(db) == ["0"]
+    finally:
+        await sink.stop()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_and_counts(db):
+    sink = AuditSink(batch_size=100, flush_interval=60.0, max_queue=2)
+    before = _dropped("full")
+    sink.start()
+    for i in range(3):
+        await sink.record(_row(i))
+    assert _dropped("full") == before + 1
+    await sink.stop()
+    assert _written(db) == ["0", "1"]
+
+
+@pytest.mark.asyncio
+async def test_bad_row_does_not_sink_its_batch(db):
+    db.auditlog.create_many.side_effect = Exception("Foreign key constraint failed")
+
+    async def create(row):
+        if row["missionId"] == "unknown":
+            raise Exception("Foreign key constraint failed")
+
+    db.auditlog.create.side_effect = create
+    sink = AuditSink(batch_size=10, flush_interval=60.0, max_queue=100)
+    before = _dropped("error")
+    sink.start()
+    for i, mid in enumerate(["m", "unknown", "m"]):
+        await sink.record(_row(i, mid))
+    await sink.stop()
+
+    assert [c.args[0]["reason"] for c in db.auditlog.create.await_args_list] == ["0", "1", "2"]
+    assert _dropped("error") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_mission_transitions_do_not_wait_for_audit_inserts(db, monkeypatch):
+    monkeypatch.setattr(orchestrator_module, "db", AsyncMock())
+    monkeypatch.setattr(orchestrator_module, "audit_sink", sink := AuditSink(batch_size=100, flush_interval=60.0))
+    sink.start()
+    m = await orchestrator_module.orchestrator.submit(MissionRequest(title="t"))
+    await orchestrator_module.orchestrator.start(m.id)
+    db.auditlog.create.assert_not_awaited()
+    db.auditlog.create_many.assert_not_awaited()
+
+    await sink.stop()
+    [call] = db.auditlog.create_many.await_args_list
+    assert [(r["missionId"], r["newState"]) for r in call.kwargs["data"]] == [(m.id, "queued"), (m.id, "executing")]
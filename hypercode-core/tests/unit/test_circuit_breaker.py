@@ -10,19 +10,19 @@ async def test_circuit_breaker_opens_after_failures(monkeypatch):
     except Exception:
         pytest.skip("fakeredis not available")
 
-    mid = "mission-fail-1"
-    key = await orchestrator._key(mid)
-    await orchestrator.redis.hset(key, mapping={
-        "id": mid,
-        "title": "Breaker Mission",
-        "state": MissionState.ASSIGNED.value,
-        "priority": 50,
-        "agent_id": "agent-123",
-        "created_at": "2024-01-01T00:00:00",
-        "updated_at": "2024-01-01T00:00:00",
-    })
-
-    for _ in range(3):
+    # FAILED is terminal for a mission, so the breaker trips on three different missions of one agent
+    for i in range(3):
+        mid = f"mission-fail-{i}"
+        key = await orchestrator._key(mid)
+        await orchestrator.redis.hset(key, mapping={
+            "id": mid,
+            "title": "Breaker Mission",
+            "state": MissionState.ASSIGNED.value,
+            "priority": 50,
+            "agent_id": "agent-123",
+            "created_at": "2024-01-01T00:00:00",
+            "updated_at": "2024-01-01T00:00:00",
+        })
         await orchestrator.fail(mid)
 
     val = await orchestrator.redis.get("cb:open:agent-123")
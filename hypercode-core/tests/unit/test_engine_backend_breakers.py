@@ -0,0 +1,84 @@
+import pytest
+import app.engine.adapter as adapter
+from app.engine.adapter import run_hypercode, backend_health
+from app.engine.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+class DeadAsyncClient:
+    calls = 0
+
+    def __init__(self, timeout: int = 30):
+        pass
+    async def __aenter__(self):
+        return self
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+    async def post(self, url: str, json: dict):
+        DeadAsyncClient.calls += 1
+        raise ConnectionError("connection refused")
+
+
+@pytest.fixture
+def dead_http(monkeypatch):
+    DeadAsyncClient.calls = 0
+    monkeypatch.setattr(adapter.httpx, "AsyncClient", DeadAsyncClient)
+    return DeadAsyncClient
+
+
+def test_breaker_opens_after_threshold_and_probes_once(monkeypatch):
+    cb = CircuitBreaker("t", failure_threshold=2, reset_timeout=10.0)
+    assert cb.allow()
+    cb.record_failure()
+    assert cb.state == CLOSED
+    cb.record_failure()
+    assert cb.state == OPEN
+    assert not cb.allow()
+
+    import app.engine.circuit_breaker as mod
+    later = mod.time.monotonic() + 11.0
+    monkeypatch.setattr(mod.time, "monotonic", lambda: later)
+    assert cb.allow()
+    assert cb.state == HALF_OPEN
+    assert not cb.allow()  # only a single probe in flight
+    cb.record_success(0.01)
+    assert cb.state == CLOSED
+
+
+def test_failed_probe_reopens():
+    cb = CircuitBreaker("t", failure_threshold=1, reset_timeout=0.0)
+    cb.record_failure()
+    assert cb.state == OPEN
+    assert cb.allow()
+    cb.record_failure()
+    assert cb.state == OPEN
+
+
+@pytest.mark.asyncio
+async def test_dead_http_backend_is_skipped_once_open(dead_http):
+    for _ in range(5):
+        stdout, stderr, code, _ = await run_hypercode("print('hi')", timeout=5)
+        assert code == 0
+        assert stdout == "hi"
+    # Threshold is 3: subsequent calls no longer pay for the dead backend
+    assert dead_http.calls == 3
+    assert backend_health()["http"]["state"] == OPEN
+
+
+@pytest.mark.asyncio
+async def test_unsupported_source_does_not_trip_interpreter(monkeypatch):
+    token = adapter.set_internal_call(True)
+    try:
+        for _ in range(5):
+            stdout, _, code, _ = await run_hypercode('print "CLI"', timeout=5)
+            assert code == 0
+            assert stdout == "CLI"
+    finally:
+        adapter.reset_internal_call(token)
+    assert backend_health()["interpreter"]["state"] == CLOSED
+
+
+def test_same_tier_backends_ordered_by_latency():
+    adapter._BREAKERS["module"].record_success(0.5)
+    adapter._BREAKERS["http"].record_success(0.01)
+    names = [b[0] for b in adapter._ordered_backends()]
+    assert names == ["http", "module", "interpreter", "cli"]
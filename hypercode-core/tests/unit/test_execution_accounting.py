@@ -0,0 +1,76 @@
+import os
+import pytest
+from prometheus_client import REGISTRY
+from app.engine import accounting
+from app.schemas.execution import ExecutionRequest, Language
+from app.services.execution_service import ExecutionService
+from app.services.python_pool import PythonWorkerPool
+
+BURN = "import time\nt = time.process_time()\nwhile time.process_time() - t < 0.2: pass\nprint('done')"
+
+
+def _cpu_count(language, backend):
+    return REGISTRY.get_sample_value("execution_cpu_seconds_count", {"language": language, "backend": backend}) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_subprocess_reports_cpu_output_and_backend():
+    before = _cpu_count("python", "subprocess")
+    result = await ExecutionService.execute_code(ExecutionRequest(code=BURN, language=Language.PYTHON))
+    assert result.status == "success"
+    assert result.backend == "subprocess"
+    assert result.cpu_user + result.cpu_system >= 0.15
+    assert result.output_bytes == len("done\n")
+    assert _cpu_count("python", "subprocess") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_interpreter_run_is_measured_in_process():
+    code = 'x = 0\nwhile x < 2000:\n    x = x + 1\nprint("total", x)\n'
+    result = await ExecutionService.execute_code(ExecutionRequest(code=code, language=Language.HYPERCODE))
+    assert result.stdout == "total 2000"
+    assert result.backend == "interpreter"
+    assert result.cpu_user >= 0.0 and result.cpu_system >= 0.0
+    assert result.peak_rss_bytes is not None and result.peak_rss_bytes > 0
+    assert result.output_bytes == len("total 2000")
+
+
+def test_measure_in_process_restores_tracemalloc_state():
+    import tracemalloc
+    was_tracing = tracemalloc.is_tracing()
+    stats = {}
+    with accounting.measure_in_process(stats):
+        blob = [str(i) for i in range(10000)]
+    assert stats["peak_rss_bytes"] > 0
+    assert tracemalloc.is_tracing() == was_tracing
+    del blob
+
+
+def test_children_peak_rss_only_reported_when_high_water_mark_moves(monkeypatch):
+    class Usage:
+        def __init__(self, utime, stime, maxrss):
+            self.ru_utime, self.ru_stime, self.ru_maxrss = utime, stime, maxrss
+
+    monkeypatch.setattr(accounting.resource, "getrusage", lambda who: Usage(1.5, 0.5, 100))
+    stats = {}
+    accounting.record_children_delta(Usage(1.0, 0.25, 100), stats)
+    assert stats == {"cpu_user": 0.5, "cpu_system": 0.25}
+
+    accounting.record_children_delta(Usage(1.0, 0.25, 50), stats)
+    assert stats["peak_rss_bytes"] == 100 * accounting._MAXRSS_UNIT
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork server requires os.fork")
+@pytest.mark.asyncio
+async def test_pool_reports_exact_rusage(monkeypatch):
+    pool = PythonWorkerPool(enabled=True, size=1, max_runs=10, preload="")
+    await pool.start()
+    try:
+        monkeypatch.setattr("app.services.execution_service.python_pool", pool)
+        code = BURN + "\nblob = b'x' * (64 * 1024 * 1024)"
+        result = await ExecutionService.execute_code(ExecutionRequest(code=code, language=Language.PYTHON))
+    finally:
+        await pool.close()
+    assert result.backend == "pool"
+    assert result.cpu_user + result.cpu_system >= 0.15
+    assert result.peak_rss_bytes >= 64 * 1024 * 1024
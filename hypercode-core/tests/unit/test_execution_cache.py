@@ -0,0 +1,120 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.services.execution_service import ExecutionService
+from app.services.execution_cache import ExecutionCache, execution_cache
+from app.schemas.execution import ExecutionRequest, ExecutionResult, Language
+from app.parser.hc_parser import parse
+from app.engine.interpreter import is_pure
+
+
+@pytest.fixture
+def enabled_cache(monkeypatch):
+    monkeypatch.setattr(execution_cache, "enabled", True)
+    execution_cache.clear()
+    yield execution_cache
+    execution_cache.clear()
+
+
+def _result(stdout: str = "ok", status: str = "success") -> ExecutionResult:
+    return ExecutionResult(stdout=stdout, stderr="", exit_code=0 if status == "success" else -1, status=status, duration=0.01, language=Language.HYPERCODE)
+
+
+def test_is_pure_accepts_interpreter_constructs():
+    assert is_pure(parse("x = 1\nprint(x + 2)"))
+    assert is_pure(parse("def f(a):\n    return a * 2\nprint(f(3))"))
+
+
+def test_is_pure_rejects_side_effects():
+    assert not is_pure(parse("import os"))
+    assert not is_pure(parse("os.system('ls')"))
+    assert not is_pure(parse("open('/etc/passwd')"))
+    assert not is_pure(parse("print(x[0])"))
+
+
+def test_key_depends_on_env_and_target():
+    a = ExecutionRequest(code="print(1)", language=Language.HYPERCODE)
+    b = ExecutionRequest(code="print(1)", language=Language.HYPERCODE, env_vars={"A": "1"})
+    c = ExecutionRequest(code="print(1)", language=Language.HYPERCODE, target="python")
+    keys = {ExecutionCache.key_for(r) for r in (a, b, c)}
+    assert len(keys) == 3
+    assert ExecutionCache.key_for(a) == ExecutionCache.key_for(ExecutionRequest(code="print(1)", language=Language.HYPERCODE, timeout=10))
+
+
+@pytest.mark.asyncio
+async def test_pure_program_is_served_from_cache(enabled_cache):
+    with patch("app.services.execution_service.run_hypercode", new_callable=AsyncMock) as mock_run:
+        mock_run.return_value = ("3", "", 0, None)
+        req = ExecutionRequest(code="print(1 + 2)", language=Language.HYPERCODE)
+        first = await ExecutionService.execute_code(req)
+        second = await ExecutionService.execute_code(req)
+
+    assert mock_run.call_count == 1
+    assert first.cached is False
+    assert second.cached is True
+    assert second.stdout == "3"
+
+
+@pytest.mark.asyncio
+async def test_impure_and_python_requests_bypass_cache(enabled_cache):
+    with patch("app.services.execution_service.run_hypercode", new_callable=AsyncMock) as mock_run:
+        mock_run.return_value = ("", "", 0, None)
+        req = ExecutionRequest(code="import os", language=Language.HYPERCODE)
+        await ExecutionService.execute_code(req)
+        await ExecutionService.execute_code(req)
+    assert mock_run.call_count == 2
+    assert not ExecutionService._is_cacheable(ExecutionRequest(code="print(1)", language=Language.PYTHON))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_are_coalesced():
+    cache = ExecutionCache(enabled=True)
+    calls = 0
+
+    async def execute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return _result("coalesced")
+
+    results = await asyncio.gather(*[cache.get_or_execute("k", execute) for _ in range(10)])
+    assert calls == 1
+    assert all(r.stdout == "coalesced" for r in results)
+    assert sum(1 for r in results if r.cached) == 9
+
+
+@pytest.mark.asyncio
+async def test_timeouts_are_not_cached():
+    cache = ExecutionCache(enabled=True)
+    execute = AsyncMock(return_value=_result(status="timeout"))
+    await cache.get_or_execute("k", execute)
+    await cache.get_or_execute("k", execute)
+    assert execute.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failure_propagates_to_coalesced_waiters():
+    cache = ExecutionCache(enabled=True)
+
+    async def execute():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(*[cache.get_or_execute("k", execute) for _ in range(3)], return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert cache.get("k") is None
+
+
+def test_ttl_and_size_bounds(monkeypatch):
+    cache = ExecutionCache(enabled=True, ttl_seconds=10.0, max_entries=2)
+    cache.put("a", _result("a"))
+    cache.put("b", _result("b"))
+    cache.get("a")
+    cache.put("c", _result("c"))
+    assert cache.get("b") is None  # least recently used
+    assert cache.get("a") is not None
+
+    import app.services.execution_cache as mod
+    now = mod.time.monotonic()
+    monkeypatch.setattr(mod.time, "monotonic", lambda: now + 11.0)
+    assert cache.get("a") is None
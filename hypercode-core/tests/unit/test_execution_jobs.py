@@ -0,0 +1,107 @@
+import json
+import pytest
+import fakeredis
+import fakeredis.aioredis
+from fastapi import HTTPException
+from app.core.celery_app import celery_app
+from app.routers import execution as execution_router
+from app.schemas.execution import ExecutionRequest, JobStatus, Language
+from app.services import execution_jobs
+from app.services.admission import AdmissionRejected
+from app.services.execution_jobs import ExecutionJobStore, execution_job_store
+from app.services.execution_service import ExecutionService
+
+
+@pytest.fixture
+def eager_jobs(monkeypatch):
+    """Run Celery tasks in-process against a Redis stand-in shared by API and worker."""
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(execution_job_store, "redis", fakeredis.aioredis.FakeRedis(server=server, decode_responses=True))
+    monkeypatch.setattr(ExecutionJobStore, "_connect", lambda self: fakeredis.aioredis.FakeRedis(server=server, decode_responses=True))
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    yield server
+
+
+@pytest.mark.asyncio
+async def test_job_runs_on_worker_and_keeps_output_chunks(eager_jobs):
+    code = "import sys\nprint('line one')\nprint('oops', file=sys.stderr)\nprint('line two')"
+    accepted = await execution_router.create_job(ExecutionRequest(code=code, language=Language.PYTHON))
+
+    job = await execution_router.get_job(accepted.id)
+    assert job.status == JobStatus.SUCCESS
+    assert job.result.stdout == "line one\nline two"
+
+    out = await execution_router.get_job_output(accepted.id)
+    stdout = "".join(c.text for c in out.chunks if c.stream == "stdout")
+    stderr = "".join(c.text for c in out.chunks if c.stream == "stderr")
+    assert stdout == "line one\nline two\n"
+    assert stderr == "oops\n"
+    assert out.done is False
+
+    tail = await execution_router.get_job_output(accepted.id, offset=out.next_offset)
+    assert tail.chunks == [] and tail.done is True
+
+
+@pytest.mark.asyncio
+async def test_job_stream_emits_output_then_result(eager_jobs):
+    accepted = await execution_router.create_job(ExecutionRequest(code="echo streamed", language=Language.BASH))
+
+    resp = await execution_router.stream_job(accepted.id)
+    events = [event async for event in resp.body_iterator]
+    assert [e["event"] for e in events][-1] == "result"
+    assert json.loads(events[0]["data"]) == {"stream": "stdout", "text": "streamed\n"}
+    assert json.loads(events[-1]["data"])["status"] == "success"
+
+
+@pytest.mark.asyncio
+async def test_unknown_job_is_404(eager_jobs):
+    with pytest.raises(HTTPException) as exc:
+        await execution_router.get_job("nope")
+    assert exc.value.status_code == 404
+    with pytest.raises(HTTPException) as exc:
+        await execution_router.stream_job("nope")
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_broker_failure_returns_503_and_marks_job(eager_jobs, monkeypatch):
+    def broken(*args, **kwargs):
+        raise ConnectionError("broker down")
+
+    monkeypatch.setattr(execution_jobs.run_execution_job, "apply_async", broken)
+    with pytest.raises(HTTPException) as exc:
+        await execution_router.create_job(ExecutionRequest(code="print(1)"))
+    assert exc.value.status_code == 503
+
+    keys = [k async for k in execution_job_store.redis.scan_iter("execjob:*")]
+    job = await execution_job_store.get(keys[0].split(":")[1])
+    assert job.status == JobStatus.ERROR
+    assert "broker down" in job.error
+
+
+@pytest.mark.asyncio
+async def test_worker_requeues_job_when_admission_rejects(eager_jobs, monkeypatch):
+    job = await execution_job_store.create(ExecutionRequest(code="print(1)"))
+
+    async def reject(request, on_output=None):
+        raise AdmissionRejected("queue_full", 2)
+
+    monkeypatch.setattr(ExecutionService, "execute_code", staticmethod(reject))
+    with pytest.raises(AdmissionRejected):
+        await execution_jobs._run_job(job.id)
+    assert (await execution_job_store.get(job.id)).status == JobStatus.QUEUED
+
+
+@pytest.mark.asyncio
+async def test_execute_code_streams_subprocess_output():
+    chunks = []
+
+    async def on_output(stream, text):
+        chunks.append((stream, text))
+
+    result = await ExecutionService.execute_code(
+        ExecutionRequest(code="printf 'a\\nb\\n'; printf 'err' >&2", language=Language.BASH), on_output=on_output
+    )
+    assert result.stdout == "a\nb"
+    assert "".join(t for s, t in chunks if s == "stdout") == "a\nb\n"
+    assert "".join(t for s, t in chunks if s == "stderr") == "err"
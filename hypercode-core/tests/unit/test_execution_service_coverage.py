@@ -4,11 +4,19 @@ from unittest.mock import patch, MagicMock, AsyncMock
 from app.services.execution_service import ExecutionService
 from app.schemas.execution import ExecutionRequest, ExecutionResult, Language
 
+def _stream(data: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
 @pytest.fixture
 def mock_subprocess():
     with patch("asyncio.create_subprocess_exec") as mock:
         process_mock = AsyncMock()
-        process_mock.communicate.return_value = (b"output", b"errors")
+        process_mock.stdout = _stream(b"output")
+        process_mock.stderr = _stream(b"errors")
+        process_mock.kill = MagicMock()
         process_mock.returncode = 0
         mock.return_value = process_mock
         yield mock
@@ -37,7 +45,7 @@ async def test_execute_python_success(mock_subprocess):
 async def test_execute_python_timeout(mock_subprocess):
     # Setup timeout simulation
     process_mock = mock_subprocess.return_value
-    process_mock.communicate.side_effect = asyncio.TimeoutError()
+    process_mock.wait.side_effect = asyncio.TimeoutError()
     
     request = ExecutionRequest(
         language=Language.PYTHON,
@@ -9,11 +9,14 @@ from app.schemas.execution import ExecutionRequest, Language
 class FakeProcess:
     def __init__(self):
         self.returncode = 0
-        self._stdout = b"CLI"
-        self._stderr = b""
-    async def communicate(self):
+        self.stdout = asyncio.StreamReader()
+        self.stdout.feed_data(b"CLI")
+        self.stdout.feed_eof()
+        self.stderr = asyncio.StreamReader()
+        self.stderr.feed_eof()
+    async def wait(self):
         await asyncio.sleep(0)
-        return self._stdout, self._stderr
+        return self.returncode
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,128 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock
+from app.schemas.agent import AgentMetadata, AgentStatus
+from app.schemas.mission import MissionRequest
+from app.services import orchestrator as orchestrator_module
+from app.services.agent_registry import agent_registry
+from app.services.mission_assigner import MissionAssigner
+from app.services.orchestrator import orchestrator
+
+AGENT = AgentMetadata(
+    id="agent-1", name="Agent 1", role="coder", capabilities=[],
+    status=AgentStatus.ACTIVE, version="1.0.0", endpoint="http://agent:8000",
+)
+
+
+@pytest.fixture
+def assigner(monkeypatch):
+    registry = AsyncMock()
+    registry.list_agents.return_value = [AGENT]
+    monkeypatch.setattr(orchestrator_module, "agent_registry", registry)
+    monkeypatch.setattr(orchestrator_module, "db", AsyncMock())
+    # Long enough that only events can explain a pass inside a test
+    return MissionAssigner(batch_size=50, debounce=0.005, poll_interval=60.0)
+
+
+async def _running(assigner):
+    tasks = assigner.start()
+    # Let the watchers subscribe and the startup pass finish
+    await asyncio.sleep(0.1)
+    return tasks
+
+
+async def _stop(tasks):
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _wait_assigned(mission_id, timeout=2.0):
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if await orchestrator.redis.hget(f"mission:{mission_id}", "state") == "assigned":
+            return time.perf_counter() - start
+        await asyncio.sleep(0.002)
+    raise AssertionError(f"mission {mission_id} was not assigned")
+
+
+@pytest.mark.asyncio
+async def test_new_mission_is_assigned_without_polling(assigner):
+    tasks = await _running(assigner)
+    try:
+        m = await orchestrator.submit(MissionRequest(title="fast"))
+        # Sub-100 ms in practice; the bound leaves room for slow CI machines
+        assert await _wait_assigned(m.id) < 0.5
+    finally:
+        await _stop(tasks)
+
+
+@pytest.mark.asyncio
+async def test_idle_assigner_does_no_work_until_woken(assigner, monkeypatch):
+    assign_batch = AsyncMock(return_value=[])
+    monkeypatch.setattr(orchestrator, "assign_batch", assign_batch)
+    tasks = await _running(assigner)
+    try:
+        assert assign_batch.await_count == 1
+        # Nothing is waiting, so agent heartbeats are not worth a pass
+        await agent_registry._publish_event("heartbeat", {"id": "agent-1"})
+        await asyncio.sleep(0.1)
+        assert assign_batch.await_count == 1
+
+        # The mission stays queued (no agent fits), so new capacity triggers a retry
+        await orchestrator.submit(MissionRequest(title="waiting"))
+        await asyncio.sleep(0.1)
+        assert assign_batch.await_count == 2 and assigner.waiting
+        await agent_registry._publish_event("registered", {"id": "agent-2"})
+        await asyncio.sleep(0.1)
+        assert assign_batch.await_count == 3
+        await agent_registry._publish_event("deregistered", {"id": "agent-2"})
+        await asyncio.sleep(0.1)
+        assert assign_batch.await_count == 3
+    finally:
+        await _stop(tasks)
+
+
+@pytest.mark.asyncio
+async def test_burst_of_events_is_debounced(assigner, monkeypatch):
+    monkeypatch.setattr(orchestrator, "assign_batch", AsyncMock(return_value=[]))
+    assigner.debounce = 0.1
+    tasks = await _running(assigner)
+    try:
+        await asyncio.gather(*(orchestrator.submit(MissionRequest(title=f"m{i}")) for i in range(20)))
+        await asyncio.sleep(0.3)
+        # Startup pass plus one or two passes for the whole burst
+        assert 2 <= orchestrator.assign_batch.await_count <= 3
+    finally:
+        await _stop(tasks)
+
+
+@pytest.mark.asyncio
+async def test_waiting_mission_is_assigned_when_an_agent_heartbeats(assigner):
+    orchestrator_module.agent_registry.list_agents.return_value = []
+    orchestrator_module.db.agent.find_many.return_value = []
+    tasks = await _running(assigner)
+    try:
+        m = await orchestrator.submit(MissionRequest(title="needs an agent"))
+        await asyncio.sleep(0.1)
+        assert await orchestrator.redis.hget(f"mission:{m.id}", "state") == "queued"
+
+        orchestrator_module.agent_registry.list_agents.return_value = [AGENT]
+        await agent_registry._publish_event("heartbeat", {"id": AGENT.id})
+        await _wait_assigned(m.id)
+    finally:
+        await _stop(tasks)
+
+
+@pytest.mark.asyncio
+async def test_safety_poll_runs_without_events(assigner, monkeypatch):
+    assign_batch = AsyncMock(return_value=[])
+    monkeypatch.setattr(orchestrator, "assign_batch", assign_batch)
+    assigner.poll_interval = 0.05
+    tasks = await _running(assigner)
+    try:
+        await asyncio.sleep(0.2)
+        assert assign_batch.await_count >= 3
+    finally:
+        await _stop(tasks)
@@ -0,0 +1,102 @@
+import pytest
+from fastapi import HTTPException
+from app.routers.orchestrator import submit_mission
+from app.schemas.mission import MissionRequest, MissionState
+from app.services.orchestrator import (
+    orchestrator, MissingDependency, CREATED_INDEX_KEY, QUEUE_KEY, queue_score, state_index,
+)
+
+
+async def _submit(title, deps=None, priority=50):
+    return await orchestrator.submit(MissionRequest(title=title, priority=priority, dependencies=deps))
+
+
+async def _finish(mission_id):
+    await orchestrator.start(mission_id)
+    return await orchestrator.complete(mission_id)
+
+
+async def _queued():
+    return set(await orchestrator.redis.zrange(QUEUE_KEY, 0, -1))
+
+
+@pytest.mark.asyncio
+async def test_diamond_unlocks_each_mission_when_its_last_dependency_completes():
+    a, b = await _submit("a"), await _submit("b")
+    c = await _submit("c", [a.id, b.id], priority=80)
+    d = await _submit("d", [c.id])
+    assert (c.state, d.state) == (MissionState.DEFERRED, MissionState.DEFERRED)
+    # Independent branches are assignable side by side; dependents stay out of the queue
+    assert await _queued() == {a.id, b.id}
+    assert set(await orchestrator.redis.zrange(state_index("deferred"), 0, -1)) == {c.id, d.id}
+
+    await _finish(a.id)
+    assert (await orchestrator.get(c.id)).state == MissionState.DEFERRED
+    assert await orchestrator.redis.hget(f"mission:{c.id}", "unmet_deps") == "1"
+
+    await _finish(b.id)
+    v = await orchestrator.redis.hgetall(f"mission:{c.id}")
+    assert v["state"] == "queued" and v["unmet_deps"] == "0"
+    assert await _queued() == {c.id}
+    assert await orchestrator.redis.zscore(QUEUE_KEY, c.id) == queue_score(80, v["created_at"])
+    assert await orchestrator.redis.zrange(state_index("deferred"), 0, -1) == [d.id]
+    # Edges are consumed on completion
+    assert not await orchestrator.redis.exists(f"mission:{b.id}:dependents")
+
+    await _finish(c.id)
+    assert (await orchestrator.get(d.id)).state == MissionState.QUEUED
+
+
+@pytest.mark.asyncio
+async def test_unlock_is_announced_for_the_assigner():
+    a = await _submit("a")
+    b = await _submit("b", [a.id])
+    await _finish(a.id)
+
+    entries = await orchestrator.redis.xrange("mission.events")
+    queued = [f for _, f in entries if f["message_type"] == "mission.queued"]
+    assert len(queued) == 1 and b.id in queued[0]["payload"]
+
+
+@pytest.mark.asyncio
+async def test_completed_and_repeated_dependencies_count_once():
+    a = await _submit("a")
+    await _finish(a.id)
+    b = await _submit("b")
+
+    c = await _submit("c", [a.id, b.id, b.id])
+    assert c.state == MissionState.DEFERRED
+    assert await orchestrator.redis.hget(f"mission:{c.id}", "unmet_deps") == "1"
+    await _finish(b.id)
+    assert c.id in await _queued()
+
+    d = await _submit("d", [a.id])
+    assert d.state == MissionState.QUEUED and d.id in await _queued()
+
+
+@pytest.mark.asyncio
+async def test_failed_dependency_keeps_dependents_deferred_until_retried():
+    a = await _submit("a")
+    b = await _submit("b", [a.id])
+    await orchestrator.fail(a.id)
+    assert (await orchestrator.get(b.id)).state == MissionState.DEFERRED
+
+    assert await orchestrator.requeue(a.id)
+    await _finish(a.id)
+    assert (await orchestrator.get(b.id)).state == MissionState.QUEUED
+
+
+@pytest.mark.asyncio
+async def test_unknown_dependency_is_rejected_without_writes():
+    a = await _submit("a")
+    before = await orchestrator.redis.zcard(CREATED_INDEX_KEY)
+
+    with pytest.raises(MissingDependency) as exc:
+        await _submit("b", [a.id, "nope"])
+    assert exc.value.dependency_id == "nope"
+    assert await orchestrator.redis.zcard(CREATED_INDEX_KEY) == before
+    assert not await orchestrator.redis.exists(f"mission:{a.id}:dependents")
+
+    with pytest.raises(HTTPException) as http:
+        await submit_mission(MissionRequest(title="b", dependencies=["nope"]))
+    assert http.value.status_code == 400
@@ -0,0 +1,136 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from fakeredis.aioredis import FakeRedis
+from app.schemas.agent import AgentMetadata, AgentStatus
+from app.schemas.mission import MissionRequest, MissionState
+from app.services import orchestrator as orchestrator_module
+from app.services.orchestrator import Orchestrator, InvalidTransition, LeaseLost, LEASE_KEY, QUEUE_KEY
+
+AGENT = AgentMetadata(
+    id="agent-1", name="Agent 1", role="coder", capabilities=[],
+    status=AgentStatus.ACTIVE, version="1.0.0", endpoint="http://agent:8000",
+)
+
+
+@pytest.fixture
+def shared_redis():
+    return FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = AsyncMock()
+
+    async def list_agents():
+        # Yield so concurrent assigners interleave between claim and assignment
+        await asyncio.sleep(0.001)
+        return [AGENT]
+
+    registry.list_agents.side_effect = list_agents
+    registry.get_load.return_value = 0.0
+    monkeypatch.setattr(orchestrator_module, "agent_registry", registry)
+    monkeypatch.setattr(orchestrator_module, "db", AsyncMock())
+    monkeypatch.setattr(orchestrator_module, "event_bus", AsyncMock())
+    monkeypatch.setattr(orchestrator_module.llm_service, "enabled", False)
+    return registry
+
+
+def _replica(shared_redis, lease_seconds=30.0) -> Orchestrator:
+    orch = Orchestrator()
+    orch.redis = shared_redis
+    orch._redis_initialized = True
+    orch.lease_seconds = lease_seconds
+    return orch
+
+
+@pytest.mark.asyncio
+async def test_concurrent_replicas_never_double_assign(shared_redis, registry):
+    replicas = [_replica(shared_redis) for _ in range(6)]
+    submitted = {(await replicas[0].submit(MissionRequest(title=f"m{i}", priority=i % 7))).id for i in range(60)}
+
+    async def drain(orch):
+        won = []
+        while (res := await orch.assign_next()) is not None:
+            won.append(res.id)
+        return won
+
+    results = await asyncio.gather(*(drain(r) for r in replicas))
+    assigned = [mid for won in results for mid in won]
+    assert len(assigned) == len(set(assigned)) == 60
+    assert set(assigned) == submitted
+    # Work spreads across replicas instead of all of them contending for the same head
+    assert sum(1 for won in results if won) > 1
+    assert orchestrator_module.db.mission.update.await_count == 60
+    assert await shared_redis.zcard(QUEUE_KEY) == 0
+    assert await shared_redis.zcard(LEASE_KEY) == 0
+    for mid in submitted:
+        v = await shared_redis.hgetall(f"mission:{mid}")
+        assert v["state"] == MissionState.ASSIGNED.value and "lease_owner" not in v
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_requeued_at_its_position(shared_redis, registry):
+    crashed, survivor = _replica(shared_redis, 0.05), _replica(shared_redis)
+    m = await crashed.submit(MissionRequest(title="orphan", priority=70))
+    score = await shared_redis.zscore(QUEUE_KEY, m.id)
+
+    assert [v["id"] for v in await crashed._claim("crashed", 1)] == [m.id]
+    # Claimed by the crashed replica: invisible until the lease runs out
+    assert await survivor.assign_next() is None
+    await asyncio.sleep(0.1)
+    assert await survivor._claim("peek", 0) == []
+    assert await shared_redis.zscore(QUEUE_KEY, m.id) == score
+    assert (await survivor.assign_next()).id == m.id
+
+
+@pytest.mark.asyncio
+async def test_stale_claimer_cannot_assign_after_takeover(shared_redis, registry):
+    slow, fast = _replica(shared_redis, 0.05), _replica(shared_redis)
+    m = await slow.submit(MissionRequest(title="contested"))
+    [claimed] = await slow._claim("slow-owner", 1)
+    await asyncio.sleep(0.1)
+
+    # The lease expired and another replica claimed the mission but has not assigned it yet
+    [taken] = await fast._claim("fast-owner", 1)
+    with pytest.raises(LeaseLost):
+        await slow._apply(m.id, MissionState.ASSIGNED, {"agent_id": "other"}, lease_owner="slow-owner")
+    assert await slow._assign_claimed(claimed, "slow-owner") is None
+
+    assert (await fast._assign_claimed(taken, "fast-owner")).agent_id == "agent-1"
+    # Once assigned, a late claimer is refused by the state check
+    with pytest.raises(InvalidTransition):
+        await slow._apply(m.id, MissionState.ASSIGNED, {"agent_id": "other"}, lease_owner="slow-owner")
+
+
+@pytest.mark.asyncio
+async def test_lease_is_renewed_during_slow_assignment(shared_redis, registry):
+    async def slow_list_agents():
+        await asyncio.sleep(0.4)
+        return [AGENT]
+
+    registry.list_agents.side_effect = slow_list_agents
+    owner, other = _replica(shared_redis, 0.15), _replica(shared_redis)
+    m = await owner.submit(MissionRequest(title="slow"))
+
+    task = asyncio.create_task(owner.assign_next())
+    await asyncio.sleep(0.3)
+    # Two lease lengths have passed, but renewal kept the claim alive
+    assert await other._claim("other", 1) == []
+    assert (await task).id == m.id
+    assert await shared_redis.zcard(LEASE_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_unplaceable_mission_is_released(shared_redis, registry):
+    registry.list_agents.side_effect = None
+    registry.list_agents.return_value = []
+    orchestrator_module.db.agent.find_many.side_effect = Exception("db down")
+    orch = _replica(shared_redis)
+    m = await orch.submit(MissionRequest(title="nobody home"))
+    score = await shared_redis.zscore(QUEUE_KEY, m.id)
+
+    assert await orch.assign_next() is None
+    assert await shared_redis.zscore(QUEUE_KEY, m.id) == score
+    assert await shared_redis.zcard(LEASE_KEY) == 0
+    assert "lease_owner" not in await shared_redis.hgetall(f"mission:{m.id}")
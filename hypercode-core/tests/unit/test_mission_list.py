@@ -0,0 +1,97 @@
+import pytest
+from fastapi import HTTPException, Response
+from app.routers.orchestrator import list_missions
+from app.schemas.mission import MissionRequest, MissionState
+from app.services.orchestrator import orchestrator, CREATED_INDEX_KEY, created_ms, state_index
+
+
+async def _seed(n, created_at="2024-01-01T00:00:00+00:00", state="completed"):
+    """n missions sharing one creation millisecond, the worst case for cursor ties."""
+    r = orchestrator.redis
+    for i in range(n):
+        mid = f"m{i:02d}"
+        await r.hset(f"mission:{mid}", mapping={
+            "id": mid, "title": "t", "state": state, "priority": "50", "agent_id": "",
+            "created_at": created_at, "updated_at": created_at,
+        })
+        await r.zadd(CREATED_INDEX_KEY, {mid: created_ms(created_at)})
+        await r.zadd(state_index(state), {mid: created_ms(created_at)})
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_every_mission_once():
+    await _seed(7)
+    seen, cursor = [], None
+    while True:
+        items, cursor = await orchestrator.page(limit=3, cursor=cursor)
+        seen.extend(m.id for m in items)
+        if cursor is None:
+            break
+    assert seen == [f"m{i:02d}" for i in reversed(range(7))]
+
+
+@pytest.mark.asyncio
+async def test_newest_first_and_state_filter():
+    await _seed(2, created_at="2024-01-01T00:00:00+00:00", state="completed")
+    r = orchestrator.redis
+    newer = "2024-01-02T00:00:00+00:00"
+    for mid, state in (("q1", "queued"), ("f1", "failed")):
+        await r.hset(f"mission:{mid}", mapping={
+            "id": mid, "title": "t", "state": state, "priority": "50", "agent_id": "",
+            "created_at": newer, "updated_at": newer,
+        })
+        await r.zadd(CREATED_INDEX_KEY, {mid: created_ms(newer)})
+        await r.zadd(state_index(state), {mid: created_ms(newer)})
+
+    assert [m.id for m in await orchestrator.list(limit=10)] == ["q1", "f1", "m01", "m00"]
+    failed_or_queued = await orchestrator.list(limit=10, states=[MissionState.FAILED, MissionState.QUEUED])
+    assert [m.id for m in failed_or_queued] == ["q1", "f1"]
+    assert await orchestrator.list(limit=10, states=[MissionState.EXECUTING]) == []
+
+
+@pytest.mark.asyncio
+async def test_state_index_follows_transitions():
+    m = await orchestrator.submit(MissionRequest(title="moving"))
+    assert [x.id for x in await orchestrator.list(states=[MissionState.QUEUED])] == [m.id]
+
+    await orchestrator.start(m.id)
+    assert await orchestrator.list(states=[MissionState.QUEUED]) == []
+    assert [x.id for x in await orchestrator.list(states=[MissionState.EXECUTING])] == [m.id]
+
+    await orchestrator.fail(m.id)
+    await orchestrator.requeue(m.id)
+    assert await orchestrator.list(states=[MissionState.EXECUTING]) == []
+    assert await orchestrator.list(states=[MissionState.FAILED]) == []
+    assert [x.id for x in await orchestrator.list(states=[MissionState.QUEUED])] == [m.id]
+
+
+@pytest.mark.asyncio
+async def test_list_never_scans_keyspace_and_skips_missing_hashes(monkeypatch):
+    await _seed(4)
+    await orchestrator.redis.delete("mission:m02")
+
+    async def no_keys(*args, **kwargs):
+        raise AssertionError("KEYS must not be used")
+
+    monkeypatch.setattr(orchestrator.redis, "keys", no_keys)
+    items, cursor = await orchestrator.page(limit=2)
+    assert [m.id for m in items] == ["m03"]
+    items, cursor = await orchestrator.page(limit=2, cursor=cursor)
+    assert [m.id for m in items] == ["m01", "m00"] and cursor is None
+
+
+@pytest.mark.asyncio
+async def test_router_sets_next_cursor_header_and_rejects_bad_cursor():
+    await _seed(3)
+    response = Response()
+    items = await list_missions(response, limit=2, cursor=None, state=None)
+    assert len(items) == 2
+    assert response.headers["X-Next-Cursor"] == f"{created_ms('2024-01-01T00:00:00+00:00')}:m01"
+
+    last = Response()
+    assert len(await list_missions(last, limit=2, cursor=response.headers["X-Next-Cursor"], state=None)) == 1
+    assert "X-Next-Cursor" not in last.headers
+
+    with pytest.raises(HTTPException) as exc:
+        await list_missions(Response(), limit=2, cursor="garbage", state=None)
+    assert exc.value.status_code == 400
@@ -0,0 +1,100 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+from app.schemas.agent import AgentMetadata, AgentStatus
+from app.schemas.mission import MissionRequest, MissionState
+from app.services import orchestrator as orchestrator_module
+from app.services.orchestrator import orchestrator, QUEUE_KEY, INDEX_VERSION, INDEX_VERSION_KEY, queue_score
+
+
+@pytest.fixture
+def one_agent(monkeypatch):
+    registry = AsyncMock()
+    registry.list_agents.return_value = [AgentMetadata(
+        id="agent-1", name="Agent 1", role="coder", capabilities=[],
+        status=AgentStatus.ACTIVE, version="1.0.0", endpoint="http://agent:8000",
+    )]
+    registry.get_load.return_value = 0.0
+    monkeypatch.setattr(orchestrator_module, "agent_registry", registry)
+    monkeypatch.setattr(orchestrator_module.llm_service, "enabled", False)
+    return registry
+
+
+def test_queue_score_orders_priority_then_age():
+    t0 = "2024-01-01T00:00:00+00:00"
+    t1 = "2024-01-01T00:00:01+00:00"
+    assert queue_score(90, t1) < queue_score(50, t0)
+    assert queue_score(50, t0) < queue_score(50, t1)
+
+
+@pytest.mark.asyncio
+async def test_assign_pops_by_priority_then_fifo(one_agent):
+    low = await orchestrator.submit(MissionRequest(title="low", priority=10))
+    first = await orchestrator.submit(MissionRequest(title="first", priority=80))
+    second = await orchestrator.submit(MissionRequest(title="second", priority=80))
+
+    order = [(await orchestrator.assign_next()).id for _ in range(3)]
+    assert order == [first.id, second.id, low.id]
+    assert await orchestrator.assign_next() is None
+    assert await orchestrator.redis.zcard(QUEUE_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_assign_never_scans_keyspace(one_agent, monkeypatch):
+    await orchestrator.submit(MissionRequest(title="m"))
+
+    async def no_keys(*args, **kwargs):
+        raise AssertionError("KEYS must not be used")
+
+    monkeypatch.setattr(orchestrator.redis, "keys", no_keys)
+    assert (await orchestrator.assign_next()).state == MissionState.ASSIGNED
+
+
+@pytest.mark.asyncio
+async def test_transitions_and_requeue_maintain_queue(one_agent):
+    m = await orchestrator.submit(MissionRequest(title="retry me", priority=60))
+    score = await orchestrator.redis.zscore(QUEUE_KEY, m.id)
+
+    await orchestrator.fail(m.id)
+    assert await orchestrator.redis.zscore(QUEUE_KEY, m.id) is None
+
+    assert await orchestrator.requeue(m.id)
+    assert await orchestrator.redis.zscore(QUEUE_KEY, m.id) == score
+    v = await orchestrator.redis.hgetall(f"mission:{m.id}")
+    assert v["state"] == MissionState.QUEUED.value and v["agent_id"] == ""
+    assert not await orchestrator.requeue("missing")
+
+
+@pytest.mark.asyncio
+async def test_stale_queue_entries_are_pruned(one_agent):
+    m = await orchestrator.submit(MissionRequest(title="stale"))
+    # A writer outside the orchestrator moved the mission on without touching the queue
+    await orchestrator.redis.hset(f"mission:{m.id}", "state", MissionState.COMPLETED.value)
+    await orchestrator.redis.zadd(QUEUE_KEY, {"ghost": 0})
+
+    assert await orchestrator.assign_next() is None
+    assert await orchestrator.redis.zcard(QUEUE_KEY) == 0
+
+
+@pytest.mark.asyncio
+async def test_rebuild_indexes_legacy_hashes_once():
+    r = orchestrator.redis
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i, state in enumerate(["queued", "queued", "completed"]):
+        await r.hset(f"mission:legacy-{i}", mapping={
+            "id": f"legacy-{i}", "title": "t", "state": state, "priority": str(50 + i), "agent_id": "",
+            "created_at": (base + timedelta(seconds=i)).isoformat(), "updated_at": base.isoformat(),
+        })
+    await r.set("mission:legacy-0:retries", "2")
+
+    assert await orchestrator.rebuild_indexes() == 2
+    assert await r.zrange(QUEUE_KEY, 0, -1) == ["legacy-1", "legacy-0"]
+    assert int(await r.get(INDEX_VERSION_KEY)) == INDEX_VERSION
+    assert [m.id for m in await orchestrator.list(limit=10)] == ["legacy-2", "legacy-1", "legacy-0"]
+
+    await r.hset("mission:legacy-3", mapping={
+        "id": "legacy-3", "title": "t", "state": "queued", "priority": "50", "agent_id": "",
+        "created_at": base.isoformat(), "updated_at": base.isoformat(),
+    })
+    assert await orchestrator.rebuild_indexes() == 0
+    assert await orchestrator.rebuild_indexes(force=True) == 3
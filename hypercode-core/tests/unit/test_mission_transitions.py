@@ -0,0 +1,91 @@
+import pytest
+from fastapi import HTTPException
+from app.routers.orchestrator import complete as complete_route
+from app.schemas.mission import MissionRequest, MissionState
+from app.services.orchestrator import (
+    orchestrator, ALLOWED_TRANSITIONS, InvalidTransition, QUEUE_KEY, state_index,
+)
+
+
+async def _mission(**fields):
+    m = await orchestrator.submit(MissionRequest(title="t", priority=40))
+    if fields:
+        await orchestrator.redis.hset(f"mission:{m.id}", mapping=fields)
+    return m
+
+
+@pytest.mark.asyncio
+async def test_lifecycle_is_one_script_call_per_transition(monkeypatch):
+    m = await _mission()
+
+    async def no_reads(*args, **kwargs):
+        raise AssertionError("transition must not read the hash from the client")
+
+    monkeypatch.setattr(orchestrator.redis, "hgetall", no_reads)
+    for step, state in ((orchestrator.start, MissionState.EXECUTING),
+                        (orchestrator.verify, MissionState.VERIFYING),
+                        (orchestrator.complete, MissionState.COMPLETED)):
+        res = await step(m.id)
+        assert res.state == state and res.title == "t" and res.priority == 40
+    assert await orchestrator.redis.zrange(state_index("completed"), 0, -1) == [m.id]
+
+
+@pytest.mark.asyncio
+async def test_illegal_transition_is_rejected_without_side_effects():
+    m = await _mission()
+    await orchestrator.start(m.id)
+    await orchestrator.complete(m.id)
+    before = await orchestrator.redis.hgetall(f"mission:{m.id}")
+
+    with pytest.raises(InvalidTransition) as exc:
+        await orchestrator.fail(m.id)
+    assert exc.value.from_state == "completed" and exc.value.to_state == MissionState.FAILED
+    assert await orchestrator.redis.hgetall(f"mission:{m.id}") == before
+    assert await orchestrator.redis.zrange(state_index("failed"), 0, -1) == []
+    assert ALLOWED_TRANSITIONS[MissionState.COMPLETED] == set()
+
+    with pytest.raises(HTTPException) as http:
+        await complete_route(m.id)
+    assert http.value.status_code == 409
+    assert await orchestrator.fail("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_failure_counts_towards_breaker_atomically():
+    for _ in range(2):
+        m = await _mission(state="assigned", agent_id="agent-9")
+        await orchestrator.fail(m.id)
+    assert await orchestrator.redis.get("agent:agent-9:failures") == "2"
+    assert await orchestrator.redis.get("cb:open:agent-9") is None
+
+    m = await _mission(state="executing", agent_id="agent-9")
+    res = await orchestrator.fail(m.id)
+    assert res.agent_id == "agent-9"
+    assert await orchestrator.redis.get("cb:open:agent-9") == "1"
+    assert 0 < await orchestrator.redis.ttl("agent:agent-9:failures") <= 300
+
+
+@pytest.mark.asyncio
+async def test_requeue_restores_queue_score_and_survives_script_flush():
+    m = await _mission()
+    score = await orchestrator.redis.zscore(QUEUE_KEY, m.id)
+    await orchestrator.fail(m.id)
+    await orchestrator.redis.script_flush()
+
+    assert await orchestrator.requeue(m.id)
+    assert await orchestrator.redis.zscore(QUEUE_KEY, m.id) == score
+    # Already queued: a second retry is a no-op
+    assert not await orchestrator.requeue(m.id)
+
+
+@pytest.mark.asyncio
+async def test_approve_is_single_round_trip(monkeypatch):
+    m = await _mission()
+
+    async def no_reads(*args, **kwargs):
+        raise AssertionError("approve must not read the hash from the client")
+
+    monkeypatch.setattr(orchestrator.redis, "hgetall", no_reads)
+    res = await orchestrator.approve(m.id)
+    assert res.id == m.id and res.state == MissionState.QUEUED
+    assert await orchestrator.redis.hget(f"mission:{m.id}", "approved") == "1"
@@ -3,8 +3,9 @@ import json
 import uuid
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
-from app.services.orchestrator import Orchestrator, MissionState, MissionRequest
+from app.services.orchestrator import Orchestrator, MissionState, MissionRequest, QUEUE_KEY, queue_score
 from app.schemas.agent import AgentMetadata, AgentStatus
+from fakeredis.aioredis import FakeRedis
 
 @pytest.fixture
 def mock_redis():
@@ -50,6 +51,7 @@ def mock_event_bus():
 def orchestrator(mock_redis, mock_db, mock_agent_registry, mock_event_bus):
     with patch("app.services.orchestrator.redis.from_url", return_value=mock_redis), \
          patch("app.services.orchestrator.db", mock_db), \
+         patch("app.services.audit_sink.db", mock_db), \
          patch("app.services.orchestrator.agent_registry", mock_agent_registry), \
          patch("app.services.orchestrator.event_bus", mock_event_bus), \
          patch("app.services.orchestrator.settings") as mock_settings:
@@ -59,8 +61,21 @@ def orchestrator(mock_redis, mock_db, mock_agent_registry, mock_event_bus):
         orch.redis = mock_redis
         yield orch
 
+@pytest.fixture
+def fake_orchestrator(orchestrator):
+    orchestrator.redis = FakeRedis(decode_responses=True)
+    return orchestrator
+
+async def _enqueue(orch, mission_data):
+    mission_data = {"title": "Queued", "priority": "1", "agent_id": "",
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "updated_at": datetime.now(timezone.utc).isoformat(), **mission_data}
+    await orch.redis.hset(f"mission:{mission_data['id']}", mapping=mission_data)
+    await orch.redis.zadd(QUEUE_KEY, {mission_data["id"]: queue_score(mission_data["priority"], mission_data["created_at"])})
+
 @pytest.mark.asyncio
-async def test_submit_mission(orchestrator, mock_redis, mock_db, mock_event_bus):
+async def test_submit_mission(fake_orchestrator, mock_db, mock_event_bus):
+    orchestrator = fake_orchestrator
     req = MissionRequest(title="Test Mission", priority=1, payload={})
     
     result = await orchestrator.submit(req)
@@ -69,8 +84,9 @@ async def test_submit_mission(orchestrator, mock_redis, mock_db, mock_event_bus)
     assert result.state == MissionState.QUEUED
     
     # Verify Redis interactions
-    mock_redis.ping.assert_called()
-    assert mock_redis.hset.called
+    stored = await orchestrator.redis.hgetall(f"mission:{result.id}")
+    assert stored["state"] == MissionState.QUEUED.value
+    assert await orchestrator.redis.zscore(QUEUE_KEY, result.id) is not None
     
     # Verify DB interactions
     mock_db.mission.create.assert_called_once()
@@ -80,13 +96,13 @@ async def test_submit_mission(orchestrator, mock_redis, mock_db, mock_event_bus)
     mock_event_bus.publish_stream.assert_called_once()
 
 @pytest.mark.asyncio
-async def test_assign_next_no_missions(orchestrator, mock_redis):
-    mock_redis.keys.return_value = []
-    result = await orchestrator.assign_next()
+async def test_assign_next_no_missions(fake_orchestrator):
+    result = await fake_orchestrator.assign_next()
     assert result is None
 
 @pytest.mark.asyncio
-async def test_assign_next_success(orchestrator, mock_redis, mock_agent_registry, mock_db, mock_event_bus):
+async def test_assign_next_success(fake_orchestrator, mock_agent_registry, mock_db, mock_event_bus):
+    orchestrator = fake_orchestrator
     # Setup mission in Redis
     mid = "mission-123"
     mission_data = {
@@ -99,11 +115,7 @@ async def test_assign_next_success(orchestrator, mock_redis, mock_agent_registry
         "created_at": datetime.now(timezone.utc).isoformat(),
         "updated_at": datetime.now(timezone.utc).isoformat(),
     }
-    mock_redis.keys.return_value = [f"mission:{mid}"]
-    mock_redis.hgetall.side_effect = [
-        mission_data, # For loop
-        {**mission_data, "state": MissionState.ASSIGNED.value, "agent_id": "agent-1"} # For return
-    ]
+    await _enqueue(orchestrator, mission_data)
     
     # Setup Agent
     agent = AgentMetadata(
@@ -131,7 +143,8 @@ async def test_assign_next_success(orchestrator, mock_redis, mock_agent_registry
     mock_event_bus.publish_stream.assert_called_once()
 
 @pytest.mark.asyncio
-async def test_assign_next_no_matching_agent(orchestrator, mock_redis, mock_agent_registry):
+async def test_assign_next_no_matching_agent(fake_orchestrator, mock_agent_registry):
+    orchestrator = fake_orchestrator
     # Setup mission requiring "rust"
     mid = "mission-123"
     mission_data = {
@@ -139,8 +152,7 @@ async def test_assign_next_no_matching_agent(orchestrator, mock_redis, mock_agen
         "state": MissionState.QUEUED.value,
         "payload": json.dumps({"requirements": {"capabilities": ["rust"]}}),
     }
-    mock_redis.keys.return_value = [f"mission:{mid}"]
-    mock_redis.hgetall.return_value = mission_data
+    await _enqueue(orchestrator, mission_data)
     
     # Setup Agent with only "python"
     agent = AgentMetadata(
@@ -164,11 +176,6 @@ async def test_assign_next_no_matching_agent(orchestrator, mock_redis, mock_agen
     # So it falls back to ANY agent if no capability match? That seems like a logic "feature" or bug.
     # Let's verify it falls back to agent-1
     
-    mock_redis.hgetall.side_effect = [
-        mission_data,
-        {**mission_data, "state": MissionState.ASSIGNED.value, "agent_id": "agent-1", "title": "Fallback", "priority": "1", "created_at": datetime.now().isoformat(), "updated_at": datetime.now().isoformat()}
-    ]
-
     result = await orchestrator.assign_next()
     
     assert result is not None
@@ -3,6 +3,7 @@ import json
 import asyncio
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, patch
+from fakeredis.aioredis import FakeRedis
 from app.services.orchestrator import Orchestrator, MissionState, MissionRequest
 
 @pytest.fixture
@@ -33,55 +34,32 @@ def mock_db():
 @pytest.fixture
 def orchestrator(mock_redis, mock_db):
     with patch("app.services.orchestrator.redis.from_url", return_value=mock_redis), \
-         patch("app.services.orchestrator.db", mock_db):
+         patch("app.services.orchestrator.db", mock_db), \
+         patch("app.services.audit_sink.db", mock_db):
         
         orch = Orchestrator()
         orch.redis = mock_redis
         yield orch
 
 @pytest.mark.asyncio
-async def test_list_missions(orchestrator, mock_redis):
-    # Setup multiple missions
-    mock_redis.keys.return_value = ["mission:1", "mission:2"]
-    
-    m1 = {
-        "id": "mission:1",
-        "title": "Mission 1",
-        "state": MissionState.QUEUED.value,
-        "priority": "1",
-        "agent_id": "",
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat(),
-    }
-    m2 = {
-        "id": "mission:2",
-        "title": "Mission 2",
-        "state": MissionState.EXECUTING.value,
-        "priority": "2",
-        "agent_id": "agent-1",
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat(),
-    }
-    
-    # Mock hgetall to return different values based on key
-    async def side_effect(key):
-        if key == "mission:1": return m1
-        if key == "mission:2": return m2
-        return None
-        
-    mock_redis.hgetall.side_effect = side_effect
+async def test_list_missions(orchestrator):
+    orchestrator.redis = FakeRedis(decode_responses=True)
+    m1 = await orchestrator.submit(MissionRequest(title="Mission 1", priority=1))
+    m2 = await orchestrator.submit(MissionRequest(title="Mission 2", priority=2))
+    await orchestrator.start(m2.id)
     
     missions = await orchestrator.list(limit=10)
     
     assert len(missions) == 2
-    assert missions[0].id == "mission:1" or missions[0].id == "mission:2"
+    assert {m.id for m in missions} == {m1.id, m2.id}
     assert missions[0].state in [MissionState.QUEUED, MissionState.EXECUTING]
 
 @pytest.mark.asyncio
-async def test_list_missions_with_error(orchestrator, mock_redis):
-    mock_redis.keys.return_value = ["mission:1"]
-    # hgetall raises exception
-    mock_redis.hgetall.side_effect = Exception("Redis error")
+async def test_list_missions_with_error(orchestrator):
+    orchestrator.redis = FakeRedis(decode_responses=True)
+    m = await orchestrator.submit(MissionRequest(title="Mission 1"))
+    # Malformed hash is skipped rather than failing the whole page
+    await orchestrator.redis.hset(f"mission:{m.id}", "priority", "not-a-number")
     
     missions = await orchestrator.list()
     assert len(missions) == 0
@@ -112,7 +90,8 @@ async def test_audit_failure(orchestrator, mock_db):
     assert mock_db.auditlog.find_many.call_count == 3
 
 @pytest.mark.asyncio
-async def test_approve_mission(orchestrator, mock_redis, mock_db):
+async def test_approve_mission(orchestrator, mock_db):
+    orchestrator.redis = FakeRedis(decode_responses=True)
     mission_id = "mission-123"
     
     # Initial state
@@ -126,7 +105,7 @@ async def test_approve_mission(orchestrator, mock_redis, mock_db):
         "updated_at": datetime.now(timezone.utc).isoformat(),
     }
     
-    mock_redis.hgetall.return_value = initial_data
+    await orchestrator.redis.hset(f"mission:{mission_id}", mapping=initial_data)
     
     result = await orchestrator.approve(mission_id)
     
@@ -134,17 +113,14 @@ async def test_approve_mission(orchestrator, mock_redis, mock_db):
     assert result.id == mission_id
     
     # Verify Redis update
-    mock_redis.hset.assert_called_once()
-    call_args = mock_redis.hset.call_args
-    assert call_args[1]['mapping']['approved'] == "1"
+    assert await orchestrator.redis.hget(f"mission:{mission_id}", "approved") == "1"
     
     # Verify Audit log
     mock_db.auditlog.create.assert_called_once()
     assert mock_db.auditlog.create.call_args[0][0]["transition"] == "approve"
 
 @pytest.mark.asyncio
-async def test_approve_mission_not_found(orchestrator, mock_redis):
-    mock_redis.hgetall.return_value = None
+async def test_approve_mission_not_found(orchestrator):
+    orchestrator.redis = FakeRedis(decode_responses=True)
     result = await orchestrator.approve("mission-404")
     assert result is None
-
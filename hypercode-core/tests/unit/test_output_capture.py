@@ -0,0 +1,69 @@
+import tempfile
+import pytest
+from app.engine.output import OutputBuffer, cap_text, TRUNCATION_MARKER
+from app.engine import forkserver
+from app.engine.interpreter import Interpreter
+from app.parser.hc_parser import parse
+from app.schemas.execution import ExecutionRequest, Language
+from app.services import execution_service
+from app.services.execution_service import ExecutionService
+
+
+def test_buffer_keeps_head_and_tail_and_counts_dropped():
+    buf = OutputBuffer(10)
+    for i in range(100):
+        buf.write(str(i % 10).encode())
+    assert buf.total == 100
+    assert buf.bytes_dropped == 90
+    assert buf.getvalue() == "01234" + TRUNCATION_MARKER.format(dropped=90) + "56789"
+
+
+def test_buffer_tail_is_trimmed_across_chunk_boundaries():
+    buf = OutputBuffer(8)
+    buf.write(b"abcd")
+    buf.write(b"efghijk")
+    buf.write(b"lm")
+    assert buf.tail() == b"jklm"
+    assert buf.bytes_dropped == 5
+
+
+def test_buffer_within_limit_and_unbounded_are_untouched():
+    assert cap_text("short", 10) == ("short", 0)
+    unbounded = OutputBuffer(0)
+    unbounded.write(b"x" * 10000)
+    assert unbounded.bytes_dropped == 0 and len(unbounded.getvalue()) == 10000
+
+
+def test_interpreter_output_is_capped():
+    program = parse("i = 0\nwhile i < 1000:\n    print(i)\n    i = i + 1\n")
+    r = Interpreter(max_output=64).execute(program)
+    assert r.exit_code == 0
+    assert r.bytes_dropped > 0
+    assert r.stdout.startswith("0\n1\n2\n")
+    assert r.stdout.endswith("999")
+    assert "bytes truncated" in r.stdout
+
+
+def test_forkserver_reads_back_only_head_and_tail():
+    with tempfile.TemporaryFile() as f:
+        f.write(b"a" * 100 + b"b" * 1000 + b"c" * 100)
+        text, dropped = forkserver._read(f, 200)
+    assert dropped == 1000
+    assert text == "a" * 100 + TRUNCATION_MARKER.format(dropped=1000) + "c" * 100
+
+
+@pytest.mark.asyncio
+async def test_subprocess_output_is_capped_and_reported(monkeypatch):
+    monkeypatch.setattr(execution_service.settings, "EXECUTION_MAX_OUTPUT_BYTES", 1024)
+    chunks = []
+
+    async def on_output(stream, text):
+        chunks.append((stream, text))
+
+    code = "import sys\nsys.stdout.write('H' * 512 + 'x' * 5_000_000 + 'T' * 512)"
+    result = await ExecutionService.execute_code(ExecutionRequest(code=code, language=Language.PYTHON), on_output=on_output)
+    assert result.status == "success"
+    assert result.bytes_dropped == 5_000_000
+    expected = "H" * 512 + TRUNCATION_MARKER.format(dropped=5_000_000) + "T" * 512
+    assert result.stdout == expected
+    assert "".join(t for s, t in chunks if s == "stdout") == expected
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import time
+import pytest
+from app.services.python_pool import PythonWorkerPool, WorkerPoolError, python_pool
+from app.services.execution_service import ExecutionService
+from app.schemas.execution import ExecutionRequest, Language
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="fork server requires os.fork")
+
+
+@pytest.fixture
+async def pool():
+    p = PythonWorkerPool(enabled=True, size=2, max_runs=3, preload="json,math")
+    await p.start()
+    yield p
+    await p.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_runs_code_with_exit_code_semantics(pool):
+    ok = await pool.run("import json\nprint(json.dumps({'a': 1}))")
+    assert ok.exit_code == 0
+    assert ok.stdout.strip() == '{"a": 1}'
+
+    exited = await pool.run("import sys\nsys.exit(3)")
+    assert exited.exit_code == 3
+
+    failed = await pool.run("raise ValueError('bad')")
+    assert failed.exit_code == 1
+    assert "ValueError: bad" in failed.stderr
+    assert 'File "<string>", line 1' in failed.stderr
+
+
+@pytest.mark.asyncio
+async def test_pool_isolates_runs_and_applies_env(pool):
+    await pool.run("import math\nmath.leaked = True")
+    r = await pool.run("import math\nprint(hasattr(math, 'leaked'))")
+    assert r.stdout.strip() == "False"
+
+    r = await pool.run("import os\nprint(os.environ.get('HC_TEST', 'unset'))", env={"HC_TEST": "set"})
+    assert r.stdout.strip() == "set"
+
+
+@pytest.mark.asyncio
+async def test_pool_timeout_kills_child(pool):
+    t0 = time.perf_counter()
+    r = await pool.run("while True: pass", timeout=0.3)
+    assert r.timed_out
+    assert time.perf_counter() - t0 < 3.0
+    # Worker survives and keeps serving
+    r = await pool.run("print('alive')")
+    assert r.stdout.strip() == "alive"
+
+
+@pytest.mark.asyncio
+async def test_pool_recycles_workers_after_max_runs(pool):
+    pids = set()
+    for _ in range(8):
+        await pool.run("pass")
+        pids.update(w.proc.pid for w in pool._workers)
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.5)
+    assert len(pids) > 2
+    assert len(pool._workers) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_share_pool(pool):
+    results = await asyncio.gather(*[pool.run(f"print({i})") for i in range(6)])
+    assert sorted(int(r.stdout) for r in results) == list(range(6))
+
+
+@pytest.mark.asyncio
+async def test_execution_service_uses_pool(monkeypatch, pool):
+    monkeypatch.setattr("app.services.execution_service.python_pool", pool)
+    result = await ExecutionService.execute_code(ExecutionRequest(code="print('pooled')", language=Language.PYTHON))
+    assert result.status == "success"
+    assert result.stdout == "pooled"
+
+    result = await ExecutionService.execute_code(ExecutionRequest(code="while True: pass", language=Language.PYTHON, timeout=1))
+    assert result.status == "timeout"
+    assert result.exit_code == -1
+
+
+@pytest.mark.asyncio
+async def test_execution_service_falls_back_when_pool_breaks(monkeypatch):
+    class BrokenPool:
+        enabled = True
+        async def run(self, *a, **kw):
+            raise WorkerPoolError("down")
+    monkeypatch.setattr("app.services.execution_service.python_pool", BrokenPool())
+    result = await ExecutionService.execute_code(ExecutionRequest(code="print('fallback')", language=Language.PYTHON))
+    assert result.stdout == "fallback"
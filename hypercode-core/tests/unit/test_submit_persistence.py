@@ -0,0 +1,82 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock
+from app.schemas.mission import MissionRequest, MissionState
+from app.services import audit_sink as audit_sink_module
+from app.services import orchestrator as orchestrator_module
+from app.services.orchestrator import orchestrator, QUEUE_KEY
+
+DELAY = 0.05
+
+
+@pytest.fixture
+def slow_backends(monkeypatch):
+    """Postgres and the event stream with a fixed latency, recording the order of writes."""
+    calls = []
+
+    def delayed(name):
+        async def write(*args, **kwargs):
+            calls.append((name, "start", time.perf_counter()))
+            await asyncio.sleep(DELAY)
+            calls.append((name, "end", time.perf_counter()))
+        return write
+
+    db, bus = AsyncMock(), AsyncMock()
+    db.mission.create.side_effect = delayed("mission")
+    db.auditlog.create.side_effect = delayed("audit")
+    bus.publish_stream.side_effect = delayed("stream")
+    monkeypatch.setattr(orchestrator_module, "db", db)
+    monkeypatch.setattr(audit_sink_module, "db", db)
+    monkeypatch.setattr(orchestrator_module, "event_bus", bus)
+    return db, bus, calls
+
+
+def _at(calls, name, phase):
+    return next(t for n, p, t in calls if n == name and p == phase)
+
+
+@pytest.mark.asyncio
+async def test_stream_write_overlaps_postgres(slow_backends):
+    _, _, calls = slow_backends
+    # The first command on a fresh client pays for connection setup
+    await orchestrator.redis.ping()
+    t0 = time.perf_counter()
+    await orchestrator.submit(MissionRequest(title="m"))
+    elapsed = time.perf_counter() - t0
+
+    # Two Postgres round trips bound the latency; sequential writes would take three
+    assert elapsed < 2.6 * DELAY
+    assert _at(calls, "stream", "start") < _at(calls, "mission", "end")
+    # The audit row references the mission row, so it is written after it
+    assert _at(calls, "audit", "start") >= _at(calls, "mission", "end")
+
+
+@pytest.mark.asyncio
+async def test_mission_is_readable_before_anyone_hears_of_it(slow_backends):
+    _, bus, _ = slow_backends
+    seen = {}
+
+    async def publish(stream, envelope, *args, **kwargs):
+        mid = envelope.payload["mission_id"]
+        seen["hash"] = await orchestrator.redis.hget(f"mission:{mid}", "state")
+        seen["queued"] = await orchestrator.redis.zscore(QUEUE_KEY, mid) is not None
+
+    bus.publish_stream.side_effect = publish
+    await orchestrator.submit(MissionRequest(title="m"))
+    assert seen == {"hash": MissionState.QUEUED.value, "queued": True}
+
+
+@pytest.mark.asyncio
+async def test_one_failed_backend_does_not_block_the_other(slow_backends):
+    db, bus, _ = slow_backends
+    db.mission.create.side_effect = Exception("db down")
+    m = await orchestrator.submit(MissionRequest(title="m"))
+    bus.publish_stream.assert_awaited_once()
+    db.auditlog.create.assert_not_awaited()
+    assert await orchestrator.redis.hget(f"mission:{m.id}", "state") == MissionState.QUEUED.value
+
+    db.mission.create.side_effect = None
+    bus.publish_stream.side_effect = Exception("stream down")
+    await orchestrator.submit(MissionRequest(title="m2"))
+    db.auditlog.create.assert_awaited_once()